@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local odds history archive (services.odds_archive).
+
+Simulates the odds worker polling one in-play fixture (flat Bet365 odds, a few percent
+of prices moving per poll), appends every poll to an OddsArchiveSink in a temporary
+directory and flushes it the way the worker does. Checks that the last archived price
+of every selection matches the final poll, then times load_price_history for the whole
+fixture and for a single market. A third of the markets have no line (1X2, BTTS), and
+repeating the final poll unchanged must archive nothing.
+
+Usage (from backend/):
+    python benchmarks/bench_odds_archive.py
+    python benchmarks/bench_odds_archive.py --polls 2000 --selections 1500 --format arrow
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.odds_archive import OddsArchiveSink, load_price_history, ARCHIVE_AVAILABLE
+
+MARKET_IDS = [1, 2, 5, 7, 14, 28, 44, 80, 86, 97]
+# 1X2, double chance, BTTS: no total/handicap on their selections
+LINELESS_MARKET_IDS = {1, 2, 14}
+
+
+def make_poll(selections: int):
+    poll = []
+    for i in range(selections):
+        market_id = MARKET_IDS[i % len(MARKET_IDS)]
+        odd = {
+            "id": i,
+            "bookmaker_id": 2,
+            "market_id": market_id,
+            "label": ["Over", "Under", "Home", "Away", "Draw"][i % 5],
+            "value": "1.90",
+            "stopped": False,
+        }
+        if market_id not in LINELESS_MARKET_IDS:
+            odd["total"] = str(0.5 + (i // 5) % 8)
+        poll.append(odd)
+    return poll
+
+
+def move_prices(poll, rng: random.Random, change_ratio: float):
+    for odd in rng.sample(poll, max(1, int(len(poll) * change_ratio))):
+        odd["value"] = f"{rng.uniform(1.01, 15):.2f}"
+        odd["stopped"] = rng.random() < 0.05
+
+
+def best_of(func, rounds: int):
+    times = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polls", type=int, default=1000)
+    parser.add_argument("--selections", type=int, default=1000)
+    parser.add_argument("--change-ratio", type=float, default=0.03)
+    parser.add_argument("--poll-seconds", type=float, default=5.0, help="simulated time between polls")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if not ARCHIVE_AVAILABLE:
+        sys.exit("pyarrow/numpy are not installed")
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    fixture_id = 19000001
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        sink = OddsArchiveSink(base_dir, file_format=args.format)
+        poll = make_poll(args.selections)
+        started_at = datetime(2025, 1, 1, 18, 30, tzinfo=timezone.utc)
+        append_time = flush_time = 0.0
+
+        for i in range(args.polls):
+            if i:
+                move_prices(poll, rng, args.change_ratio)
+            now = started_at + timedelta(seconds=i * args.poll_seconds)
+            start = time.perf_counter()
+            sink.append(fixture_id, poll, is_live=True, now=now)
+            append_time += time.perf_counter() - start
+            # The worker flushes every ODDS_ARCHIVE_FLUSH_SECONDS (default 300) and on each new hour
+            if (i + 1) % max(1, int(300 / args.poll_seconds)) == 0:
+                start = time.perf_counter()
+                asyncio.run(sink.flush(force=True))
+                flush_time += time.perf_counter() - start
+        # An unchanged poll (with or without lines) must not archive anything
+        repeated = sink.append(fixture_id, poll, is_live=True, now=now + timedelta(seconds=args.poll_seconds))
+        assert repeated == 0, f"unchanged poll buffered {repeated} rows"
+        start = time.perf_counter()
+        asyncio.run(sink.flush(force=True))
+        flush_time += time.perf_counter() - start
+
+        size = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(base_dir) for name in names
+        )
+        metrics = sink.get_metrics()
+        print(
+            f"{args.polls} polls x {args.selections} selections: {metrics['rows_written']} rows "
+            f"({metrics['rows_written'] / (args.polls * args.selections):.1%} of raw), "
+            f"{metrics['files_written']} files, {size / 1024:.0f} KB ({args.format})"
+        )
+        print(f"append {append_time / args.polls * 1e3:8.3f} ms/poll | flush total {flush_time * 1e3:8.1f} ms")
+
+        history = load_price_history(fixture_id, base_dir=base_dir)
+        latest = {}
+        for odd_id, value in zip(history["odd_id"].tolist(), history["value"].tolist()):
+            latest[odd_id] = value
+        expected = {odd["id"]: float(odd["value"]) for odd in poll}
+        assert latest == expected, "archived history does not end at the final prices"
+        print(f"history consistent: last archived price of {len(expected)} selections matches the final poll")
+
+        t_fixture, history = best_of(lambda: load_price_history(fixture_id, base_dir=base_dir), args.rounds)
+        t_market, market = best_of(lambda: load_price_history(fixture_id, market_id=MARKET_IDS[0], base_dir=base_dir), args.rounds)
+        print(f"query fixture  {t_fixture * 1e3:8.2f} ms ({len(history['ts'])} rows)")
+        print(f"query market   {t_market * 1e3:8.2f} ms ({len(market['ts'])} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-item vs columnar odds normalization.
+
+Builds a synthetic fixture with thousands of odds rows (flat and nested SportMonks
+formats, several bookmakers, suspended rows, fractional values), checks that both
+paths return identical rows, then times the match-details workload: normalize for
+all bookmakers and for Bet365 from the same raw data (match details only needs market names for the former).
+
+Usage (from backend/):
+    python benchmarks/bench_odds_normalization.py
+    python benchmarks/bench_odds_normalization.py --rows 5000 --rounds 20
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.odds_columns import OddsColumns, NUMPY_AVAILABLE
+from services.sportmonks_service import SportmonksService, BET365_SUPPORTED_MARKET_IDS
+
+BOOKMAKERS = [(2, "Bet365"), (1, "10Bet"), (9, "Betfair"), (23, "Pinnacle")]
+MARKETS = sorted(BET365_SUPPORTED_MARKET_IDS)[:40] + [300, 301, 302]
+
+
+def make_flat_odds(rows: int, rng: random.Random):
+    """Flat odds rows (label/value on the item), as returned by odds includes"""
+    odds = []
+    for i in range(rows):
+        bookmaker_id, bookmaker_name = rng.choice(BOOKMAKERS)
+        market_id = rng.choice(MARKETS)
+        odds.append({
+            "id": i,
+            "fixture_id": 1,
+            "market_id": market_id,
+            "bookmaker_id": bookmaker_id,
+            "bookmaker": {"id": bookmaker_id, "name": bookmaker_name} if i % 3 else None,
+            "label": rng.choice(["1", "X", "2", "Over", "Under", "Yes", "No"]),
+            "name": rng.choice(["Home", "Draw", "Away", None]),
+            "value": f"{rng.uniform(1.01, 30):.2f}" if i % 50 else "0",
+            "total": rng.choice([None, "1.5", "2.5", "3.5"]),
+            "market_description": f"Market {market_id}",
+            "stopped": i % 40 == 0,
+            "suspended": i % 55 == 0,
+            "latest_bookmaker_update": "2025-01-01 19:00:00",
+        })
+    return odds
+
+
+def make_nested_odds(items: int, rng: random.Random):
+    """Nested odds items (bookmaker/market/values), including fractional values"""
+    odds = []
+    for i in range(items):
+        bookmaker_id, bookmaker_name = rng.choice(BOOKMAKERS)
+        market_id = rng.choice(MARKETS)
+        values = []
+        for j in range(rng.randint(2, 6)):
+            values.append({
+                "name": rng.choice(["Over", "Under", "Home", "Away", ""]),
+                "value": rng.choice([f"{rng.uniform(1.01, 30):.2f}", f"{rng.randint(1, 500)}/1", None]),
+                "odd": "2.10",
+                "participant": {"data": {"id": 100 + j, "name": f"Player {j}"}} if j % 4 == 0 else {},
+                "active": j % 7 != 0,
+            })
+        odds.append({
+            "bookmaker": {"data": {"id": bookmaker_id, "name": bookmaker_name}},
+            "market": {"data": {"id": market_id, "name": f"Market {market_id}", "description": "desc"}},
+            "values": {"data": values},
+            "updated_at": "2025-01-01 19:00:00",
+        })
+    return odds
+
+
+def per_item(service: SportmonksService, raw):
+    return (
+        service._extract_and_normalize_odds(raw, bookmaker_id_filter=None),
+        service._extract_and_normalize_odds(raw, bookmaker_id_filter=2),
+    )
+
+
+def columnar(service: SportmonksService, raw):
+    columns = OddsColumns.from_raw(raw)
+    return (
+        service._normalize_odds_columnar(columns=columns),
+        service._normalize_odds_columnar(bookmaker_id_filter=2, columns=columns),
+    )
+
+
+def per_item_match_details(service: SportmonksService, raw):
+    """get_match_details before: full normalize for all bookmakers (market names only used) + Bet365"""
+    all_odds = service._extract_and_normalize_odds(raw, bookmaker_id_filter=None)
+    return [o.get("market_name") for o in all_odds], service._extract_and_normalize_odds(raw, bookmaker_id_filter=2)
+
+
+def columnar_match_details(service: SportmonksService, raw):
+    """get_match_details now: parse once, market names for all bookmakers, records for Bet365 only"""
+    columns = OddsColumns.from_raw(raw)
+    return (
+        columns.market_names(columns.select()),
+        service._normalize_odds_columnar(bookmaker_id_filter=2, columns=columns),
+    )
+
+
+def best_of(func, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=4000, help="flat odds rows (nested items = rows / 4)")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    service = SportmonksService()
+    datasets = {
+        "flat": {"data": make_flat_odds(args.rows, rng)},
+        "nested": {"data": make_nested_odds(args.rows // 4, rng)},
+    }
+
+    print(f"numpy: {NUMPY_AVAILABLE}")
+    for label, raw in datasets.items():
+        expected = per_item(service, raw)
+        actual = columnar(service, raw)
+        assert actual == expected, f"{label}: columnar output differs from per-item output"
+
+        assert columnar_match_details(service, raw) == per_item_match_details(service, raw)
+
+        t_item = best_of(lambda: per_item(service, raw), args.rounds)
+        t_col = best_of(lambda: columnar(service, raw), args.rounds)
+        t_item_details = best_of(lambda: per_item_match_details(service, raw), args.rounds)
+        t_col_details = best_of(lambda: columnar_match_details(service, raw), args.rounds)
+        print(f"{label}: rows={len(OddsColumns.from_raw(raw))} all={len(expected[0])} bet365={len(expected[1])}")
+        print(f"  normalize all + bet365   per-item {t_item * 1e3:8.2f} ms | columnar {t_col * 1e3:8.2f} ms ({t_item / t_col:4.1f}x)")
+        print(f"  match-details workload   per-item {t_item_details * 1e3:8.2f} ms | columnar {t_col_details * 1e3:8.2f} ms ({t_item_details / t_col_details:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
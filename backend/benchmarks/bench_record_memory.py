@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory per 10k normalized odds / odds groups / matches, dicts vs slotted records.
+
+Builds the same field values once, then measures (tracemalloc) what holding them as
+plain dicts vs services.records types costs, so only the container overhead is
+compared. Also times JSON serialization: json.dumps(default=str) on dicts (the cache's
+previous path) vs records.dumps on records.
+
+Usage (from backend/):
+    python benchmarks/bench_record_memory.py
+    python benchmarks/bench_record_memory.py --count 50000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.records import (
+    OddRecord, OddGroupRecord, MatchRecord, MATCH_FIELDS, dumps, ORJSON_AVAILABLE,
+)
+
+
+def make_odds(count: int, rng: random.Random):
+    """Normalized odds in the flat-format key order (no player fields)"""
+    odds = []
+    for i in range(count):
+        value = round(rng.uniform(1.01, 30), 2)
+        odds.append({
+            "bookmaker_id": 2,
+            "bookmaker_name": "Bet365",
+            "market_id": rng.randint(1, 300),
+            "market_name": "Match Winner",
+            "market_description": "Full time result",
+            "label": rng.choice(["1", "X", "2", "Over", "Under"]),
+            "name": rng.choice(["Home", "Draw", "Away", None]),
+            "value": value,
+            "odd": value,
+            "price": value,
+            "stopped": False,
+            "suspended": i % 50 == 0,
+            "is_unavailable": False,
+            "latest_bookmaker_update": "2025-01-01 19:00:00",
+        })
+    return odds
+
+
+def make_groups(odds):
+    return [
+        {"market_id": odd["market_id"], "market_name": odd["market_name"], "line": 2.5,
+         "selections": {"over": odd, "under": None}}
+        for odd in odds
+    ]
+
+
+def make_matches(count: int, odds, groups):
+    matches = []
+    for i in range(count):
+        match = {field: None for field in MATCH_FIELDS}
+        match.update({
+            "id": str(i), "sportmonks_id": i, "home_team": "Home FC", "away_team": "Away FC",
+            "status": "NS", "commence_time": "2025-01-01T19:00:00", "events": [],
+            "odds": odds[i % len(odds):i % len(odds) + 3], "odds_grouped": groups[i % len(groups):i % len(groups) + 2],
+        })
+        matches.append(match)
+    return matches
+
+
+def measure(build) -> int:
+    """Bytes allocated (and kept alive) by build()"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def best_of(func, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000, help="records per type")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    odds = make_odds(args.count, rng)
+    groups = make_groups(odds)
+    matches = make_matches(args.count, odds, groups)
+    scale = 10000 / args.count
+
+    print(f"orjson: {ORJSON_AVAILABLE}; per 10k records (container overhead, values shared)")
+    for label, source, record_type in (
+        ("odds", odds, OddRecord),
+        ("odds groups", groups, OddGroupRecord),
+        ("matches", matches, MatchRecord),
+    ):
+        dict_bytes = measure(lambda: [dict(item) for item in source]) * scale
+        record_bytes = measure(lambda: [record_type(item) for item in source]) * scale
+        print(f"  {label:<12} dict {dict_bytes / 1024:9.1f} KiB | record {record_bytes / 1024:9.1f} KiB"
+              f" ({dict_bytes / record_bytes:4.1f}x smaller)")
+
+    odd_records = [OddRecord(odd) for odd in odds]
+    assert json.loads(dumps(odd_records)) == json.loads(json.dumps(odds, default=str))
+    payload_dicts = [dict(m, odds=odds[:20]) for m in matches[:1000]]
+    payload_records = [MatchRecord(dict(m, odds=odd_records[:20])) for m in matches[:1000]]
+    t_json = best_of(lambda: json.dumps(payload_dicts, default=str), args.rounds)
+    t_fast = best_of(lambda: dumps(payload_records), args.rounds)
+    print(f"  serialize 1k matches     json.dumps(dicts) {t_json * 1e3:8.2f} ms | dumps(records) {t_fast * 1e3:8.2f} ms"
+          f" ({t_json / t_fast:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fixture transforms inline vs in the transform pool (services.transform_pool).
+
+Transforms a fixtures window (default ~15 days of fixtures, synthesized or from a
+recording) once inline on the event loop and once per pool size, with the memo
+bypassed. While each run is in progress a ticker coroutine measures how late the
+event loop wakes up, which is what live requests on the same worker feel:
+    wall_ms          time to transform the whole window
+    loop_max_ms      longest event loop stall during the run
+    loop_p99_ms      99th percentile of the ticker's lateness
+Pool sizes default to 1, 2, 4, ... up to the CPU count. Pool start-up (spawn and imports)
+is excluded; each pool is warmed up first.
+
+Usage (from backend/):
+    python benchmarks/bench_transform_pool.py
+    python benchmarks/bench_transform_pool.py --fixtures 3000 --workers 1 2 4 8 --json pool.json
+    python benchmarks/bench_transform_pool.py --recordings recordings/ --chunk-size 32
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from payloads import make_fixtures, load_recorded_fixtures
+from services.sportmonks_service import sportmonks_service
+from services.transform_pool import TransformPool
+
+TICK_SECONDS = 0.005
+
+
+async def measure(run) -> dict:
+    """Run the coroutine while sampling event loop lateness"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(time.perf_counter() - expected, 0.0))
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    result = await run()
+    wall = time.perf_counter() - started
+    done.set()
+    await tick_task
+    lags.sort()
+    return {
+        "wall_ms": round(wall * 1000, 1),
+        "loop_max_ms": round(lags[-1] * 1000, 1) if lags else round(wall * 1000, 1),
+        "loop_p99_ms": round(lags[int(len(lags) * 0.99) - 1] * 1000, 1) if len(lags) > 1 else None,
+        "matches": len(result),
+    }
+
+
+async def bench(fixtures, worker_counts, chunk_size: int, rounds: int):
+    async def inline():
+        return [sportmonks_service._transform_fixture_to_match(f, timezone_offset=3) for f in fixtures]
+
+    rows = []
+    runs = [await measure(inline) for _ in range(rounds)]
+    rows.append({"mode": "inline", "workers": 0, **min(runs, key=lambda r: r["wall_ms"])})
+
+    for workers in worker_counts:
+        pool = TransformPool(workers=workers, min_batch=1, chunk_size=chunk_size)
+        await pool.warm_up()
+        try:
+            runs = [
+                await measure(lambda: pool.transform_fixtures(fixtures, timezone_offset=3))
+                for _ in range(rounds)
+            ]
+        finally:
+            pool.shutdown()
+        rows.append({"mode": "pool", "workers": workers, **min(runs, key=lambda r: r["wall_ms"])})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=int, default=1500, help="synthetic fixtures (about 15 days)")
+    parser.add_argument("--odds-rows", type=int, default=60)
+    parser.add_argument("--recordings", help="SPORTMONKS_RECORD_DIR recording to use instead")
+    parser.add_argument("--workers", type=int, nargs="+", help="pool sizes (default 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.recordings:
+        fixtures = load_recorded_fixtures(args.recordings)
+    else:
+        fixtures = make_fixtures(args.fixtures, random.Random(args.seed), odds_rows=args.odds_rows)
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)})
+
+    print(f"{len(fixtures)} fixtures, {cpus} CPUs, pool sizes {worker_counts}")
+    rows = asyncio.run(bench(fixtures, worker_counts, args.chunk_size, args.rounds))
+
+    inline_ms = rows[0]["wall_ms"]
+    print(f"\n{'mode':<8} {'workers':>7} {'wall ms':>10} {'speedup':>8} {'loop max ms':>12} {'loop p99 ms':>12}")
+    for row in rows:
+        p99 = "-" if row["loop_p99_ms"] is None else f"{row['loop_p99_ms']:.1f}"
+        print(
+            f"{row['mode']:<8} {row['workers']:>7} {row['wall_ms']:>10.1f} {inline_ms / row['wall_ms']:>7.2f}x "
+            f"{row['loop_max_ms']:>12.1f} {p99:>12}"
+        )
+
+    if args.json_path:
+        report = {
+            "meta": {
+                "fixtures": len(fixtures),
+                "cpus": cpus,
+                "chunk_size": args.chunk_size,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "results": rows,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
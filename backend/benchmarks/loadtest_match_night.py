@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Load test: match-night traffic against the backend (asyncio + httpx client).
+
+Virtual users follow a match-night mix:
+    live     poll /api/matches/live every --live-interval seconds (default 5)
+    detail   open /api/matches/{id}, then poll /api/matches/{id}/odds every --odds-interval seconds
+    home     load /api/matches/live + /api/matches?category=upcoming, think --home-think seconds, repeat
+Users are ramped up over --ramp seconds and run for --duration seconds. The report
+gives throughput, errors and p50/p90/p99/max latency per endpoint (--json for a file).
+
+With --spawn the harness starts the SportMonks stand-in (benchmarks/sportmonks_standin.py,
+serving --recordings or synthetic fixtures) and one backend worker (uvicorn server:app)
+pointed at it, so no SportMonks quota is used. Redis is taken from REDIS_HOST/REDIS_PORT
+as usual (run a local redis-server for realistic cache behaviour). Without --spawn,
+--base-url must point at a running backend.
+
+Usage (from backend/):
+    python benchmarks/loadtest_match_night.py --spawn --users 300 --duration 60
+    python benchmarks/loadtest_match_night.py --spawn --users 1000 --standin-latency-ms 150 --json loadtest.json
+    python benchmarks/loadtest_match_night.py --base-url http://127.0.0.1:8001 --match-ids 19000001,19000002
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LIVE = "/api/matches/live"
+DETAIL = "/api/matches/{id}"
+ODDS = "/api/matches/{id}/odds"
+UPCOMING = "/api/matches?category=upcoming"
+
+
+class Stats:
+    """Latency samples and errors per endpoint template"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, latency: float, status) -> None:
+        self.latencies[endpoint].append(latency)
+        self.statuses[endpoint][status] += 1
+        if status != 200:
+            self.errors[endpoint] += 1
+
+    def report(self, elapsed: float):
+        rows = []
+        endpoints = sorted(self.latencies)
+        all_latencies = [latency for endpoint in endpoints for latency in self.latencies[endpoint]]
+        for endpoint, samples in [(endpoint, self.latencies[endpoint]) for endpoint in endpoints] + [("TOTAL", all_latencies)]:
+            if not samples:
+                continue
+            ordered = sorted(samples)
+
+            def pct(p):
+                return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1e3, 2)
+
+            errors = sum(self.errors.values()) if endpoint == "TOTAL" else self.errors[endpoint]
+            rows.append({
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "errors": errors,
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": pct(0.50),
+                "p90_ms": pct(0.90),
+                "p99_ms": pct(0.99),
+                "max_ms": round(ordered[-1] * 1e3, 2),
+                "statuses": dict(self.statuses[endpoint]) if endpoint != "TOTAL" else None,
+            })
+        return rows
+
+
+async def timed_get(client: httpx.AsyncClient, stats: Stats, endpoint: str, url: str):
+    started = time.perf_counter()
+    try:
+        response = await client.get(url)
+        status = response.status_code
+        body = response.json() if status == 200 else None
+    except (httpx.HTTPError, ValueError) as e:
+        status, body = type(e).__name__, None
+    stats.record(endpoint, time.perf_counter() - started, status)
+    return body
+
+
+async def paced(interval: float, deadline: float, step):
+    """Run step every interval seconds (from its start) until the deadline"""
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        await step()
+        # Never sleep past the deadline (a 20s think time would stretch the run and deflate rps)
+        await asyncio.sleep(max(0.0, min(interval - (time.monotonic() - started), deadline - time.monotonic())))
+
+
+async def live_user(client, stats, args, deadline, match_ids):
+    await paced(args.live_interval, deadline, lambda: timed_get(client, stats, LIVE, LIVE))
+
+
+async def detail_user(client, stats, args, deadline, match_ids):
+    match_id = random.choice(match_ids)
+    await timed_get(client, stats, DETAIL, DETAIL.format(id=match_id))
+    await paced(args.odds_interval, deadline, lambda: timed_get(client, stats, ODDS, ODDS.format(id=match_id)))
+
+
+async def home_user(client, stats, args, deadline, match_ids):
+    async def load():
+        await asyncio.gather(timed_get(client, stats, LIVE, LIVE), timed_get(client, stats, UPCOMING, UPCOMING))
+    await paced(args.home_think, deadline, load)
+
+
+async def discover_match_ids(client: httpx.AsyncClient, fallback):
+    try:
+        response = await client.get(LIVE)
+        ids = [match.get("id") for match in response.json().get("data", []) if match.get("id")]
+    except (httpx.HTTPError, ValueError, AttributeError):
+        ids = []
+    return ids or list(fallback)
+
+
+async def run_load(args, base_url: str, fallback_ids):
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        match_ids = await discover_match_ids(client, fallback_ids)
+        if not match_ids:
+            sys.exit("No match ids: none live and no --match-ids given")
+        print(f"{len(match_ids)} match ids for detail pages")
+
+        kinds = [live_user] * round(args.users * args.live_share) + [detail_user] * round(args.users * args.detail_share)
+        kinds += [home_user] * max(0, args.users - len(kinds))
+        random.shuffle(kinds)
+
+        started = time.monotonic()
+        deadline = started + args.ramp + args.duration
+
+        async def start_user(i, user):
+            await asyncio.sleep(args.ramp * i / max(1, len(kinds)))
+            await user(client, stats, args, deadline, match_ids)
+
+        await asyncio.gather(*(start_user(i, user) for i, user in enumerate(kinds)))
+        elapsed = time.monotonic() - started
+    counts = {kind.__name__: kinds.count(kind) for kind in (live_user, detail_user, home_user)}
+    return stats, elapsed, counts
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"{url} did not become ready in {timeout:.0f}s")
+
+
+def spawn(args):
+    """Start stand-in + backend; returns (processes, backend base url, fixture ids, stand-in url)"""
+    from payloads import make_fixtures, load_recorded_fixtures, write_recordings
+
+    recordings = args.recordings
+    if recordings:
+        fixture_ids = [fixture["id"] for fixture in load_recorded_fixtures(recordings)]
+    else:
+        recordings = tempfile.mkdtemp(prefix="sportmonks-recordings-")
+        fixtures = make_fixtures(args.fixtures, random.Random(args.seed), odds_rows=args.odds_rows, live_ratio=0.4)
+        asyncio.run(write_recordings(recordings, fixtures))
+        fixture_ids = [fixture["id"] for fixture in fixtures]
+        print(f"synthetic recordings: {len(fixtures)} fixtures in {recordings}")
+
+    standin_url = f"http://127.0.0.1:{args.standin_port}"
+    standin = subprocess.Popen([
+        sys.executable, os.path.join(BACKEND_DIR, "benchmarks", "sportmonks_standin.py"),
+        "--recordings", recordings, "--port", str(args.standin_port),
+        "--latency-ms", str(args.standin_latency_ms), "--jitter-ms", str(args.standin_jitter_ms),
+        "--rate-429", str(args.rate_429), "--seed", str(args.seed),
+    ], cwd=BACKEND_DIR)
+    env = dict(os.environ)
+    env.update({
+        "SPORTMONKS_API_BASE_URL": f"{standin_url}/v3/football",
+        "SPORTMONKS_API_TOKEN": env.get("SPORTMONKS_API_TOKEN_LOADTEST", "loadtest"),
+        "SPORTMONKS_RECORD_DIR": "",
+        "SPORTMONKS_REPLAY_DIR": "",
+    })
+    backend = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(args.port),
+        "--log-level", "warning",
+    ], cwd=BACKEND_DIR, env=env)
+    processes = [backend, standin]
+    try:
+        wait_ready(f"{standin_url}/_standin/metrics")
+        wait_ready(f"http://127.0.0.1:{args.port}/api/health")
+    except RuntimeError:
+        stop(processes)
+        raise
+    return processes, f"http://127.0.0.1:{args.port}", fixture_ids, standin_url
+
+
+def stop(processes) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001", help="running backend (without --spawn)")
+    parser.add_argument("--match-ids", default="", help="comma-separated ids if none are live")
+    parser.add_argument("--spawn", action="store_true", help="start the stand-in and a backend worker")
+    parser.add_argument("--port", type=int, default=8001, help="backend port with --spawn")
+    parser.add_argument("--recordings", help="stand-in recordings (default: synthetic)")
+    parser.add_argument("--fixtures", type=int, default=300, help="synthetic fixtures")
+    parser.add_argument("--odds-rows", type=int, default=300, help="odds rows per synthetic fixture")
+    parser.add_argument("--standin-port", type=int, default=8099)
+    parser.add_argument("--standin-latency-ms", type=float, default=120.0)
+    parser.add_argument("--standin-jitter-ms", type=float, default=80.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--live-share", type=float, default=0.6)
+    parser.add_argument("--detail-share", type=float, default=0.3)
+    parser.add_argument("--live-interval", type=float, default=5.0)
+    parser.add_argument("--odds-interval", type=float, default=5.0)
+    parser.add_argument("--home-think", type=float, default=20.0)
+    parser.add_argument("--ramp", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    random.seed(args.seed)
+    processes, base_url, fallback_ids, standin_url = [], args.base_url, [], None
+    if args.match_ids:
+        fallback_ids = [int(match_id) for match_id in args.match_ids.split(",") if match_id]
+    if args.spawn:
+        processes, base_url, spawned_ids, standin_url = spawn(args)
+        fallback_ids = fallback_ids or spawned_ids
+
+    try:
+        stats, elapsed, counts = asyncio.run(run_load(args, base_url, fallback_ids))
+        upstream = httpx.get(f"{standin_url}/_standin/metrics", timeout=5).json() if standin_url else None
+    finally:
+        stop(processes)
+
+    rows = stats.report(elapsed)
+    print(f"\n{args.users} users {counts}, {elapsed:.1f}s (ramp {args.ramp:.0f}s)")
+    print(f"{'endpoint':<32} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<32} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p90_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    if upstream:
+        print(f"stand-in (upstream SportMonks) requests: {upstream}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": {key: value for key, value in vars(args).items() if key != "json_path"},
+                "users": counts,
+                "elapsed_seconds": round(elapsed, 2),
+                "endpoints": rows,
+                "upstream": upstream,
+            }, f, indent=2)
+        print(f"wrote {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+SportMonks-shaped payloads for benchmarks and load tests.
+
+load_recorded_fixtures() reads fixtures/livescores from a SPORTMONKS_RECORD_DIR
+recording (see services/sportmonks_replay.py); make_fixture() synthesizes fixtures
+with the includes the backend requests (participants, scores, events, league,
+periods, odds) when no recording is available, kicking off around the current time
+so they fall into the date windows the backend requests. write_recordings() turns
+synthetic payloads into recordings, so the stand-in server can run without real data.
+"""
+import glob
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from services.sportmonks_replay import ResponseRecorder
+
+BOOKMAKERS = [(2, "Bet365"), (1, "10Bet"), (9, "Betfair"), (23, "Pinnacle")]
+MARKETS = [1, 2, 5, 7, 12, 14, 18, 28, 44, 56, 80, 86, 97]
+LABELS = ["1", "X", "2", "Over", "Under", "Yes", "No", "Home", "Away"]
+EVENT_TYPE_IDS = [10, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23]
+# server.py builds its /matches and /stats date windows in Turkey time
+BACKEND_TZ = timezone(timedelta(hours=3))
+WINDOW_DAYS = 7
+
+
+def make_odds(
+    rows: int,
+    rng: random.Random,
+    fixture_id: int = 1,
+    updated_at: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """Flat odds rows (label/value on the item), as returned by the odds include"""
+    updated = (updated_at or datetime.now(timezone.utc)).strftime("%Y-%m-%d %H:%M:%S")
+    odds = []
+    for i in range(rows):
+        bookmaker_id, bookmaker_name = BOOKMAKERS[0] if i % 3 else rng.choice(BOOKMAKERS)
+        market_id = rng.choice(MARKETS)
+        odds.append({
+            "id": fixture_id * 100000 + i,
+            "fixture_id": fixture_id,
+            "market_id": market_id,
+            "bookmaker_id": bookmaker_id,
+            "bookmaker": {"id": bookmaker_id, "name": bookmaker_name},
+            "label": rng.choice(LABELS),
+            "name": rng.choice(["Home", "Draw", "Away", None]),
+            "value": f"{rng.uniform(1.01, 30):.2f}",
+            "total": rng.choice([None, "1.5", "2.5", "3.5"]),
+            "handicap": rng.choice([None, None, "-1.5", "0.5", "1.5"]),
+            "market_description": f"Market {market_id}",
+            "stopped": i % 40 == 0,
+            "suspended": i % 55 == 0,
+            "latest_bookmaker_update": updated,
+        })
+    return odds
+
+
+def make_fixture(
+    fixture_id: int,
+    rng: random.Random,
+    odds_rows: int = 300,
+    live: bool = False,
+    starting_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """One fixture with participants, scores, events, league, periods and odds"""
+    starting_at = starting_at or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    home_id, away_id = fixture_id * 2, fixture_id * 2 + 1
+    participants = [
+        {"id": team_id, "name": f"Team {team_id}", "image_path": f"https://cdn.example/{team_id}.png",
+         "meta": {"location": location, "winner": None, "position": n}}
+        for n, (team_id, location) in enumerate(((home_id, "home"), (away_id, "away")))
+    ]
+    home_goals, away_goals = rng.randint(0, 3), rng.randint(0, 3)
+    scores = [
+        {"id": fixture_id * 10 + n, "participant_id": team_id, "description": description,
+         "score": {"goals": goals, "participant": location}}
+        for n, (team_id, location, goals, description) in enumerate((
+            (home_id, "home", home_goals, "CURRENT"), (away_id, "away", away_goals, "CURRENT"),
+            (home_id, "home", min(home_goals, 1), "1ST_HALF"), (away_id, "away", min(away_goals, 1), "1ST_HALF"),
+        ))
+    ]
+    events = [
+        {"id": fixture_id * 100 + n, "type_id": rng.choice(EVENT_TYPE_IDS), "minute": rng.randint(1, 90),
+         "participant_id": rng.choice((home_id, away_id)), "player_name": f"Player {n}",
+         "type": {"id": 14, "name": "Goal"}}
+        for n in range(rng.randint(4, 14))
+    ]
+    minute = rng.randint(1, 90) if live else None
+    return {
+        "id": fixture_id,
+        "league_id": 8,
+        "season_id": 23614,
+        "name": f"Team {home_id} vs Team {away_id}",
+        "starting_at": starting_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "starting_at_timestamp": int(starting_at.timestamp()),
+        "state_id": 2 if live else 1,
+        "last_update": (starting_at + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M:%S"),
+        "participants": participants,
+        "scores": scores,
+        "events": events,
+        "league": {"id": 8, "name": "Premier League", "image_path": "https://cdn.example/8.png", "country_id": 462},
+        "currentPeriod": {"minutes": minute, "seconds": 0, "ticking": True, "has_timer": True, "time_added": None}
+        if live else None,
+        "periods": [{"id": fixture_id * 3, "minutes": minute, "ticking": live, "has_timer": live}],
+        "odds": make_odds(odds_rows, rng, fixture_id, updated_at=starting_at),
+    }
+
+
+def make_fixtures(count: int, rng: random.Random, odds_rows: int = 300, live_ratio: float = 0.3) -> List[Dict[str, Any]]:
+    """Fixtures every 15 minutes over ten hours, starting two hours ago"""
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    return [
+        make_fixture(19000000 + i, rng, odds_rows=odds_rows, live=rng.random() < live_ratio,
+                     starting_at=start + timedelta(minutes=15 * (i % 40)))
+        for i in range(count)
+    ]
+
+
+def load_recorded_fixtures(directory: str) -> List[Dict[str, Any]]:
+    """Fixture objects from recorded fixtures/livescores responses (one per fixture id)"""
+    fixtures: Dict[Any, Dict[str, Any]] = {}
+    for file_path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(file_path, encoding="utf-8") as f:
+            recording = json.load(f)
+        if not recording.get("path", "").startswith(("fixtures", "livescores")):
+            continue
+        data = (recording.get("body") or {}).get("data")
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if isinstance(item, dict) and "participants" in item:
+                fixtures.setdefault(item.get("id"), item)
+    return list(fixtures.values())
+
+
+async def write_recordings(directory: str, fixtures: List[Dict[str, Any]], per_page: int = 50) -> int:
+    """Record synthetic fixtures as livescores, latest/in-play odds, fixtures/{id} and paginated fixtures/date responses"""
+    recorder = ResponseRecorder(directory)
+    live = [fixture for fixture in fixtures if fixture["state_id"] == 2]
+    rate_limit = {"resets_in_seconds": 3600, "remaining": 2999, "requested_entity": "Fixture"}
+    headers = {"content-type": "application/json"}
+    for path in ("livescores", "livescores/inplay"):
+        await recorder.record(path, {}, 200, headers, {"data": live, "rate_limit": rate_limit})
+    # Latest odds polled by the odds worker
+    prematch = [fixture for fixture in fixtures if fixture["state_id"] != 2]
+    for path, subset in (("odds/inplay/latest", live), ("odds/pre-match/latest", prematch)):
+        data = [{"fixture_id": fixture["id"], "odds": fixture["odds"]} for fixture in subset]
+        await recorder.record(path, {}, 200, headers, {"data": data, "rate_limit": rate_limit})
+    for fixture in fixtures:
+        await recorder.record(f"fixtures/{fixture['id']}", {}, 200, headers, {"data": fixture, "rate_limit": rate_limit})
+        bet365 = [odd for odd in fixture["odds"] if odd["bookmaker_id"] == 2]
+        await recorder.record(f"odds/inplay/fixtures/{fixture['id']}/bookmakers/2", {}, 200, headers, {"data": bet365, "rate_limit": rate_limit})
+
+    async def record_list(path: str, items: List[Dict[str, Any]]) -> None:
+        # First page only: the replay responder cuts later pages from it
+        await recorder.record(path, {}, 200, headers, {
+            "data": items,
+            "pagination": {"count": len(items), "per_page": per_page, "current_page": 1, "has_more": False},
+            "rate_limit": rate_limit,
+        })
+
+    by_date: Dict[str, List[Dict[str, Any]]] = {}
+    for fixture in fixtures:
+        by_date.setdefault(fixture["starting_at"][:10], []).append(fixture)
+    # The /matches (today -7..+7) and /stats (today..+7) windows, plus every day in them
+    # for the per-day fallback; days without fixtures get empty pages rather than 404s
+    today = datetime.now(BACKEND_TZ).date()
+    days = [(today + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(-WINDOW_DAYS, WINDOW_DAYS + 1)]
+    for date in sorted(set(days) | set(by_date)):
+        await record_list(f"fixtures/date/{date}", by_date.get(date, []))
+    for date_from, date_to in ((days[0], days[-1]), (days[WINDOW_DAYS], days[-1])):
+        window = [fixture for date, day_fixtures in by_date.items() if date_from <= date <= date_to for fixture in day_fixtures]
+        await record_list(f"fixtures/between/{date_from}/{date_to}", window)
+    return recorder.recorded
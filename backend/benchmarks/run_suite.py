@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for backend hot paths, with machine-readable results.
+
+Cases (each op processes the whole payload set):
+    transform_fixture      SportmonksService._transform_fixture_to_match per fixture (unmemoized)
+    transform_livescore    SportmonksService._transform_livescore_to_match per live fixture
+    normalize_odds         _extract_and_normalize_odds(bookmaker_id_filter=2) per fixture
+    group_odds             _group_odds_by_market_line on the normalized Bet365 odds
+    snapshot_diff_filter   _filter_by_snapshot_diff against in-memory diff state
+    cache_encode           records.dumps of the transformed matches (cache set path)
+    cache_decode           json.loads of the encoded matches (cache get path)
+    rate_limit_acquire     RateLimitManager.acquire from concurrent coroutines on one entity
+
+Payloads come from a SPORTMONKS_RECORD_DIR recording (--recordings) or are synthesized
+with a fixed seed. Results are printed as a table and, with --json, written as JSON
+(min/median/p95/mean ms per op and µs per item). --baseline compares medians against
+an earlier --json file and exits 1 when a case regressed by more than --max-regression.
+
+Usage (from backend/):
+    python benchmarks/run_suite.py --json bench-results.json
+    python benchmarks/run_suite.py --recordings recordings/ --baseline bench-results.json
+    python benchmarks/run_suite.py --filter odds --rounds 50
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from payloads import make_fixtures, load_recorded_fixtures
+from services.rate_limit_manager import RateLimitManager
+from services.records import dumps, ORJSON_AVAILABLE
+from services.snapshot_diff import SnapshotDiffStore
+from services.sportmonks_service import SportmonksService
+
+
+def summarize(name: str, times, items: int):
+    times_ms = sorted(t * 1e3 for t in times)
+    median = statistics.median(times_ms)
+    return {
+        "name": name,
+        "rounds": len(times_ms),
+        "items": items,
+        "min_ms": round(times_ms[0], 4),
+        "median_ms": round(median, 4),
+        "p95_ms": round(times_ms[min(len(times_ms) - 1, int(len(times_ms) * 0.95))], 4),
+        "mean_ms": round(statistics.fmean(times_ms), 4),
+        "per_item_us": round(median * 1e3 / items, 3) if items else None,
+    }
+
+
+def time_rounds(func, rounds: int, warmup: int = 2):
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def build_cases(service: SportmonksService, fixtures, args):
+    """(name, func, items) per case; payload preparation happens here, outside the timings"""
+    live = [fixture for fixture in fixtures if fixture.get("state_id") == 2] or fixtures
+    normalized = [service._extract_and_normalize_odds(fixture.get("odds"), bookmaker_id_filter=2) for fixture in fixtures]
+    team_ids = []
+    for fixture in fixtures:
+        teams = service._extract_home_away_teams(fixture.get("participants") or [])
+        team_ids.append(((teams["home"] or {}).get("id"), (teams["away"] or {}).get("id")))
+
+    # Diff state holding ~90% of each fixture's selections, as after a typical poll
+    store = SnapshotDiffStore()
+    diff_states = []
+    for fixture, odds in zip(fixtures, normalized):
+        keys = [service._build_selection_key(odd) for odd in odds]
+        diff_states.append(store.update(fixture["id"], keys[: int(len(keys) * 0.9)], is_live=True))
+
+    matches = [service._transform_fixture_to_match(fixture) for fixture in fixtures]
+    encoded = dumps(matches)
+
+    def transform_fixture():
+        for fixture in fixtures:
+            service._transform_fixture_to_match(fixture)
+
+    def transform_livescore():
+        for fixture in live:
+            service._transform_livescore_to_match(fixture)
+
+    def normalize_odds():
+        for fixture in fixtures:
+            service._extract_and_normalize_odds(fixture.get("odds"), bookmaker_id_filter=2)
+
+    def group_odds():
+        for odds, (home_id, away_id) in zip(normalized, team_ids):
+            service._group_odds_by_market_line(odds, home_team_id=home_id, away_team_id=away_id)
+
+    def snapshot_diff_filter():
+        for odds, diff_state in zip(normalized, diff_states):
+            service._filter_by_snapshot_diff(odds, match_status="LIVE", diff_state=diff_state)
+
+    def cache_encode():
+        dumps(matches)
+
+    def cache_decode():
+        json.loads(encoded)
+
+    manager = RateLimitManager()
+    state = manager._get_or_create_state("fixtures")
+    state.capacity = state.tokens = 10 ** 12  # measure locking/bookkeeping, not limiting
+
+    async def acquire_burst():
+        async def worker():
+            for _ in range(args.acquire_calls):
+                await manager.acquire("fixtures")
+                await asyncio.sleep(0)
+        await asyncio.gather(*(worker() for _ in range(args.coroutines)))
+
+    def rate_limit_acquire():
+        asyncio.run(acquire_burst())
+
+    odds_rows = sum(len(odds) for odds in normalized)
+    return [
+        ("transform_fixture", transform_fixture, len(fixtures)),
+        ("transform_livescore", transform_livescore, len(live)),
+        ("normalize_odds", normalize_odds, sum(len(fixture.get("odds") or []) for fixture in fixtures)),
+        ("group_odds", group_odds, odds_rows),
+        ("snapshot_diff_filter", snapshot_diff_filter, odds_rows),
+        ("cache_encode", cache_encode, len(matches)),
+        ("cache_decode", cache_decode, len(matches)),
+        ("rate_limit_acquire", rate_limit_acquire, args.coroutines * args.acquire_calls),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline_path: str, max_regression: float) -> bool:
+    """Print median ratios against a baseline; True if any case regressed beyond the limit"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case["name"]: case for case in json.load(f)["results"]}
+    regressed = False
+    print(f"\nvs baseline {baseline_path} (limit +{max_regression:.0%} median):")
+    for case in results:
+        previous = baseline.get(case["name"])
+        if not previous or not previous["median_ms"]:
+            print(f"  {case['name']:<22} (no baseline)")
+            continue
+        ratio = case["median_ms"] / previous["median_ms"]
+        flag = ratio > 1 + max_regression
+        regressed |= flag
+        case["baseline_ratio"] = round(ratio, 3)
+        print(f"  {case['name']:<22} {ratio:6.2f}x{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", help="SPORTMONKS_RECORD_DIR to take fixtures from")
+    parser.add_argument("--fixtures", type=int, default=200, help="synthetic fixtures (without --recordings)")
+    parser.add_argument("--odds-rows", type=int, default=300, help="odds rows per synthetic fixture")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--coroutines", type=int, default=500)
+    parser.add_argument("--acquire-calls", type=int, default=10)
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.recordings:
+        fixtures = load_recorded_fixtures(args.recordings)
+        if not fixtures:
+            sys.exit(f"No recorded fixtures with participants in {args.recordings}")
+        source = f"recordings:{args.recordings}"
+    else:
+        fixtures = make_fixtures(args.fixtures, random.Random(args.seed), odds_rows=args.odds_rows)
+        source = f"synthetic:fixtures={args.fixtures},odds_rows={args.odds_rows},seed={args.seed}"
+
+    service = SportmonksService()
+    results = []
+    print(f"{'case':<22} {'items':>8} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'us/item':>9}")
+    for name, func, items in build_cases(service, fixtures, args):
+        if args.filter not in name:
+            continue
+        rounds = max(3, args.rounds // 4) if name == "rate_limit_acquire" else args.rounds
+        case = summarize(name, time_rounds(func, rounds), items)
+        results.append(case)
+        print(
+            f"{name:<22} {items:>8} {case['min_ms']:>10.2f} {case['median_ms']:>10.2f} "
+            f"{case['p95_ms']:>10.2f} {case['per_item_us'] or 0:>9.2f}"
+        )
+
+    regressed = compare(results, args.baseline, args.max_regression) if args.baseline else False
+
+    if args.json_path:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "orjson": ORJSON_AVAILABLE,
+                "payload": source,
+                "fixtures": len(fixtures),
+                "rounds": args.rounds,
+            },
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json_path}")
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
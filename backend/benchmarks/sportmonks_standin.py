@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Local SportMonks stand-in: serves recorded responses over HTTP.
+
+Record responses by running the backend once with SPORTMONKS_RECORD_DIR=<dir>, then
+serve them here and point the backend at this server instead of api.sportmonks.com:
+
+    python benchmarks/sportmonks_standin.py --recordings <dir> --port 8099 --latency-ms 120 --rate-429 0.02
+    SPORTMONKS_API_BASE_URL=http://127.0.0.1:8099/v3/football uvicorn server:app
+
+Unrecorded pages of a recorded list endpoint are synthesized from its first page
+(--per-page re-paginates every list body). Counters: GET /_standin/metrics.
+For in-process replay without a server, set SPORTMONKS_REPLAY_DIR=<dir> instead.
+
+Usage (from backend/):
+    python benchmarks/sportmonks_standin.py --recordings recordings/
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from services.sportmonks_replay import RecordingStore, ReplayConfig, ReplayResponder, create_standin_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", required=True, help="directory written by SPORTMONKS_RECORD_DIR")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform random extra latency")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--per-page", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = RecordingStore(args.recordings)
+    if not len(store):
+        sys.exit(f"No recordings found in {args.recordings}")
+    responder = ReplayResponder(store, ReplayConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        per_page=args.per_page,
+        seed=args.seed,
+    ))
+    uvicorn.run(create_standin_app(responder), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
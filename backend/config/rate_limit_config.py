@@ -2,6 +2,7 @@
 Rate Limit Configuration for SportMonks API
 Entity-based rate limit settings and cache TTL policies
 """
+import os
 from typing import Dict, Optional
 from dataclasses import dataclass
 
@@ -12,6 +13,51 @@ RATE_LIMIT_WINDOW = 3600  # 1 hour in seconds
 # Degrade mode threshold: when remaining < this, enter degrade mode
 DEGRADE_THRESHOLD = 200  # requests remaining
 
+# Request priority classes (lower value = served first)
+PRIORITY_INTERACTIVE_LIVE = 0  # User-facing live data (live match list, live odds)
+PRIORITY_INTERACTIVE = 1  # Other user-facing requests (match details, standings)
+PRIORITY_BACKGROUND = 2  # Background refresh (odds worker polls, stats recompute, pagination)
+PRIORITY_WARMUP = 3  # Cache warm-up / static entity prefetch
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE_LIVE: "interactive_live",
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+    PRIORITY_WARMUP: "warmup",
+}
+
+# Tokens held back from each class: a class may only consume while available tokens > reserve.
+# Background/warm-up stop at the degrade threshold, leaving the rest for user-facing requests.
+PRIORITY_RESERVED_HEADROOM = {
+    PRIORITY_INTERACTIVE_LIVE: 0,
+    PRIORITY_INTERACTIVE: 50,
+    PRIORITY_BACKGROUND: DEGRADE_THRESHOLD,
+    PRIORITY_WARMUP: DEGRADE_THRESHOLD * 2,
+}
+
+# Max seconds a request waits in the entity's priority queue before failing
+PRIORITY_MAX_WAIT = {
+    PRIORITY_INTERACTIVE_LIVE: 5.0,
+    PRIORITY_INTERACTIVE: 10.0,
+    PRIORITY_BACKGROUND: 30.0,
+    PRIORITY_WARMUP: 60.0,
+}
+
+# How often queued lower-priority waiters re-check for higher-priority waiters
+PRIORITY_QUEUE_POLL_INTERVAL = 0.05  # seconds
+
+# Budget pacing: forecast consumption until reset_at from recent request history and
+# stretch cache TTLs / worker poll intervals early, instead of hitting degrade mode late
+PACING_ENABLED = os.getenv("RATE_LIMIT_PACING", "true").lower() == "true"
+PACING_LOOKBACK_SECONDS = 300  # Recent history used to estimate request rate
+PACING_MAX_FACTOR = 4.0  # Never stretch TTLs/intervals more than 4x
+PACING_RECALC_INTERVAL = 5.0  # Seconds between pacing recalculations per entity
+
+# Limiter backend: "memory" (per-process state) or "redis" (shared by all workers/replicas)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# Key prefix for shared limiter state in Redis
+RATE_LIMIT_REDIS_PREFIX = os.getenv("RATE_LIMIT_REDIS_PREFIX", "ratelimit")
+
 # Entity definitions
 ENTITY_FIXTURES = "fixtures"
 ENTITY_LIVESCORES = "livescores"
@@ -98,6 +144,33 @@ BACKOFF_CONFIG = {
     "jitter_max": 0.3,  # Max jitter (30% of delay)
 }
 
+# Circuit breaker per entity (fail fast to stale cache when SportMonks is erroring or slow)
+CIRCUIT_BREAKER_CONFIG = {
+    "window_seconds": 60,  # Rolling window for error/latency stats
+    "min_requests": 10,  # Minimum calls in window before the breaker may open
+    "error_rate_threshold": 0.5,  # Open if >= 50% of calls failed
+    "slow_call_seconds": 5.0,  # Calls slower than this count as slow
+    "slow_rate_threshold": 0.5,  # Open if >= 50% of calls were slow
+    "open_seconds": 30.0,  # First open period before a probe is allowed
+    "max_open_seconds": 300.0,  # Open period doubles after failed probes, up to 5 minutes
+    "probe_timeout": 40.0,  # Allow a new probe if the previous one never reported back
+    "stale_cache_ttl": 15 * 60,  # How long stale copies are kept for fail-fast fallback
+    # Stale copies are only written for entities whose regular cache expires sooner,
+    # and for responses up to this size (multi-MB fixture pages would double Redis writes)
+    "stale_cache_max_bytes": 512 * 1024,
+}
+
+# Hedged requests for latency-critical idempotent GETs (livescores, fixtures/{id})
+HEDGING_CONFIG = {
+    "enabled": os.getenv("SPORTMONKS_HEDGING", "false").lower() == "true",
+    "percentile": 0.95,  # Hedge once the first attempt exceeds this latency percentile
+    "min_samples": 20,  # Samples needed before the percentile is trusted
+    "default_delay": 1.0,  # Hedge delay (seconds) until enough samples exist
+    "min_delay": 0.2,  # Never hedge earlier than this
+    "max_hedge_ratio": 0.1,  # At most 10% extra requests per entity
+    "latency_samples": 200,  # Rolling latency samples kept per entity
+}
+
 # Observability thresholds
 OBSERVABILITY_THRESHOLDS = {
     "low_remaining_warning": 500,  # Warn when remaining < 500
@@ -1,8 +1,10 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Header, Depends
+from fastapi.responses import Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from typing import Optional, List
 import os
+import hmac
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -26,8 +28,28 @@ api_router = APIRouter()
 # Import sportmonks service
 from services.sportmonks_service import sportmonks_service
 from services.cache import get_cached, set_cached, cache_key
+from services.snapshot_diff import get_snapshot_diff_store
+from services.odds_archive import get_odds_archive_sink
 from services.firebase_service import get_latest_odds_snapshot
 from services.rate_limit_manager import get_rate_limit_manager
+from services.circuit_breaker import get_circuit_breakers
+from services.odds_columns import OddsColumns
+from services.market_classification import get_market_classifier
+from services.metrics import MetricsMiddleware, render_metrics, set_pool_stats
+from services.tracing import TracingMiddleware
+from services.profiler import run_cpu_profile, run_memory_diff, ProfilerBusy
+from services.loop_monitor import get_loop_monitor
+from services.hot_log import HotPathLogger, lazy, get_hot_log_metrics
+from services.transform_pool import get_transform_pool
+from config.rate_limit_config import (
+    PRIORITY_BACKGROUND,
+    ENTITY_FIXTURES,
+    ENTITY_LIVESCORES,
+    ENTITY_ODDS,
+)
+
+# Rate-limited logging for per-request / per-player log sites
+hot_log = HotPathLogger(logger)
 
 # Bookmaker ID constants
 BOOKMAKER_BET365_ID = 2  # Bet365 bookmaker ID in Sportmonks API
@@ -91,20 +113,16 @@ async def get_matches(
         # Don't filter by bookmaker for list endpoint to avoid API errors
         filters = None
         
-        fixtures = await sportmonks_service.get_fixtures(
+        # Transform fixtures to match format with Turkey timezone as each page is parsed
+        matches = await sportmonks_service.get_fixtures(
             date_from=date_from,
             date_to=date_to,
             league_id=league_id,
             include=include,
-            filters=filters
+            filters=filters,
+            transform=sportmonks_service.fixture_transform(timezone_offset=3)
         )
         
-        # Transform fixtures to match format with Turkey timezone
-        matches = []
-        for fixture in fixtures:
-            transformed = sportmonks_service._transform_fixture_to_match(fixture, timezone_offset=3)
-            matches.append(transformed)
-        
         # Categorize matches - prioritize live, then finished, then upcoming
         # A match can only be in one category
         live_matches = []
@@ -144,7 +162,10 @@ async def get_matches(
         }
         
         # Cache result (TTL: 60-120 seconds for fixtures list, use 90 seconds as average)
-        await set_cached(cache_key_str, result, ttl_seconds=90)
+        await set_cached(
+            cache_key_str, result,
+            ttl_seconds=get_rate_limit_manager().paced_ttl(ENTITY_FIXTURES, 90)
+        )
         
         return result
     except Exception as e:
@@ -183,7 +204,7 @@ async def get_live_matches():
         # Transform livescores to match format and filter out finished matches
         matches = []
         for livescore in livescores:
-            transformed = sportmonks_service._transform_livescore_to_match(livescore)
+            transformed = sportmonks_service._transform_livescore_to_match_cached(livescore)
             # Include matches that are:
             # 1. Live (is_live = True) and not finished, OR
             # 2. In half-time break (HT status) and not finished (to show "DEVRE ARASI")
@@ -207,7 +228,10 @@ async def get_live_matches():
         }
         
         # Cache result (TTL: 3-5 seconds for live matches, use 4 seconds for better freshness)
-        await set_cached(cache_key_str, result, ttl_seconds=4)
+        await set_cached(
+            cache_key_str, result,
+            ttl_seconds=get_rate_limit_manager().paced_ttl(ENTITY_LIVESCORES, 4)
+        )
         
         return result
     except Exception as e:
@@ -216,6 +240,18 @@ async def get_live_matches():
         logger.exception(e)  # Log full traceback for debugging
         raise HTTPException(status_code=500, detail=error_detail)
 
+async def get_snapshot_diff_source(match_id: int):
+    """
+    Previous-snapshot source for the odds snapshot diff filter: (diff_state, previous_snapshot).
+    Uses the odds worker's in-memory state; Firestore (cached, single read) is consulted
+    when the fixture has none (worker not running here, restarted, state expired, or the
+    fixture is not polled).
+    """
+    diff_state = get_snapshot_diff_store().get(match_id)
+    if diff_state is not None:
+        return diff_state, None
+    return None, await get_latest_odds_snapshot(match_id)
+
 @api_router.get("/matches/{match_id}")
 async def get_match_details(match_id: int):
     """
@@ -254,7 +290,7 @@ async def get_match_details(match_id: int):
         match = sportmonks_service._transform_fixture_to_match(fixture, timezone_offset=3)
         
         # Now fetch odds separately with all market data from bet365
-        logger.info(f"Fetching odds separately for match {match_id} from bookmaker {BOOKMAKER_BET365_ID} (Bet365)...")
+        hot_log.info("match_details.odds", "Fetching odds separately for match %s from bookmaker %s (Bet365)...", match_id, BOOKMAKER_BET365_ID)
         try:
             # Get all odds data - try simple format first
             # If simple doesn't work, we'll try nested format
@@ -269,62 +305,66 @@ async def get_match_details(match_id: int):
             raw_odds_data = None
             if odds_fixture:
                 raw_odds_data = odds_fixture.get("odds", {})
-                logger.info(f"Fetched odds fixture for match {match_id}, raw_odds_data type: {type(raw_odds_data)}")
+                hot_log.debug("match_details.odds", "Fetched odds fixture for match %s, raw_odds_data type: %s", match_id, type(raw_odds_data).__name__)
             else:
                 logger.warning(f"Failed to fetch odds fixture for match {match_id}")
             
             if odds_fixture and raw_odds_data:
-                logger.info(f"Raw odds data type for match {match_id}: {type(raw_odds_data)}, is dict: {isinstance(raw_odds_data, dict)}, is list: {isinstance(raw_odds_data, list)}")
-                if isinstance(raw_odds_data, dict):
-                    if "data" in raw_odds_data:
-                        data_len = len(raw_odds_data.get("data", [])) if isinstance(raw_odds_data.get("data"), list) else 'not a list'
-                        logger.info(f"Odds data has 'data' key, length: {data_len}")
-                    else:
-                        logger.info(f"Odds data dict keys: {list(raw_odds_data.keys())[:10]}")
-                elif isinstance(raw_odds_data, list):
-                    logger.info(f"Odds data is list, length: {len(raw_odds_data)}")
+                # Parse raw odds once into columns; both bookmaker selections below reuse them
+                odds_columns = OddsColumns.from_raw(raw_odds_data)
                 
-                # Extract odds and filter by bookmaker 1
-                # Temporarily check all bookmakers to see if cards markets exist
-                odds_data_all = sportmonks_service._extract_and_normalize_odds(raw_odds_data, bookmaker_id_filter=None)
-                
-                # Check for cards markets with various patterns
-                cards_all = [o for o in odds_data_all if any(
-                    keyword in (o.get('market_name','') or '').lower() 
-                    for keyword in ['card', 'booking', 'yellow', 'red', 'kart', 'sending']
-                )]
-                
-                if cards_all:
-                    logger.info(f"Found {len(cards_all)} cards markets from ALL bookmakers for match {match_id}")
-                    logger.info(f"Cards markets: {[c.get('market_name') for c in cards_all[:10]]}")
-                    logger.info(f"Cards bookmakers: {set([c.get('bookmaker_id') for c in cards_all])}")
-                else:
-                    # Log all unique market names to see what we're getting
-                    all_markets = set([o.get('market_name') for o in odds_data_all if o.get('market_name')])
-                    logger.info(f"No cards markets found for match {match_id}. Total unique markets: {len(all_markets)}")
-                    # Log first 20 market names for debugging
-                    logger.info(f"Sample market names: {sorted(list(all_markets))[:20]}")
+                # Cards markets across all bookmakers (debug only, sampled: names only, no dicts)
+                if hot_log.sampled():
+                    all_indices = odds_columns.select()
+                    all_market_names = odds_columns.market_names(all_indices)
+                    is_cards_market = get_market_classifier().is_cards_market
+                    cards_all = [
+                        (market_name, bookmaker_id)
+                        for market_name, bookmaker_id, market_id in zip(
+                            all_market_names,
+                            odds_columns.take("bookmaker_id", all_indices),
+                            odds_columns.take("market_id", all_indices)
+                        )
+                        if is_cards_market(market_id, market_name)
+                    ]
+                    if cards_all:
+                        logger.debug(
+                            "Found %d cards markets from ALL bookmakers for match %s: %s (bookmakers %s)",
+                            len(cards_all), match_id, [market_name for market_name, _ in cards_all[:10]],
+                            set(bookmaker_id for _, bookmaker_id in cards_all)
+                        )
+                    else:
+                        all_markets = set(all_market_names)
+                        logger.debug(
+                            "No cards markets found for match %s. Total unique markets: %d, sample: %s",
+                            match_id, len(all_markets), sorted(all_markets)[:20]
+                        )
                 
                 # Now filter by bet365
-                odds_data = sportmonks_service._extract_and_normalize_odds(raw_odds_data, bookmaker_id_filter=BOOKMAKER_BET365_ID)
+                odds_data = sportmonks_service._normalize_odds_columnar(
+                    bookmaker_id_filter=BOOKMAKER_BET365_ID, columns=odds_columns
+                )
                 
-                # Apply snapshot diff filter (Bet365 behavior)
-                previous_snapshot = await get_latest_odds_snapshot(match_id)
+                # Apply snapshot diff filter (Bet365 behavior) against the odds worker's in-memory state
+                diff_state, previous_snapshot = await get_snapshot_diff_source(match_id)
                 match_status = match.get("status", "LIVE")
-                if previous_snapshot:
+                if diff_state is not None or previous_snapshot:
                     odds_data = sportmonks_service._filter_by_snapshot_diff(
                         odds_data,
                         previous_snapshot,
-                        match_status
+                        match_status=match_status,
+                        diff_state=diff_state
                     )
-                    logger.info(f"Applied snapshot diff filter for match {match_id}, {len(odds_data)} odds remaining")
+                    hot_log.debug("match_details.odds", "Applied snapshot diff filter for match %s, %d odds remaining", match_id, len(odds_data))
                 
                 if odds_data:
                     match["odds"] = odds_data
-                    logger.info(f"Fetched {len(odds_data)} odds separately for match {match_id}")
+                    hot_log.info("match_details.odds", "Fetched %d odds separately for match %s", len(odds_data), match_id)
                 else:
-                    logger.warning(f"No odds data extracted for match {match_id} after normalization")
-                    logger.warning(f"Raw odds data sample: {str(raw_odds_data)[:500]}")
+                    hot_log.warning(
+                        "match_details.no_odds", "No odds data extracted for match %s after normalization, raw sample: %s",
+                        match_id, lazy(lambda: str(raw_odds_data)[:500])
+                    )
             else:
                 logger.warning(f"Failed to fetch odds fixture for match {match_id} - odds_fixture: {bool(odds_fixture)}, raw_odds_data: {bool(raw_odds_data)}")
         except Exception as e:
@@ -352,6 +392,9 @@ async def get_match_details(match_id: int):
             # Pre-match (upcoming): cache for 180 seconds (3 minutes)
             cache_ttl = 180
         
+        # Stretch TTL if the fixtures budget is being spent faster than it refills
+        cache_ttl = get_rate_limit_manager().paced_ttl(ENTITY_FIXTURES, cache_ttl)
+        
         # Cache result
         await set_cached(cache_key_str, result, ttl_seconds=cache_ttl)
         
@@ -389,15 +432,16 @@ async def get_match_odds(match_id: int):
         # Normalize odds
         normalized_odds = sportmonks_service._extract_and_normalize_odds(odds_data, bookmaker_id_filter=2)
         
-        # Apply snapshot diff filter (Bet365 behavior)
-        previous_snapshot = await get_latest_odds_snapshot(match_id)
+        # Apply snapshot diff filter (Bet365 behavior) against the odds worker's in-memory state
+        diff_state, previous_snapshot = await get_snapshot_diff_source(match_id)
         # Get match status from fixture if available, otherwise default to LIVE
         match_status = "LIVE"  # Default, could be improved by fetching match details
-        if previous_snapshot:
+        if diff_state is not None or previous_snapshot:
             normalized_odds = sportmonks_service._filter_by_snapshot_diff(
                 normalized_odds,
                 previous_snapshot,
-                match_status
+                match_status=match_status,
+                diff_state=diff_state
             )
             logger.debug(f"Applied snapshot diff filter for match {match_id} odds, {len(normalized_odds)} odds remaining")
         
@@ -408,7 +452,10 @@ async def get_match_odds(match_id: int):
         }
         
         # Cache result (TTL: 3-5 seconds for live matches, 60 seconds for pre-match)
-        await set_cached(cache_key_str, result, ttl_seconds=4)
+        await set_cached(
+            cache_key_str, result,
+            ttl_seconds=get_rate_limit_manager().paced_ttl(ENTITY_ODDS, 4)
+        )
         
         return result
     except HTTPException:
@@ -479,9 +526,7 @@ async def get_match_lineups(match_id: int):
                 
                 # Determine if starting XI or substitute
                 # Type ID 12 = Starting XI, Type ID 13 = Substitutes (according to Sportmonks API)
-                # Log for debugging
                 player_name = lineup_item.get("player_name") or lineup_item.get("player", {}).get("name", "Unknown")
-                logger.info(f"Lineup item: type_id={type_id}, type_name='{type_name}', player='{player_name}', team_id={team_id}")
                 
                 # Check if it's a substitute (type_id 13 = substitute, or keywords in type_name)
                 is_substitute = (
@@ -498,8 +543,6 @@ async def get_match_lineups(match_id: int):
                     "lineup" in type_name
                 )
                 
-                logger.info(f"  -> is_substitute={is_substitute}, is_starting={is_starting}")
-                
                 player_data = {
                     "id": lineup_item.get("player_id"),
                     "name": lineup_item.get("player_name") or lineup_item.get("player", {}).get("name", ""),
@@ -512,21 +555,28 @@ async def get_match_lineups(match_id: int):
                 if team_id == home_team_id:
                     if is_substitute:
                         transformed_lineups["home"]["substitutes"].append(player_data)
-                        logger.info(f"  -> Added to home substitutes: {player_name}")
                     elif is_starting:
                         transformed_lineups["home"]["startingXI"].append(player_data)
-                        logger.info(f"  -> Added to home startingXI: {player_name}")
                     else:
-                        logger.warning(f"  -> Player not classified: {player_name} (type_id={type_id}, type_name='{type_name}')")
+                        hot_log.warning(
+                            "lineups.unclassified", "Player not classified: %s (type_id=%s, type_name='%s')",
+                            player_name, type_id, type_name
+                        )
                 elif team_id == away_team_id:
                     if is_substitute:
                         transformed_lineups["away"]["substitutes"].append(player_data)
-                        logger.info(f"  -> Added to away substitutes: {player_name}")
                     elif is_starting:
                         transformed_lineups["away"]["startingXI"].append(player_data)
-                        logger.info(f"  -> Added to away startingXI: {player_name}")
                     else:
-                        logger.warning(f"  -> Player not classified: {player_name} (type_id={type_id}, type_name='{type_name}')")
+                        hot_log.warning(
+                            "lineups.unclassified", "Player not classified: %s (type_id=%s, type_name='%s')",
+                            player_name, type_id, type_name
+                        )
+            hot_log.info(
+                "lineups", "Lineups for match %s: home %d+%d, away %d+%d (starting XI + substitutes)", match_id,
+                len(transformed_lineups["home"]["startingXI"]), len(transformed_lineups["home"]["substitutes"]),
+                len(transformed_lineups["away"]["startingXI"]), len(transformed_lineups["away"]["substitutes"])
+            )
         
         return {
             "success": True,
@@ -634,19 +684,16 @@ async def get_stats():
         include = "participants;scores;events.type;events.player;league;odds;odds.bookmaker;odds.market;odds.values;odds.participants"
         # Use bet365 for all odds
         filters = f"bookmakers:{BOOKMAKER_BET365_ID}"
-        fixtures = await sportmonks_service.get_fixtures(
+        # Transform fixtures to match format as each page is parsed
+        matches = await sportmonks_service.get_fixtures(
             date_from=today,
             date_to=seven_days_later,
             include=include,
-            filters=filters
+            filters=filters,
+            priority=PRIORITY_BACKGROUND,  # Homepage counters - don't compete with live pages
+            transform=sportmonks_service.fixture_transform(timezone_offset=3)
         )
         
-        # Transform fixtures to match format
-        matches = []
-        for fixture in fixtures:
-            transformed = sportmonks_service._transform_fixture_to_match(fixture, timezone_offset=3)
-            matches.append(transformed)
-        
         # Filter matches
         today_matches = []
         upcoming_matches = []
@@ -730,8 +777,15 @@ app.add_middleware(
     allow_credentials=allow_creds,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id"],
 )
 
+# Latency histograms per route template and per stage (Prometheus, see /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# One trace per request (OpenTelemetry, TRACING_ENABLED), trace id returned in X-Trace-Id
+app.add_middleware(TracingMiddleware)
+
 # Include the router in the main app (after CORS middleware) with /api prefix
 # Rate limit observability endpoint
 @api_router.get("/rate-limit/metrics")
@@ -749,10 +803,20 @@ async def get_rate_limit_metrics(entity: Optional[str] = None):
         rate_limit_manager = get_rate_limit_manager()
         metrics = rate_limit_manager.get_metrics(entity=entity)
         alerts = rate_limit_manager.check_alerts()
+        circuit_breakers = get_circuit_breakers().get_metrics(entity=entity)
         
         return {
             "success": True,
             "metrics": metrics,
+            "circuit_breakers": circuit_breakers,
+            "hedging": sportmonks_service.get_hedging_metrics(),
+            "connection_pool": sportmonks_service.get_pool_stats(),
+            "transform_memo": sportmonks_service.get_transform_memo_metrics(),
+            "transform_pool": sportmonks_service.get_transform_pool_metrics(),
+            "snapshot_diff": get_snapshot_diff_store().get_metrics(),
+            "odds_archive": get_odds_archive_sink().get_metrics() if get_odds_archive_sink() else None,
+            "event_loop": get_loop_monitor().get_metrics() if get_loop_monitor() else None,
+            "hot_log": get_hot_log_metrics(),
             "alerts": alerts,
             "timestamp": datetime.now().isoformat()
         }
@@ -760,12 +824,66 @@ async def get_rate_limit_metrics(entity: Optional[str] = None):
         logger.error(f"Error getting rate limit metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Admin endpoints are only served when ADMIN_TOKEN is set (sent as X-Admin-Token)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@api_router.get("/admin/profile", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def admin_cpu_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(10.0, gt=0),
+    threads: str = Query("loop", pattern="^(loop|all)$"),
+    format: str = Query("collapsed", pattern="^(collapsed|svg)$")
+):
+    """
+    Sample this worker's stacks for `seconds` and return collapsed stacks (text) or an SVG flamegraph.
+    threads=loop profiles the event loop thread only, threads=all includes worker threads.
+    """
+    try:
+        body, summary = await run_cpu_profile(seconds, interval_ms, loop_only=threads == "loop", output=format)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    media_type = "image/svg+xml" if format == "svg" else "text/plain; charset=utf-8"
+    headers = {"X-Profile-Samples": str(summary["samples"]), "X-Profile-Seconds": str(summary["seconds"])}
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@api_router.get("/admin/memory", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def admin_memory_diff(
+    seconds: float = Query(30.0, gt=0),
+    top: int = Query(25, ge=1, le=200),
+    group_by: str = Query("lineno", pattern="^(lineno|traceback|filename)$")
+):
+    """tracemalloc snapshot diff over `seconds`: where memory grew, largest growth first"""
+    try:
+        return await run_memory_diff(seconds, top=top, group_by=group_by)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 app.include_router(api_router, prefix="/api")
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus exposition format: request/stage/upstream latency, cache, pool, odds worker and event loop metrics"""
+    set_pool_stats(sportmonks_service.get_pool_stats())
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # Startup and shutdown events for background worker
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks on application startup."""
+    # Event loop lag monitor (logs the blocking stack of long stalls, exported to /metrics)
+    loop_monitor = get_loop_monitor()
+    if loop_monitor:
+        loop_monitor.start()
     try:
         from services.odds_worker import start_odds_worker
         await start_odds_worker()
@@ -784,5 +902,11 @@ async def shutdown_event():
         logger.info("Application shutdown completed - odds worker stopped")
     except Exception as e:
         logger.error(f"Error stopping odds worker: {e}")
+    loop_monitor = get_loop_monitor()
+    if loop_monitor:
+        await loop_monitor.stop()
+    transform_pool = get_transform_pool()
+    if transform_pool:
+        transform_pool.shutdown()
 
 # Logging already configured above
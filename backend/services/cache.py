@@ -10,6 +10,12 @@ import os
 from functools import wraps
 from datetime import timedelta
 
+from services.records import dumps
+from services.metrics import (
+    record_cache, stage_timer, STAGE_REDIS_GET, STAGE_REDIS_SET, STAGE_SERIALIZE,
+)
+from services.tracing import span, set_attributes
+
 logger = logging.getLogger(__name__)
 
 # Redis connection pool (singleton)
@@ -61,13 +67,19 @@ async def get_cached(key: str) -> Optional[Any]:
     """Get value from cache."""
     client = get_redis_client()
     if not client:
+        record_cache(key, "disabled")
         return None
     
     try:
-        value = client.get(key)
-        if value:
-            return json.loads(value)
+        with stage_timer(STAGE_REDIS_GET), span("cache.get", key=key):
+            value = client.get(key)
+            set_attributes(hit=bool(value))
+            if value:
+                record_cache(key, "hit")
+                return json.loads(value)
+        record_cache(key, "miss")
     except (redis.RedisError, json.JSONDecodeError) as e:
+        record_cache(key, "error")
         logger.warning(f"Cache get error for key {key}: {e}")
     
     return None
@@ -80,14 +92,34 @@ async def set_cached(key: str, value: Any, ttl_seconds: int) -> bool:
         return False
     
     try:
-        serialized = json.dumps(value, default=str)  # default=str handles datetime objects
-        client.setex(key, ttl_seconds, serialized)
+        with span("cache.set", key=key, ttl=ttl_seconds):
+            with stage_timer(STAGE_SERIALIZE):
+                serialized = dumps(value)  # handles records; datetime objects become str
+            with stage_timer(STAGE_REDIS_SET):
+                client.setex(key, ttl_seconds, serialized)
+            set_attributes(bytes=len(serialized))
         return True
     except (redis.RedisError, TypeError) as e:
         logger.warning(f"Cache set error for key {key}: {e}")
         return False
 
 
+async def set_cached_raw(key: str, serialized: Any, ttl_seconds: int) -> bool:
+    """Set an already serialized JSON value (str or bytes, e.g. a response body) in cache with TTL."""
+    client = get_redis_client()
+    if not client:
+        return False
+    
+    try:
+        with span("cache.set", key=key, ttl=ttl_seconds, bytes=len(serialized)):
+            with stage_timer(STAGE_REDIS_SET):
+                client.setex(key, ttl_seconds, serialized)
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"Cache set error for key {key}: {e}")
+        return False
+
+
 async def delete_cached(key: str) -> bool:
     """Delete value from cache."""
     client = get_redis_client()
@@ -0,0 +1,210 @@
+"""
+Per-entity circuit breaker for SportMonks API
+Closed -> Open when error rate or slow-call rate is too high,
+Open -> Half-open after a cooldown (single probe request),
+Half-open -> Closed on probe success, back to Open on probe failure.
+"""
+import time
+import logging
+from typing import Dict, Optional
+from dataclasses import dataclass, field
+from collections import deque
+
+from config.rate_limit_config import CIRCUIT_BREAKER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+@dataclass
+class EntityCircuitBreaker:
+    """Circuit breaker state for a single entity"""
+    entity: str
+    state: str = STATE_CLOSED
+
+    # Recent call outcomes: (timestamp, success, latency_seconds)
+    calls: deque = field(default_factory=deque)
+
+    # Open state
+    opened_at: Optional[float] = None
+    open_until: Optional[float] = None
+    open_seconds: float = CIRCUIT_BREAKER_CONFIG["open_seconds"]
+
+    # Half-open probe
+    probe_started_at: Optional[float] = None
+
+    # Metrics
+    total_opens: int = 0
+    total_rejected: int = 0
+    total_stale_served: int = 0
+
+    def _prune(self, now: float) -> None:
+        """Drop outcomes outside the rolling window"""
+        cutoff = now - CIRCUIT_BREAKER_CONFIG["window_seconds"]
+        while self.calls and self.calls[0][0] < cutoff:
+            self.calls.popleft()
+
+    def allow_request(self) -> bool:
+        """
+        Check if a request may go to the API.
+        In half-open state only a single probe request is let through.
+        """
+        now = time.time()
+
+        if self.state == STATE_CLOSED:
+            return True
+
+        if self.state == STATE_OPEN:
+            if self.open_until is not None and now >= self.open_until:
+                self.state = STATE_HALF_OPEN
+                self.probe_started_at = now
+                logger.info(f"Circuit for {self.entity} half-open, sending probe request")
+                return True
+            self.total_rejected += 1
+            return False
+
+        # Half-open: one probe at a time (unless the probe never reported back)
+        if self.probe_started_at is None or now - self.probe_started_at >= CIRCUIT_BREAKER_CONFIG["probe_timeout"]:
+            self.probe_started_at = now
+            return True
+        self.total_rejected += 1
+        return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call"""
+        now = time.time()
+        self.calls.append((now, True, latency))
+        self._prune(now)
+
+        if self.state == STATE_HALF_OPEN:
+            if latency < CIRCUIT_BREAKER_CONFIG["slow_call_seconds"]:
+                self._close()
+            else:
+                self._open(now, reason=f"slow probe ({latency:.1f}s)")
+            return
+
+        self._evaluate(now)
+
+    def release_probe(self) -> None:
+        """
+        The half-open probe finished without reaching a verdict (rate limited, never sent,
+        cancelled): let the next request probe instead of waiting for probe_timeout.
+        """
+        if self.state == STATE_HALF_OPEN:
+            self.probe_started_at = None
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed call (timeout, connection error, 5xx)"""
+        now = time.time()
+        self.calls.append((now, False, latency))
+        self._prune(now)
+
+        if self.state == STATE_HALF_OPEN:
+            self._open(now, reason="probe failed")
+            return
+
+        self._evaluate(now)
+
+    def _evaluate(self, now: float) -> None:
+        """Open the circuit if error or slow-call rate exceeds thresholds"""
+        if self.state != STATE_CLOSED or len(self.calls) < CIRCUIT_BREAKER_CONFIG["min_requests"]:
+            return
+
+        error_rate = self.get_error_rate()
+        slow_rate = self.get_slow_rate()
+        if error_rate >= CIRCUIT_BREAKER_CONFIG["error_rate_threshold"]:
+            self._open(now, reason=f"error rate {error_rate:.0%}")
+        elif slow_rate >= CIRCUIT_BREAKER_CONFIG["slow_rate_threshold"]:
+            self._open(now, reason=f"slow call rate {slow_rate:.0%}")
+
+    def _open(self, now: float, reason: str) -> None:
+        """Enter open state (open period doubles after each failed probe)"""
+        if self.state == STATE_HALF_OPEN:
+            self.open_seconds = min(CIRCUIT_BREAKER_CONFIG["max_open_seconds"], self.open_seconds * 2)
+        else:
+            self.open_seconds = CIRCUIT_BREAKER_CONFIG["open_seconds"]
+
+        self.state = STATE_OPEN
+        self.opened_at = now
+        self.open_until = now + self.open_seconds
+        self.probe_started_at = None
+        self.total_opens += 1
+        logger.warning(f"Circuit for {self.entity} opened for {self.open_seconds:.0f}s: {reason}")
+
+    def _close(self) -> None:
+        """Return to closed state with a clean window"""
+        self.state = STATE_CLOSED
+        self.opened_at = None
+        self.open_until = None
+        self.probe_started_at = None
+        self.open_seconds = CIRCUIT_BREAKER_CONFIG["open_seconds"]
+        self.calls.clear()
+        logger.info(f"Circuit for {self.entity} closed (probe succeeded)")
+
+    def get_error_rate(self) -> float:
+        """Failed calls / all calls in window (0.0 to 1.0)"""
+        if not self.calls:
+            return 0.0
+        return sum(1 for _, success, _ in self.calls if not success) / len(self.calls)
+
+    def get_slow_rate(self) -> float:
+        """Slow calls / all calls in window (0.0 to 1.0)"""
+        if not self.calls:
+            return 0.0
+        slow = CIRCUIT_BREAKER_CONFIG["slow_call_seconds"]
+        return sum(1 for _, _, latency in self.calls if latency >= slow) / len(self.calls)
+
+    def get_metrics(self) -> Dict:
+        """Get current breaker state for observability"""
+        now = time.time()
+        self._prune(now)
+        return {
+            "entity": self.entity,
+            "state": self.state,
+            "calls_in_window": len(self.calls),
+            "error_rate": round(self.get_error_rate(), 3),
+            "slow_rate": round(self.get_slow_rate(), 3),
+            "opened_at": self.opened_at,
+            "open_until": self.open_until,
+            "open_remaining_seconds": max(0, self.open_until - now) if self.open_until else None,
+            "total_opens": self.total_opens,
+            "total_rejected": self.total_rejected,
+            "total_stale_served": self.total_stale_served,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Per-entity circuit breakers"""
+
+    def __init__(self):
+        self._breakers: Dict[str, EntityCircuitBreaker] = {}
+
+    def get(self, entity: str) -> EntityCircuitBreaker:
+        """Get or create breaker for entity"""
+        breaker = self._breakers.get(entity)
+        if breaker is None:
+            breaker = self._breakers[entity] = EntityCircuitBreaker(entity=entity)
+        return breaker
+
+    def get_metrics(self, entity: Optional[str] = None) -> Dict:
+        """Get breaker metrics for entity(ies)"""
+        if entity:
+            return self.get(entity).get_metrics()
+        return {
+            entity: breaker.get_metrics()
+            for entity, breaker in self._breakers.items()
+        }
+
+
+# Global singleton instance
+_circuit_breakers: Optional[CircuitBreakerRegistry] = None
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get global circuit breaker registry"""
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakerRegistry()
+    return _circuit_breakers
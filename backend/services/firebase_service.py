@@ -4,10 +4,18 @@ Handles Firestore operations for odds snapshots.
 """
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from services.metrics import stage_timer, STAGE_FIRESTORE_READ, STAGE_FIRESTORE_WRITE
+from services.tracing import span
+
 try:
     import firebase_admin
     from firebase_admin import credentials, firestore
@@ -21,6 +29,15 @@ logger = logging.getLogger(__name__)
 _firebase_app = None
 _db = None
 
+# Local cache of latest odds snapshots (seconds; also caches misses)
+ODDS_SNAPSHOT_CACHE_TTL = float(os.getenv("ODDS_SNAPSHOT_CACHE_TTL", "3"))
+ODDS_SNAPSHOT_CACHE_MAX_SIZE = int(os.getenv("ODDS_SNAPSHOT_CACHE_MAX_SIZE", "2000"))
+
+# Payloads larger than this are not embedded in the parent document (1 MiB doc limit)
+ODDS_SNAPSHOT_EMBED_MAX_BYTES = int(os.getenv("ODDS_SNAPSHOT_EMBED_MAX_BYTES", "700000"))
+
+_snapshot_cache: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+
 
 def initialize_firebase() -> bool:
     """Initialize Firebase Admin SDK."""
@@ -91,6 +108,88 @@ def get_firestore_db():
     return _db
 
 
+def _snapshot_hash(odds_data: Any) -> Tuple[str, int]:
+    """Content hash and serialized size of an odds payload"""
+    serialized = json.dumps(odds_data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha1(serialized).hexdigest(), len(serialized)
+
+
+def _cache_snapshot(fixture_id: Any, snapshot: Optional[Dict[str, Any]]) -> None:
+    """Store a snapshot (or a miss) in the local cache"""
+    key = str(fixture_id)
+    _snapshot_cache[key] = (time.monotonic(), snapshot)
+    _snapshot_cache.move_to_end(key)
+    while len(_snapshot_cache) > ODDS_SNAPSHOT_CACHE_MAX_SIZE:
+        _snapshot_cache.popitem(last=False)
+
+
+def _get_cached_snapshot(fixture_id: Any) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """(found, snapshot) from the local cache"""
+    entry = _snapshot_cache.get(str(fixture_id))
+    if entry is None:
+        return False, None
+    cached_at, snapshot = entry
+    if time.monotonic() - cached_at > ODDS_SNAPSHOT_CACHE_TTL:
+        _snapshot_cache.pop(str(fixture_id), None)
+        return False, None
+    return True, snapshot
+
+
+def _update_latest_snapshot(
+    transaction,
+    parent_ref,
+    fixture_id: int,
+    snapshot_id: str,
+    snapshot_data: Dict[str, Any],
+    odds_hash: str,
+    size: int
+) -> None:
+    """
+    Point the parent document at the new snapshot, embedding the payload so readers need a
+    single read. The embedded payload's hash is read in the same transaction: an unchanged
+    payload only refreshes timestamp/is_live, whichever worker process embedded it.
+    """
+    stored = parent_ref.get(field_paths=["latest_snapshot_hash"], transaction=transaction)
+    stored_hash = (stored.to_dict() or {}).get("latest_snapshot_hash") if stored.exists else None
+    parent_data = {
+        "latest_snapshot_id": snapshot_id,
+        "last_updated": snapshot_data["timestamp"],
+        "fixture_id": fixture_id,
+        "is_live": snapshot_data["is_live"],
+        # New history to compact (snapshot_compaction queries on this flag)
+        "compacted": False
+    }
+    if size > ODDS_SNAPSHOT_EMBED_MAX_BYTES:
+        # Too large for the parent document; readers fall back to the subdocument
+        parent_data["latest_snapshot"] = None
+        parent_data["latest_snapshot_hash"] = None
+    elif stored_hash == odds_hash:
+        parent_data["latest_snapshot"] = {
+            "timestamp": snapshot_data["timestamp"],
+            "is_live": snapshot_data["is_live"]
+        }
+    else:
+        parent_data["latest_snapshot"] = snapshot_data
+        parent_data["latest_snapshot_hash"] = odds_hash
+    transaction.set(parent_ref, parent_data, merge=True)
+
+
+def _write_snapshot(db, fixture_id: int, snapshot_data: Dict[str, Any]) -> None:
+    """Blocking Firestore writes for save_odds_snapshot (run in a worker thread)"""
+    # Collection path: odds_snapshots/{fixture_id}/snapshots/{timestamp}
+    collection_ref = db.collection("odds_snapshots").document(str(fixture_id))
+    
+    # Save to subcollection with timestamp as document ID
+    snapshot_ref = collection_ref.collection("snapshots").document()
+    snapshot_ref.set(snapshot_data)
+    
+    # Also update the latest snapshot reference (retried by the SDK on contention)
+    odds_hash, size = _snapshot_hash(snapshot_data["odds"])
+    firestore.transactional(_update_latest_snapshot)(
+        db.transaction(), collection_ref, fixture_id, snapshot_ref.id, snapshot_data, odds_hash, size
+    )
+
+
 async def save_odds_snapshot(fixture_id: int, odds_data: Any, is_live: bool = False) -> bool:
     """
     Save odds snapshot to Firestore.
@@ -109,11 +208,6 @@ async def save_odds_snapshot(fixture_id: int, odds_data: Any, is_live: bool = Fa
         return False
     
     try:
-        from datetime import datetime, timezone
-        
-        # Collection path: odds_snapshots/{fixture_id}/snapshots/{timestamp}
-        collection_ref = db.collection("odds_snapshots").document(str(fixture_id))
-        
         # Create snapshot document
         snapshot_data = {
             "fixture_id": fixture_id,
@@ -124,17 +218,10 @@ async def save_odds_snapshot(fixture_id: int, odds_data: Any, is_live: bool = Fa
             "bookmaker_name": "Bet365"
         }
         
-        # Save to subcollection with timestamp as document ID
-        snapshot_ref = collection_ref.collection("snapshots").document()
-        snapshot_ref.set(snapshot_data)
-        
-        # Also update the latest snapshot reference
-        collection_ref.set({
-            "latest_snapshot_id": snapshot_ref.id,
-            "last_updated": datetime.now(timezone.utc),
-            "fixture_id": fixture_id,
-            "is_live": is_live
-        }, merge=True)
+        with stage_timer(STAGE_FIRESTORE_WRITE), span("firestore.write", fixture_id=fixture_id):
+            await asyncio.to_thread(_write_snapshot, db, fixture_id, snapshot_data)
+        # Write-through: readers in this process get the new snapshot without a read
+        _cache_snapshot(fixture_id, snapshot_data)
         
         logger.debug(f"Saved odds snapshot for fixture {fixture_id} (live: {is_live})")
         return True
@@ -143,9 +230,39 @@ async def save_odds_snapshot(fixture_id: int, odds_data: Any, is_live: bool = Fa
         return False
 
 
+def _read_latest_snapshot(db, fixture_id: int) -> Optional[Dict[str, Any]]:
+    """Blocking Firestore read for get_latest_odds_snapshot (run in a worker thread)"""
+    collection_ref = db.collection("odds_snapshots").document(str(fixture_id))
+    doc = collection_ref.get()
+    
+    if not doc.exists:
+        return None
+    
+    data = doc.to_dict()
+    embedded = data.get("latest_snapshot")
+    if isinstance(embedded, dict) and "odds" in embedded:
+        return embedded
+    
+    # Documents written before the payload was embedded (or too large to embed)
+    latest_snapshot_id = data.get("latest_snapshot_id")
+    
+    if not latest_snapshot_id:
+        return None
+    
+    snapshot_ref = collection_ref.collection("snapshots").document(latest_snapshot_id)
+    snapshot_doc = snapshot_ref.get()
+    
+    if snapshot_doc.exists:
+        return snapshot_doc.to_dict()
+    
+    return None
+
+
 async def get_latest_odds_snapshot(fixture_id: int) -> Optional[Dict[str, Any]]:
     """
     Get the latest odds snapshot from Firestore.
+    Served from a short-lived local cache when possible, otherwise one read of the
+    parent document (off the event loop) which embeds the latest payload.
     
     Args:
         fixture_id: Match/fixture ID
@@ -153,31 +270,19 @@ async def get_latest_odds_snapshot(fixture_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Latest odds snapshot data or None
     """
+    found, snapshot = _get_cached_snapshot(fixture_id)
+    if found:
+        return snapshot
+    
     db = get_firestore_db()
     if not db:
         return None
     
     try:
-        collection_ref = db.collection("odds_snapshots").document(str(fixture_id))
-        doc = collection_ref.get()
-        
-        if not doc.exists:
-            return None
-        
-        data = doc.to_dict()
-        latest_snapshot_id = data.get("latest_snapshot_id")
-        
-        if not latest_snapshot_id:
-            return None
-        
-        snapshot_ref = collection_ref.collection("snapshots").document(latest_snapshot_id)
-        snapshot_doc = snapshot_ref.get()
-        
-        if snapshot_doc.exists:
-            return snapshot_doc.to_dict()
-        
-        return None
+        with stage_timer(STAGE_FIRESTORE_READ), span("firestore.read", fixture_id=fixture_id):
+            snapshot = await asyncio.to_thread(_read_latest_snapshot, db, fixture_id)
+        _cache_snapshot(fixture_id, snapshot)
+        return snapshot
     except Exception as e:
         logger.error(f"Error getting latest odds snapshot for fixture {fixture_id}: {e}")
         return None
-
@@ -0,0 +1,124 @@
+"""
+Rate-limited, sampled logging for hot paths
+Log sites that run per request, per fixture or per odd (odds normalization, lineups,
+match details) go through a HotPathLogger instead of the module logger:
+- each call site (a short dotted name) gets a token bucket, so a site emits at most
+  HOT_LOG_RATE lines/s after a burst of HOT_LOG_BURST; the next emitted line reports
+  how many were suppressed
+- messages use %-style arguments and are only formatted when emitted
+- debug detail is sampled: sampled() is true for HOT_LOG_DEBUG_SAMPLE_RATE of calls when
+  DEBUG is enabled, and guards collecting debug-only data in the first place
+Emitted records carry `log_site` and `suppressed` extras for structured handlers.
+"""
+import os
+import time
+import random
+import logging
+from typing import Any, Callable, Dict
+
+from services.metrics import record_log_suppressed
+
+# Lines per second per call site once the burst is used up
+HOT_LOG_RATE = float(os.getenv("HOT_LOG_RATE", "1"))
+HOT_LOG_BURST = float(os.getenv("HOT_LOG_BURST", "5"))
+# Fraction of hot-path calls that emit debug detail (when the logger is at DEBUG)
+HOT_LOG_DEBUG_SAMPLE_RATE = float(os.getenv("HOT_LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+
+class lazy:
+    """Argument formatted only if the record is emitted: `hot_log.info(site, "raw: %s", lazy(lambda: str(raw)[:500]))`"""
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+
+class _SiteBucket:
+    __slots__ = ("tokens", "updated", "emitted", "suppressed", "pending")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.emitted = 0
+        self.suppressed = 0
+        self.pending = 0  # suppressed since the last emitted line
+
+
+# Shared by all HotPathLoggers so limits are per call site, process-wide
+_sites: Dict[str, _SiteBucket] = {}
+
+
+class HotPathLogger:
+    """Wraps a module logger with per-call-site rate limits and debug sampling"""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        rate: float = HOT_LOG_RATE,
+        burst: float = HOT_LOG_BURST,
+        debug_sample_rate: float = HOT_LOG_DEBUG_SAMPLE_RATE
+    ):
+        self.logger = logger
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.debug_sample_rate = debug_sample_rate
+
+    def _acquire(self, site: str) -> bool:
+        # Not locked: concurrent callers from worker threads can only miscount slightly
+        bucket = _sites.get(site)
+        if bucket is None:
+            bucket = _sites[site] = _SiteBucket(self.burst)
+        now = time.monotonic()
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+        bucket.updated = now
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            bucket.emitted += 1
+            return True
+        bucket.suppressed += 1
+        bucket.pending += 1
+        record_log_suppressed(site)
+        return False
+
+    def _log(self, level: int, site: str, msg: str, args: tuple, stacklevel: int) -> None:
+        """stacklevel is passed to Logger.log; public methods call this directly so 3 is their caller"""
+        if not self.logger.isEnabledFor(level) or not self._acquire(site):
+            return
+        bucket = _sites[site]
+        suppressed, bucket.pending = bucket.pending, 0
+        if suppressed:
+            msg += " [%d similar suppressed]"
+            args += (suppressed,)
+        self.logger.log(level, msg, *args, extra={"log_site": site, "suppressed": suppressed}, stacklevel=stacklevel)
+
+    def log(self, level: int, site: str, msg: str, *args: Any) -> None:
+        self._log(level, site, msg, args, stacklevel=3)
+
+    def info(self, site: str, msg: str, *args: Any) -> None:
+        self._log(logging.INFO, site, msg, args, stacklevel=3)
+
+    def warning(self, site: str, msg: str, *args: Any) -> None:
+        self._log(logging.WARNING, site, msg, args, stacklevel=3)
+
+    def sampled(self) -> bool:
+        """Whether this call should produce debug detail (DEBUG enabled and sampled in)"""
+        return (
+            self.debug_sample_rate > 0
+            and self.logger.isEnabledFor(logging.DEBUG)
+            and random.random() < self.debug_sample_rate
+        )
+
+    def debug(self, site: str, msg: str, *args: Any) -> None:
+        """Sampled and rate-limited debug line (use sampled() to guard multi-line groups)"""
+        if self.sampled():
+            self._log(logging.DEBUG, site, msg, args, stacklevel=3)
+
+
+def get_hot_log_metrics() -> Dict[str, Any]:
+    return {
+        site: {"emitted": bucket.emitted, "suppressed": bucket.suppressed}
+        for site, bucket in sorted(_sites.items())
+    }
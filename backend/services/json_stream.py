@@ -0,0 +1,101 @@
+"""
+Incremental JSON decoding for large SportMonks pages
+Yields `data[]` items one by one from an async byte stream (ijson, C backend when
+available) instead of materializing raw bytes, decoded text and the whole object
+tree at once. Top-level metadata (pagination, rate_limit) is collected on the side.
+Object keys are shared across items like json.loads does (ijson yields a new string
+per key), otherwise every streamed item carries its own copy of each key.
+"""
+import logging
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+
+try:
+    import ijson
+    STREAMING_AVAILABLE = True
+except ImportError:
+    ijson = None
+    STREAMING_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DATA_ITEM_PREFIX = "data.item"
+DEFAULT_META_KEYS = ("pagination", "rate_limit")
+
+_CONTAINER_START = ("start_map", "start_array")
+_CONTAINER_END = ("end_map", "end_array")
+
+
+class _AsyncByteReader:
+    """Adapts an async iterator of byte chunks to the async read() ijson expects"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the type with read(0); don't consume a chunk for it
+        if size == 0:
+            return b""
+        # ijson treats b"" as end of stream, so skip empty chunks
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+def get_backend_name() -> Optional[str]:
+    """Name of the ijson backend in use (yajl2_c is the fast one), None if unavailable"""
+    return ijson.backend if STREAMING_AVAILABLE else None
+
+
+async def iter_data_items(
+    chunks: AsyncIterator[bytes],
+    meta: Optional[Dict[str, Any]] = None,
+    meta_keys: Tuple[str, ...] = DEFAULT_META_KEYS
+) -> AsyncIterator[Any]:
+    """
+    Iterate `data[]` items of a JSON response as they are parsed.
+
+    Args:
+        chunks: Async iterator of response body chunks (e.g. response.aiter_bytes())
+        meta: Dict filled with top-level `meta_keys` values as they are parsed
+            (complete once the iterator is exhausted)
+        meta_keys: Top-level keys to capture into `meta`
+
+    Yields:
+        Each element of the top-level `data` array, fully built
+    """
+    if not STREAMING_AVAILABLE:
+        raise RuntimeError("ijson is not installed; streaming JSON decoding is unavailable")
+
+    builder = None
+    builder_prefix = None
+    keys: Dict[str, str] = {}
+
+    async for prefix, event, value in ijson.parse_async(_AsyncByteReader(chunks), use_float=True):
+        if event == "map_key":
+            value = keys.setdefault(value, value)
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == builder_prefix and event in _CONTAINER_END:
+                if builder_prefix == DATA_ITEM_PREFIX:
+                    yield builder.value
+                elif meta is not None:
+                    meta[builder_prefix] = builder.value
+                builder = None
+            continue
+
+        if prefix == DATA_ITEM_PREFIX:
+            if event in _CONTAINER_START:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                builder_prefix = prefix
+            elif event not in _CONTAINER_END:
+                # Scalar array element
+                yield value
+        elif prefix in meta_keys and meta is not None:
+            if event in _CONTAINER_START:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                builder_prefix = prefix
+            elif event not in _CONTAINER_END and event != "map_key":
+                meta[prefix] = value
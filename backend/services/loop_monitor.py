@@ -0,0 +1,145 @@
+"""
+Event loop lag monitor
+A task on the loop wakes up every LOOP_MONITOR_INTERVAL_MS and records how late it ran
+(scheduling delay = time something else held the loop). A watchdog thread checks the
+task's heartbeat: when the loop has not come back for LOOP_STALL_THRESHOLD_MS it captures
+the loop thread's stack while the blocking call is still running (sync Redis, Firestore,
+large transforms), so the log points at the culprit rather than at the victim.
+Lag and stalls are exported to /metrics (kibris_event_loop_*).
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from services.metrics import observe_loop_lag, record_loop_stall
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "250"))
+# Same blocking site is logged with its stack at most once per this many seconds
+LOOP_STALL_LOG_INTERVAL = float(os.getenv("LOOP_STALL_LOG_INTERVAL", "60"))
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames from these modules are never reported as the blocking site
+_LIBRARY_MARKERS = (os.sep + "site-packages" + os.sep, os.sep + "lib" + os.sep + "python")
+
+
+def _blocking_site(stack: List[traceback.FrameSummary]) -> str:
+    """Innermost backend frame of the stack (bounded label for metrics)"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_BACKEND_DIR) and not any(m in frame.filename for m in _LIBRARY_MARKERS):
+            return f"{os.path.relpath(frame.filename, _BACKEND_DIR)}:{frame.name}"
+    return "unknown"
+
+
+class LoopLagMonitor:
+    """Measures event loop scheduling delay and captures the stack of long stalls"""
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL_MS / 1000,
+        threshold: float = LOOP_STALL_THRESHOLD_MS / 1000,
+        log_interval: float = LOOP_STALL_LOG_INTERVAL
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.log_interval = log_interval
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.recent_stalls: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._pending: Optional[Dict[str, Any]] = None  # stack captured during the current stall
+        self._last_logged: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(now - expected, 0.0)
+            observe_loop_lag(lag)
+            self.max_lag = max(self.max_lag, lag)
+            pending, self._pending = self._pending, None
+            if lag >= self.threshold:
+                self._record_stall(lag, pending)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            blocked_for = time.monotonic() - self._heartbeat - self.interval
+            if blocked_for < self.threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            self._pending = {"site": _blocking_site(stack), "stack": "".join(traceback.format_list(stack))}
+
+    def _record_stall(self, lag: float, pending: Optional[Dict[str, Any]]) -> None:
+        site = pending["site"] if pending else "unknown"
+        self.stalls += 1
+        record_loop_stall(site)
+        self.recent_stalls.append({"at": time.time(), "lag_ms": round(lag * 1000, 1), "site": site})
+
+        now = time.monotonic()
+        if now - self._last_logged.get(site, 0.0) >= self.log_interval:
+            self._last_logged[site] = now
+            stack = pending["stack"] if pending else "  (stall ended before the watchdog captured a stack)\n"
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms at {site}:\n{stack.rstrip()}")
+        else:
+            logger.debug(f"Event loop blocked for {lag * 1000:.0f}ms at {site}")
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (every {self.interval * 1000:.0f}ms, "
+            f"stall threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+            "recent_stalls": list(self.recent_stalls),
+        }
+
+
+_loop_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> Optional[LoopLagMonitor]:
+    """Process-wide monitor, None when LOOP_MONITOR_ENABLED=false"""
+    global _loop_monitor
+    if not LOOP_MONITOR_ENABLED:
+        return None
+    if _loop_monitor is None:
+        _loop_monitor = LoopLagMonitor()
+    return _loop_monitor
@@ -0,0 +1,116 @@
+"""
+Memoized market/label classification for odds grouping
+Over/under direction, home/away side and "cards market" are decided by keyword
+matching on labels and market names. The result only depends on (label, market
+name), so it is computed the first time a combination is seen and then served
+from a lookup table.
+"""
+import os
+from typing import Any, Dict, Optional, Tuple
+
+OVER = "over"
+UNDER = "under"
+HOME = "home"
+AWAY = "away"
+
+# Cards-market diagnostics (get_match_details / _extract_and_normalize_odds)
+CARDS_KEYWORDS = ("card", "kart", "booking", "yellow", "red", "sending")
+CARDS_MARKET_IDS = frozenset({83, 84, 85, 86, 87, 88})  # Possible card market IDs
+
+# Entries kept before the table is reset (labels include player names for props)
+MARKET_TABLE_MAX_SIZE = int(os.getenv("MARKET_TABLE_MAX_SIZE", "50000"))
+
+Classification = Tuple[Optional[str], Optional[str]]
+
+# Shared empty mapping for table lookups of unseen labels (never written to)
+NO_ENTRIES: Dict[Optional[str], Classification] = {}
+
+
+def classify_heuristic(market_name: Optional[str], label: str) -> Classification:
+    """
+    Keyword heuristic behind the table (what grouping used to run per odd).
+
+    Args:
+        market_name: Market name of the odd
+        label: Lowercased selection label (label or name)
+
+    Returns:
+        (direction, side): direction is OVER/UNDER for line markets, side is
+        HOME/AWAY for handicap markets without a participant; None if unknown
+    """
+    name = (market_name or "").lower()
+    if "over" in label or "üst" in label or "over" in name:
+        direction = OVER
+    elif "under" in label or "alt" in label or "under" in name:
+        direction = UNDER
+    else:
+        direction = None
+
+    if "home" in label or "1" in label:
+        side = HOME
+    elif "away" in label or "2" in label:
+        side = AWAY
+    else:
+        side = None
+    return direction, side
+
+
+def is_cards_heuristic(market_id: Any, market_name: Optional[str]) -> bool:
+    """Keyword/id check behind the cards-market table"""
+    name = (market_name or "").lower()
+    return market_id in CARDS_MARKET_IDS or any(keyword in name for keyword in CARDS_KEYWORDS)
+
+
+class MarketClassifier:
+    """Lookup tables for market/label classification, filled once per combination"""
+
+    def __init__(self, max_size: int = MARKET_TABLE_MAX_SIZE):
+        self.max_size = max_size
+        # label -> market_name -> (direction, side); read-only for callers, hot loops
+        # may look up table.get(label, NO_ENTRIES).get(market_name) and fall back to
+        # classify() on a miss (nested dicts avoid building a tuple key per odd)
+        self.table: Dict[str, Dict[Optional[str], Classification]] = {}
+        self._size = 0
+        self._cards: Dict[Tuple[Any, Optional[str]], bool] = {}
+
+    def _store(self, market_name: Optional[str], label: str) -> Classification:
+        if self._size >= self.max_size:
+            self.table.clear()
+            self._size = 0
+        by_name = self.table.setdefault(label, {})
+        if market_name not in by_name:
+            self._size += 1
+        result = by_name[market_name] = classify_heuristic(market_name, label)
+        return result
+
+    def classify(self, market_name: Optional[str], label: str) -> Classification:
+        """(direction, side) for an odd; see classify_heuristic"""
+        result = self.table.get(label, NO_ENTRIES).get(market_name)
+        if result is None:
+            result = self._store(market_name, label)
+        return result
+
+    def is_cards_market(self, market_id: Any, market_name: Optional[str]) -> bool:
+        """Whether the market is a cards market (diagnostics)"""
+        key = (market_id, market_name)
+        result = self._cards.get(key)
+        if result is None:
+            if len(self._cards) >= self.max_size:
+                self._cards.clear()
+            result = self._cards[key] = is_cards_heuristic(market_id, market_name)
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get table sizes"""
+        return {"entries": self._size, "cards_entries": len(self._cards), "max_size": self.max_size}
+
+
+# Global singleton instance
+_market_classifier: Optional[MarketClassifier] = None
+
+def get_market_classifier() -> MarketClassifier:
+    """Get global market classifier"""
+    global _market_classifier
+    if _market_classifier is None:
+        _market_classifier = MarketClassifier()
+    return _market_classifier
@@ -0,0 +1,238 @@
+"""
+Prometheus metrics
+Latency histograms per endpoint (route template) and per stage (Redis, SportMonks,
+Firestore, transform, serialization), upstream latency per entity, cache hit/miss per
+key prefix, connection pool saturation and odds-worker loop lag, exposed at /metrics.
+Optional: requires prometheus_client; all helpers are no-ops without it or when
+METRICS_ENABLED=false.
+"""
+import os
+import time
+import functools
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true" and PROMETHEUS_AVAILABLE
+
+# Stage names used by the instrumented code
+STAGE_REDIS_GET = "redis_get"
+STAGE_REDIS_SET = "redis_set"
+STAGE_SPORTMONKS = "sportmonks"
+STAGE_FIRESTORE_READ = "firestore_read"
+STAGE_FIRESTORE_WRITE = "firestore_write"
+STAGE_TRANSFORM = "transform"
+STAGE_ODDS_NORMALIZE = "odds_normalize"
+STAGE_SERIALIZE = "serialize"
+
+# Route label for work outside a request (odds worker, startup)
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"
+
+# Buckets from sub-millisecond cache hits to multi-second upstream pages
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_route: ContextVar[str] = ContextVar("metrics_route", default=BACKGROUND_ROUTE)
+
+if METRICS_ENABLED:
+    REGISTRY = CollectorRegistry()
+    HTTP_REQUEST_SECONDS = Histogram(
+        "kibris_http_request_duration_seconds", "HTTP request latency by route template",
+        ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+    )
+    STAGE_SECONDS = Histogram(
+        "kibris_stage_duration_seconds", "Time spent per stage, by route (background for worker tasks)",
+        ["route", "stage"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+    )
+    UPSTREAM_SECONDS = Histogram(
+        "kibris_upstream_request_duration_seconds", "SportMonks request latency per attempt",
+        ["entity", "status"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+    )
+    CACHE_REQUESTS = Counter(
+        "kibris_cache_requests_total", "Redis cache lookups by key prefix",
+        ["prefix", "result"], registry=REGISTRY,
+    )
+    POOL_CONNECTIONS = Gauge(
+        "kibris_sportmonks_pool_connections", "SportMonks HTTP pool connections",
+        ["state"], registry=REGISTRY,
+    )
+    POOL_WAITERS = Gauge(
+        "kibris_sportmonks_pool_waiters", "Requests queued for a SportMonks pool connection", registry=REGISTRY,
+    )
+    POOL_MAX_CONNECTIONS = Gauge(
+        "kibris_sportmonks_pool_max_connections", "SportMonks HTTP pool size", registry=REGISTRY,
+    )
+    WORKER_ITERATION_SECONDS = Histogram(
+        "kibris_odds_worker_iteration_seconds", "Odds worker loop iteration time (fetch + process)",
+        ["loop"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+    )
+    WORKER_LOOP_LAG = Gauge(
+        "kibris_odds_worker_loop_lag_seconds", "How late the odds worker loop woke up after its sleep",
+        ["loop"], registry=REGISTRY,
+    )
+    EVENT_LOOP_LAG_SECONDS = Histogram(
+        "kibris_event_loop_lag_seconds", "Event loop scheduling delay (how late the monitor task ran)",
+        buckets=LATENCY_BUCKETS, registry=REGISTRY,
+    )
+    EVENT_LOOP_STALLS = Counter(
+        "kibris_event_loop_stalls_total", "Event loop stalls over the threshold, by blocking site",
+        ["site"], registry=REGISTRY,
+    )
+    LOG_SUPPRESSED = Counter(
+        "kibris_log_lines_suppressed_total", "Hot-path log lines dropped by the per-site rate limit",
+        ["site"], registry=REGISTRY,
+    )
+
+
+def current_route() -> str:
+    return _current_route.get()
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    if METRICS_ENABLED:
+        STAGE_SECONDS.labels(_current_route.get(), stage).observe(seconds)
+
+
+class stage_timer:
+    """Time a block as a stage: `with stage_timer(STAGE_TRANSFORM): ...`"""
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe_stage(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+def timed_stage(stage: str):
+    """Decorator timing every call of a (sync) function as a stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS_ENABLED:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.labels(_current_route.get(), stage).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def observe_upstream(entity: str, status: Any, seconds: float) -> None:
+    """One SportMonks attempt (status code, or the exception class name)"""
+    if METRICS_ENABLED:
+        UPSTREAM_SECONDS.labels(entity, str(status)).observe(seconds)
+        STAGE_SECONDS.labels(_current_route.get(), STAGE_SPORTMONKS).observe(seconds)
+
+
+def cache_key_prefix(key: str) -> str:
+    """Low-cardinality prefix of a cache key (sportmonks:{entity}, else the first segment)"""
+    parts = key.split(":", 2)
+    if parts[0] == "sportmonks" and len(parts) > 1:
+        return f"{parts[0]}:{parts[1]}"
+    return parts[0]
+
+
+def record_cache(key: str, result: str) -> None:
+    """result: hit, miss, error or disabled"""
+    if METRICS_ENABLED:
+        CACHE_REQUESTS.labels(cache_key_prefix(key), result).inc()
+
+
+def observe_worker_iteration(loop: str, seconds: float, lag: Optional[float] = None) -> None:
+    if METRICS_ENABLED:
+        WORKER_ITERATION_SECONDS.labels(loop).observe(seconds)
+        if lag is not None:
+            WORKER_LOOP_LAG.labels(loop).set(max(lag, 0.0))
+
+
+def observe_loop_lag(seconds: float) -> None:
+    if METRICS_ENABLED:
+        EVENT_LOOP_LAG_SECONDS.observe(seconds)
+
+
+def record_loop_stall(site: str) -> None:
+    if METRICS_ENABLED:
+        EVENT_LOOP_STALLS.labels(site).inc()
+
+
+def record_log_suppressed(site: str) -> None:
+    if METRICS_ENABLED:
+        LOG_SUPPRESSED.labels(site).inc()
+
+
+def set_pool_stats(stats: Dict[str, Any]) -> None:
+    if METRICS_ENABLED:
+        POOL_CONNECTIONS.labels("in_use").set(stats.get("in_use", 0))
+        POOL_CONNECTIONS.labels("idle").set(stats.get("idle", 0))
+        POOL_WAITERS.set(stats.get("waiters", 0))
+        POOL_MAX_CONNECTIONS.set(stats.get("max_connections", 0))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(body, content type) in Prometheus text exposition format"""
+    if not METRICS_ENABLED:
+        return b"# metrics disabled (METRICS_ENABLED=false or prometheus_client not installed)\n", CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the route that will handle the request (bounded label values)"""
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    if router is not None:
+        from starlette.routing import Match
+        for route in router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware: request latency per route template, and the route label for stage metrics"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        token = _current_route.set(route)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status["code"])).observe(
+                time.perf_counter() - started
+            )
+            _current_route.reset(token)
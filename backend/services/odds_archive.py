@@ -0,0 +1,294 @@
+"""
+Local columnar archive of Bet365 odds history
+The odds worker appends price changes (deltas per selection) to Parquet or Arrow
+(Feather v2) files partitioned by date and fixture and rolled hourly:
+
+    {ODDS_ARCHIVE_DIR}/date=YYYY-MM-DD/fixture={id}/odds-HH-NNN.parquet
+
+load_price_history() reads a fixture's history into NumPy arrays without Firestore.
+Optional: enabled by ODDS_ARCHIVE_DIR and requires pyarrow (and numpy).
+"""
+import os
+import glob
+import time
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    ARCHIVE_AVAILABLE = True
+except ImportError:
+    np = None
+    pa = None
+    ARCHIVE_AVAILABLE = False
+
+from services.odds_columns import OddsColumns
+
+logger = logging.getLogger(__name__)
+
+# Archive root directory; the sink is disabled when unset
+ODDS_ARCHIVE_DIR = os.getenv("ODDS_ARCHIVE_DIR", "")
+# "parquet" or "arrow" (Feather v2 / Arrow IPC file)
+ODDS_ARCHIVE_FORMAT = os.getenv("ODDS_ARCHIVE_FORMAT", "parquet").lower()
+# Buffered rows are written at least this often (bounds data lost on a crash)
+ODDS_ARCHIVE_FLUSH_SECONDS = float(os.getenv("ODDS_ARCHIVE_FLUSH_SECONDS", "300"))
+# Fixtures without updates for this long drop their last-price state
+ODDS_ARCHIVE_STATE_TTL = float(os.getenv("ODDS_ARCHIVE_STATE_TTL", "21600"))
+
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def _schema():
+    return pa.schema([
+        ("ts", pa.timestamp("ms", tz="UTC")),
+        ("fixture_id", pa.int64()),
+        ("odd_id", pa.int64()),
+        ("market_id", pa.int64()),
+        ("label", pa.string()),
+        ("line", pa.float64()),
+        ("value", pa.float64()),
+        ("available", pa.bool_()),
+        ("is_live", pa.bool_()),
+    ])
+
+
+def _odd_id(odd_item: Dict[str, Any], value_item: Optional[Dict[str, Any]]) -> Optional[int]:
+    """SportMonks odd id of a row (value id for nested odds), None if missing"""
+    raw = odd_item.get("id") if value_item is None else (value_item.get("id") or odd_item.get("id"))
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+class OddsArchiveSink:
+    """Buffers per-selection price changes and writes them as hourly-partitioned columnar files"""
+
+    def __init__(self, base_dir: str, file_format: str = ODDS_ARCHIVE_FORMAT):
+        if file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported odds archive format: {file_format}")
+        self.base_dir = base_dir
+        self.file_format = file_format
+        # (date, fixture_id, hour) -> column lists
+        self._buffers: Dict[Tuple[str, int, str], Dict[str, list]] = {}
+        # fixture_id -> selection -> (value, available)
+        self._last: Dict[int, Dict[tuple, Tuple[float, bool]]] = defaultdict(dict)
+        self._last_update: Dict[int, float] = {}
+        self._part_seq: Dict[Tuple[str, int, str], int] = {}
+        self._last_flush = time.monotonic()
+        self.rows_buffered = 0
+        self.rows_written = 0
+        self.files_written = 0
+
+    def append(self, fixture_id: Any, odds_data: Any, is_live: bool = False, now: Optional[datetime] = None) -> int:
+        """
+        Buffer the selections of a Bet365 snapshot whose price or availability changed.
+
+        Args:
+            fixture_id: Fixture ID
+            odds_data: Raw Bet365 odds (flat or nested format)
+            is_live: Whether the snapshot is in-play
+            now: Snapshot time (default: current UTC time)
+
+        Returns:
+            Number of changed selections buffered
+        """
+        try:
+            fixture_id = int(fixture_id)
+        except (TypeError, ValueError):
+            return 0
+        now = now or datetime.now(timezone.utc)
+        columns = OddsColumns.from_raw(odds_data)
+        if not len(columns):
+            return 0
+
+        label_codes = columns.label_code.tolist()  # builds columns.labels
+        labels = {code: label for label, code in columns.labels.items()}
+        market_ids = columns.market_id.tolist()
+        lines = columns.line.tolist()
+        values = columns.value.tolist()
+        available = columns.available.tolist()
+
+        last = self._last[fixture_id]
+        key = (now.strftime("%Y-%m-%d"), fixture_id, now.strftime("%H"))
+        buffer = self._buffers.get(key)
+        ts_ms = int(now.timestamp() * 1000)
+        changed = 0
+        for (odd_item, value_item), market_id, code, line, value, is_available in zip(
+            columns.rows, market_ids, label_codes, lines, values, available
+        ):
+            if math.isnan(value):
+                continue
+            label = labels[code]
+            odd_id = _odd_id(odd_item, value_item)
+            # Label/line are not unique within a market (players, alternative lines), the odd id is.
+            # Markets without a line have NaN there, which never compares equal: key those by None
+            selection = (odd_id, market_id, label, None if math.isnan(line) else line)
+            state = (value, is_available)
+            if last.get(selection) == state:
+                continue
+            last[selection] = state
+            if buffer is None:
+                buffer = self._buffers[key] = {name: [] for name in _schema().names}
+            buffer["ts"].append(ts_ms)
+            buffer["fixture_id"].append(fixture_id)
+            buffer["odd_id"].append(odd_id)
+            buffer["market_id"].append(market_id)
+            buffer["label"].append(label)
+            buffer["line"].append(line)
+            buffer["value"].append(value)
+            buffer["available"].append(is_available)
+            buffer["is_live"].append(is_live)
+            changed += 1
+
+        self._last_update[fixture_id] = time.monotonic()
+        self.rows_buffered += changed
+        return changed
+
+    def _flush_due(self, now: datetime) -> bool:
+        if time.monotonic() - self._last_flush >= ODDS_ARCHIVE_FLUSH_SECONDS:
+            return True
+        # Roll as soon as an earlier hour has buffered rows
+        current = (now.strftime("%Y-%m-%d"), now.strftime("%H"))
+        return any((date, hour) != current for date, _, hour in self._buffers)
+
+    def _write(self, buffers: Dict[Tuple[str, int, str], Dict[str, list]]) -> int:
+        """Write buffers as new part files (blocking)"""
+        schema = _schema()
+        extension = FILE_EXTENSIONS[self.file_format]
+        written = 0
+        for (date, fixture_id, hour), columns in buffers.items():
+            directory = os.path.join(self.base_dir, f"date={date}", f"fixture={fixture_id}")
+            os.makedirs(directory, exist_ok=True)
+            seq = self._part_seq.get((date, fixture_id, hour), 0)
+            while True:
+                path = os.path.join(directory, f"odds-{hour}-{seq:03d}.{extension}")
+                if not os.path.exists(path):
+                    break
+                seq += 1
+            self._part_seq[(date, fixture_id, hour)] = seq + 1
+
+            table = pa.table(columns, schema=schema)
+            tmp_path = path + ".tmp"
+            if self.file_format == "parquet":
+                pq.write_table(table, tmp_path, compression="zstd")
+            else:
+                feather.write_feather(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)  # readers never see partial files
+            written += table.num_rows
+            self.files_written += 1
+        return written
+
+    async def flush(self, force: bool = False) -> int:
+        """Write buffered rows if the flush interval or the hour rolled (or force); returns rows written"""
+        if not self._buffers or not (force or self._flush_due(datetime.now(timezone.utc))):
+            return 0
+        buffers, self._buffers = self._buffers, {}
+        self._last_flush = time.monotonic()
+        try:
+            written = await asyncio.to_thread(self._write, buffers)
+        except Exception as e:
+            logger.error(f"Error writing odds archive: {e}")
+            return 0
+        self.rows_written += written
+        self._prune_state()
+        logger.debug(f"Odds archive: wrote {written} rows")
+        return written
+
+    def _prune_state(self) -> None:
+        cutoff = time.monotonic() - ODDS_ARCHIVE_STATE_TTL
+        for fixture_id in [f for f, updated in self._last_update.items() if updated < cutoff]:
+            self._last.pop(fixture_id, None)
+            self._last_update.pop(fixture_id, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "format": self.file_format,
+            "buffered_partitions": len(self._buffers),
+            "rows_buffered": self.rows_buffered,
+            "rows_written": self.rows_written,
+            "files_written": self.files_written,
+            "fixtures_tracked": len(self._last),
+        }
+
+
+def _read_file(path: str, columns: Optional[List[str]] = None):
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns)
+    return feather.read_table(path, columns=columns)
+
+
+def load_price_history(
+    fixture_id: int,
+    market_id: Optional[int] = None,
+    label: Optional[str] = None,
+    base_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Load a fixture's archived price history as NumPy arrays, oldest first.
+
+    Args:
+        fixture_id: Fixture ID
+        market_id: Only this market
+        label: Only this selection label
+        base_dir: Archive directory (default ODDS_ARCHIVE_DIR)
+
+    Returns:
+        Dict of arrays: ts (epoch ms), odd_id (-1 if unknown), market_id, label, line, value, available, is_live
+        (empty arrays if nothing is archived)
+    """
+    if not ARCHIVE_AVAILABLE:
+        raise RuntimeError("pyarrow/numpy are not installed; the odds archive is unavailable")
+    base_dir = base_dir or ODDS_ARCHIVE_DIR
+    paths = sorted(
+        path for path in glob.glob(os.path.join(base_dir, "date=*", f"fixture={int(fixture_id)}", "odds-*"))
+        if not path.endswith(".tmp")
+    )
+    schema = _schema()
+    names = [name for name in schema.names if name != "fixture_id"]
+    if not paths:
+        return {name: np.asarray([], dtype=object if name == "label" else None) for name in names}
+
+    table = pa.concat_tables([_read_file(path, columns=names) for path in paths])
+    result = {
+        "ts": table.column("ts").cast(pa.int64()).to_numpy(),
+        "odd_id": table.column("odd_id").fill_null(-1).to_numpy(),
+        "market_id": table.column("market_id").to_numpy(),
+        "label": table.column("label").to_numpy(zero_copy_only=False),
+        "line": table.column("line").to_numpy(),
+        "value": table.column("value").to_numpy(),
+        "available": table.column("available").to_numpy(zero_copy_only=False),
+        "is_live": table.column("is_live").to_numpy(zero_copy_only=False),
+    }
+    mask = np.ones(len(result["ts"]), dtype=bool)
+    if market_id is not None:
+        mask &= result["market_id"] == market_id
+    if label is not None:
+        mask &= result["label"] == label
+    order = np.argsort(result["ts"][mask], kind="stable")
+    return {name: column[mask][order] for name, column in result.items()}
+
+
+# Global singleton instance (None when disabled)
+_odds_archive_sink: Optional[OddsArchiveSink] = None
+_odds_archive_checked = False
+
+def get_odds_archive_sink() -> Optional[OddsArchiveSink]:
+    """Get global odds archive sink, None if ODDS_ARCHIVE_DIR is unset or pyarrow is missing"""
+    global _odds_archive_sink, _odds_archive_checked
+    if not _odds_archive_checked:
+        _odds_archive_checked = True
+        if ODDS_ARCHIVE_DIR:
+            if ARCHIVE_AVAILABLE:
+                _odds_archive_sink = OddsArchiveSink(ODDS_ARCHIVE_DIR)
+                logger.info(f"Odds archive enabled: {ODDS_ARCHIVE_DIR} ({ODDS_ARCHIVE_FORMAT})")
+            else:
+                logger.warning("ODDS_ARCHIVE_DIR is set but pyarrow/numpy are not installed; odds archive disabled")
+    return _odds_archive_sink
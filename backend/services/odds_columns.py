@@ -0,0 +1,402 @@
+"""
+Columnar odds normalization
+Raw SportMonks odds (flat or nested bookmaker/market/values format) are parsed once
+into parallel columns (market id, bookmaker id, label code, value, line, availability).
+Bookmaker/market filtering then runs as whole-array operations (NumPy when installed,
+plain arrays otherwise), and dicts are only built for the selected rows. Output rows match SportmonksService._extract_and_normalize_odds.
+"""
+import math
+import logging
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from services.records import OddRecord
+
+logger = logging.getLogger(__name__)
+
+# Integer codes for ids that are not plain ints
+ID_MISSING = 0  # None / falsy (treated as "no market id" by the Bet365 market filter)
+ID_OTHER = -1  # Truthy but not an int (never matches a filter)
+
+
+def _id_code(value: Any) -> int:
+    """Encode an id for the integer columns"""
+    if not value:
+        return ID_MISSING
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return ID_OTHER
+
+
+def _parse_value(raw_value: Any, fractional: bool) -> float:
+    """Decimal odd from a raw value, NaN if invalid ("500/1" is accepted for nested values)"""
+    try:
+        if fractional and isinstance(raw_value, str) and "/" in raw_value:
+            parts = raw_value.split("/")
+            if len(parts) != 2:
+                return float(raw_value)
+            denominator = float(parts[1])
+            if denominator <= 0:
+                return math.nan
+            return float(parts[0]) / denominator + 1.0
+        return float(raw_value)
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def _parse_line(odd_item: Dict[str, Any]) -> float:
+    """Total/handicap line of a raw odd, NaN if absent"""
+    line = odd_item.get("total")
+    if line is None:
+        line = odd_item.get("handicap")
+    try:
+        return float(line) if line is not None else math.nan
+    except (ValueError, TypeError):
+        return math.nan
+
+
+class OddsColumns:
+    """Raw odds of one fixture as parallel columns"""
+
+    def __init__(self):
+        # Filter columns (NumPy arrays when available, else array/list)
+        self.market_id: Any = []
+        self.bookmaker_id: Any = []
+        self.value: Any = []
+        self.available: Any = []
+        # Raw sources per row: (odd_item, value_item or None); output fields are
+        # only extracted for selected rows in to_records
+        self.rows: List[tuple] = []
+        self.labels: Dict[str, int] = {}
+        # Sort/group columns, built on first use
+        self._label_code: Any = None
+        self._line: Any = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def from_raw(cls, odds_data: Any) -> "OddsColumns":
+        """
+        Parse raw odds (list, or dict with "data") into columns.
+        Rows without a usable value/label are dropped, as in the per-item normalizer.
+        """
+        columns = cls()
+        if isinstance(odds_data, dict):
+            odds_data = odds_data.get("data")
+        if not isinstance(odds_data, list):
+            odds_data = []
+
+        items = [odd_item for odd_item in odds_data if isinstance(odd_item, dict)]
+        if all("label" in odd_item and "value" in odd_item for odd_item in items):
+            raw_values = columns._add_flat_bulk(items)
+            fractional = None
+        else:
+            raw_values, fractional = [], []
+            for odd_item in items:
+                if "label" in odd_item and "value" in odd_item:
+                    columns._add_flat(odd_item, raw_values, fractional)
+                else:
+                    columns._add_nested(odd_item, raw_values, fractional)
+
+        columns._finalize(raw_values, fractional)
+        return columns
+
+    def _add_flat_bulk(self, items: List[Dict[str, Any]]) -> List[Any]:
+        """Column-at-a-time build when every item uses the flat format (the usual odds include)"""
+        items = [odd_item for odd_item in items if odd_item.get("value") is not None]
+        bookmakers = [odd_item.get("bookmaker", {}) for odd_item in items]
+        bookmakers = [b["data"] if isinstance(b, dict) and "data" in b else b for b in bookmakers]
+        bookmaker_ids = [
+            (b.get("id") if isinstance(b, dict) else None) or odd_item.get("bookmaker_id")
+            for b, odd_item in zip(bookmakers, items)
+        ]
+        self.bookmaker_id = [_id_code(bookmaker_id) for bookmaker_id in bookmaker_ids]
+        self.market_id = [_id_code(odd_item.get("market_id")) for odd_item in items]
+        self.available = [
+            not (
+                odd_item.get("stopped", False) or odd_item.get("suspended", False)
+                or odd_item.get("is_unavailable", False) or not odd_item.get("active", True)
+            )
+            for odd_item in items
+        ]
+        self.rows = [(odd_item, None) for odd_item in items]
+        return [odd_item["value"] for odd_item in items]
+
+    def _add_flat(self, odd_item: Dict[str, Any], raw_values: List[Any], fractional: List[bool]) -> None:
+        """Already-normalized format: label/value on the item itself"""
+        value = odd_item.get("value")
+        if value is None:
+            return
+
+        self.market_id.append(_id_code(odd_item.get("market_id")))
+        self.bookmaker_id.append(_id_code(_flat_bookmaker(odd_item)[0]))
+        self.available.append(not (
+            odd_item.get("stopped", False) or odd_item.get("suspended", False)
+            or odd_item.get("is_unavailable", False) or not odd_item.get("active", True)
+        ))
+        self.rows.append((odd_item, None))
+        raw_values.append(value)
+        fractional.append(False)
+
+    def _add_nested(self, odd_item: Dict[str, Any], raw_values: List[Any], fractional: List[bool]) -> None:
+        """Nested format: bookmaker, market and values[] per item"""
+        values = odd_item.get("values", [])
+        if isinstance(values, dict) and "data" in values:
+            values = values["data"]
+        if not isinstance(values, list):
+            return
+
+        # Item-level fields shared by all values
+        bookmaker = _unwrap(odd_item.get("bookmaker", {}))
+        market = _unwrap(odd_item.get("market", {}))
+        market_code = _id_code(market.get("id") if isinstance(market, dict) else odd_item.get("market_id"))
+        bookmaker_code = _id_code(bookmaker.get("id") if isinstance(bookmaker, dict) else None)
+        item_available = not (odd_item.get("stopped", False) or odd_item.get("suspended", False))
+
+        for value_item in values:
+            if not isinstance(value_item, dict):
+                continue
+            raw_value = value_item.get("value") or value_item.get("odd") or value_item.get("price")
+            if raw_value is None or not _nested_label(value_item)[0]:
+                continue
+
+            active = value_item.get("active", True)
+            if active is True:
+                active = odd_item.get("active", True)
+
+            self.market_id.append(market_code)
+            self.bookmaker_id.append(bookmaker_code)
+            self.available.append(bool(item_available and active and not (
+                value_item.get("is_unavailable", False) or odd_item.get("is_unavailable", False)
+            )))
+            self.rows.append((odd_item, value_item))
+            raw_values.append(raw_value)
+            fractional.append(True)
+
+    def _finalize(self, raw_values: List[Any], fractional: Optional[List[bool]]) -> None:
+        """Convert values in one pass and freeze columns (NumPy arrays when available)"""
+        values = None
+        if NUMPY_AVAILABLE:
+            try:
+                # Fast path: every value is a number or numeric string
+                values = np.asarray(raw_values, dtype=np.float64)
+            except (ValueError, TypeError):
+                values = None
+        if values is None:
+            if fractional is None:
+                fractional = [False] * len(raw_values)
+            values = array("d", (_parse_value(v, f) for v, f in zip(raw_values, fractional)))
+
+        if NUMPY_AVAILABLE:
+            self.value = np.asarray(values, dtype=np.float64)
+            self.market_id = np.asarray(self.market_id, dtype=np.int64)
+            self.bookmaker_id = np.asarray(self.bookmaker_id, dtype=np.int64)
+            self.available = np.asarray(self.available, dtype=bool)
+        else:
+            self.value = values
+            self.market_id = array("q", self.market_id)
+            self.bookmaker_id = array("q", self.bookmaker_id)
+
+    def _build_sort_columns(self) -> None:
+        """Label codes (interned labels) and total/handicap lines"""
+        label_codes = []
+        lines = []
+        for odd_item, value_item in self.rows:
+            if value_item is None:
+                label = odd_item.get("label") or odd_item.get("name") or ""
+            else:
+                label = _nested_label(value_item)[0]
+            code = self.labels.get(label)
+            if code is None:
+                code = self.labels[label] = len(self.labels)
+            label_codes.append(code)
+            lines.append(_parse_line(odd_item))
+        if NUMPY_AVAILABLE:
+            self._label_code = np.asarray(label_codes, dtype=np.int64)
+            self._line = np.asarray(lines, dtype=np.float64)
+        else:
+            self._label_code = array("q", label_codes)
+            self._line = array("d", lines)
+
+    @property
+    def label_code(self) -> Any:
+        if self._label_code is None:
+            self._build_sort_columns()
+        return self._label_code
+
+    @property
+    def line(self) -> Any:
+        if self._line is None:
+            self._build_sort_columns()
+        return self._line
+
+    def select(
+        self,
+        bookmaker_id: Optional[int] = None,
+        supported_market_ids: Optional[Iterable[int]] = None,
+        include_unavailable: bool = False
+    ) -> Sequence[int]:
+        """
+        Row indices with a valid (> 0) value, optionally for one bookmaker and a set of market ids.
+        Rows without a market id pass the market filter (same as the per-item normalizer).
+        """
+        if NUMPY_AVAILABLE:
+            mask = self.value > 0  # NaN compares False
+            if not include_unavailable:
+                mask &= self.available
+            if bookmaker_id is not None:
+                mask &= self.bookmaker_id == bookmaker_id
+            if supported_market_ids is not None:
+                supported = np.fromiter(supported_market_ids, dtype=np.int64)
+                mask &= (self.market_id == ID_MISSING) | np.isin(self.market_id, supported)
+            return np.flatnonzero(mask)
+
+        supported_set = set(supported_market_ids) if supported_market_ids is not None else None
+        return [
+            i for i in range(len(self.rows))
+            if self.value[i] > 0
+            and (include_unavailable or self.available[i])
+            and (bookmaker_id is None or self.bookmaker_id[i] == bookmaker_id)
+            and (supported_set is None or self.market_id[i] == ID_MISSING or self.market_id[i] in supported_set)
+        ]
+
+    def take(self, column: str, indices: Sequence[int]) -> List[Any]:
+        """Values of a numeric column (e.g. "bookmaker_id") for the given rows"""
+        values = getattr(self, column)
+        if NUMPY_AVAILABLE:
+            return values[np.asarray(indices, dtype=np.int64)].tolist()
+        return [values[i] for i in indices]
+
+    def market_names(self, indices: Sequence[int]) -> List[str]:
+        """Market names of the given rows, without building full odd dicts"""
+        names = []
+        for i in (indices.tolist() if NUMPY_AVAILABLE and hasattr(indices, "tolist") else indices):
+            odd_item, value_item = self.rows[i]
+            names.append(_flat_market_name(odd_item) if value_item is None else _nested_market_name(odd_item))
+        return names
+
+    def to_records(self, indices: Sequence[int]) -> List[OddRecord]:
+        """Build normalized odd records for the given rows"""
+        if NUMPY_AVAILABLE:
+            indices = np.asarray(indices, dtype=np.int64)
+            values = self.value[indices].tolist()
+            indices = indices.tolist()
+        else:
+            values = [self.value[i] for i in indices]
+
+        rows = self.rows
+        result = []
+        for i, value in zip(indices, values):
+            odd_item, value_item = rows[i]
+            if value_item is None:
+                result.append(OddRecord(_flat_dict(odd_item, value)))
+            else:
+                result.append(OddRecord(_nested_dict(odd_item, value_item, value)))
+        return result
+
+
+def _unwrap(obj: Any) -> Any:
+    """Unwrap {"data": ...} includes"""
+    if isinstance(obj, dict) and "data" in obj:
+        return obj["data"]
+    return obj
+
+
+def _flat_bookmaker(odd_item: Dict[str, Any]) -> tuple:
+    """(bookmaker_id, bookmaker_name) of a flat odd (nested bookmaker include or flat fields)"""
+    bookmaker = _unwrap(odd_item.get("bookmaker", {}))
+    if isinstance(bookmaker, dict):
+        return (
+            bookmaker.get("id") or odd_item.get("bookmaker_id"),
+            bookmaker.get("name") or odd_item.get("bookmaker_name"),
+        )
+    return odd_item.get("bookmaker_id"), odd_item.get("bookmaker_name")
+
+
+def _nested_label(value_item: Dict[str, Any]) -> tuple:
+    """(final_label, player_id, player_name) of a nested odds value (player name wins)"""
+    value_name = value_item.get("name") or value_item.get("label") or value_item.get("outcome", "")
+    participant = _unwrap(value_item.get("participant", {}))
+    if isinstance(participant, dict):
+        player_name = participant.get("name")
+        player_id = participant.get("id")
+    else:
+        player_name = player_id = None
+    return (player_name if player_name else value_name), player_id, player_name
+
+
+def _flat_market_name(odd_item: Dict[str, Any]) -> str:
+    market_name = odd_item.get("market_description") or odd_item.get("market_name") or odd_item.get("market")
+    if isinstance(market_name, dict):
+        market_name = market_name.get("name") or market_name.get("description")
+    return market_name or "Unknown"
+
+
+def _nested_market_name(odd_item: Dict[str, Any]) -> str:
+    market = _unwrap(odd_item.get("market", {}))
+    market_name = None
+    if isinstance(market, dict):
+        market_name = market.get("name") or market.get("description") or market.get("label")
+    if not market_name:
+        market_name = odd_item.get("market_description") or odd_item.get("market_name")
+    return market_name or "Unknown"
+
+
+def _flat_dict(odd_item: Dict[str, Any], value: float) -> Dict[str, Any]:
+    """Normalized odd from the flat format"""
+    bookmaker_id, bookmaker_name = _flat_bookmaker(odd_item)
+    if not bookmaker_name and bookmaker_id == 2:
+        bookmaker_name = "Bet365"
+    return {
+        "bookmaker_id": bookmaker_id,
+        "bookmaker_name": bookmaker_name,
+        "market_id": odd_item.get("market_id"),
+        "market_name": _flat_market_name(odd_item),
+        "market_description": odd_item.get("market_description"),
+        "label": odd_item.get("label") or odd_item.get("name") or "",
+        "name": odd_item.get("name") or odd_item.get("label") or "",
+        "value": value,
+        "odd": value,
+        "price": value,
+        "stopped": odd_item.get("stopped", False),
+        "suspended": odd_item.get("suspended", False),
+        "is_unavailable": odd_item.get("is_unavailable", False),
+        "latest_bookmaker_update": odd_item.get("latest_bookmaker_update") or odd_item.get("updated_at"),
+    }
+
+
+def _nested_dict(odd_item: Dict[str, Any], value_item: Dict[str, Any], value: float) -> Dict[str, Any]:
+    """Normalized odd from one value of the nested format"""
+    bookmaker = _unwrap(odd_item.get("bookmaker", {}))
+    market = _unwrap(odd_item.get("market", {}))
+    bookmaker_id = bookmaker.get("id") if isinstance(bookmaker, dict) else None
+    bookmaker_name = bookmaker.get("name") if isinstance(bookmaker, dict) else None
+    if not bookmaker_name and bookmaker_id == 2:
+        bookmaker_name = "Bet365"
+    final_label, player_id, player_name = _nested_label(value_item)
+    return {
+        "bookmaker_id": bookmaker_id,
+        "bookmaker_name": bookmaker_name,
+        "market_id": market.get("id") if isinstance(market, dict) else odd_item.get("market_id"),
+        "market_name": _nested_market_name(odd_item),
+        "market_description": market.get("description") if isinstance(market, dict) else odd_item.get("market_description"),
+        "label": final_label,
+        "name": final_label,
+        "value": value,
+        "odd": value,
+        "price": value,
+        "stopped": odd_item.get("stopped", False),
+        "suspended": odd_item.get("suspended", False),
+        "is_unavailable": value_item.get("is_unavailable", False) or odd_item.get("is_unavailable", False),
+        "latest_bookmaker_update": odd_item.get("latest_bookmaker_update") or odd_item.get("updated_at"),
+        "player_id": player_id,
+        "player_name": player_name,
+    }
@@ -2,6 +2,7 @@
 Background worker for fetching latest odds updates from SportMonks.
 Polls latest odds endpoints at regular intervals and saves to Firebase.
 """
+import time
 import asyncio
 import logging
 from typing import Dict, Any, List
@@ -9,6 +10,14 @@ from datetime import datetime, timezone
 
 from services.sportmonks_service import sportmonks_service
 from services.firebase_service import save_odds_snapshot
+from services.snapshot_diff import get_snapshot_diff_store
+from services.odds_archive import get_odds_archive_sink
+from services.metrics import observe_worker_iteration
+from services.snapshot_compaction import (
+    compact_finished_fixtures, ODDS_COMPACTION_ENABLED, ODDS_COMPACTION_INTERVAL
+)
+from services.rate_limit_manager import get_rate_limit_manager
+from config.rate_limit_config import ENTITY_ODDS
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +100,7 @@ async def process_latest_odds(odds_items: List[Dict[str, Any]], is_live: bool =
         Number of snapshots saved
     """
     saved_count = 0
+    archive_sink = get_odds_archive_sink()
     
     for item in odds_items:
         if not isinstance(item, dict):
@@ -112,6 +122,17 @@ async def process_latest_odds(odds_items: List[Dict[str, Any]], is_live: bool =
             logger.debug(f"No Bet365 odds found for fixture {fixture_id} (live: {is_live})")
             continue
         
+        # Update in-memory snapshot diff state (read by request handlers instead of Firestore)
+        get_snapshot_diff_store().update(
+            fixture_id,
+            (sportmonks_service._build_selection_key(odd) for odd in filtered_odds),
+            is_live=is_live
+        )
+        
+        # Append price changes to the local columnar archive (ODDS_ARCHIVE_DIR)
+        if archive_sink:
+            archive_sink.append(fixture_id, filtered_odds, is_live=is_live)
+        
         # Save to Firebase
         success = await save_odds_snapshot(
             fixture_id=fixture_id,
@@ -125,6 +146,9 @@ async def process_latest_odds(odds_items: List[Dict[str, Any]], is_live: bool =
         else:
             logger.warning(f"Failed to save odds snapshot for fixture {fixture_id}")
     
+    if archive_sink:
+        await archive_sink.flush()
+    
     return saved_count
 
 
@@ -135,8 +159,10 @@ async def inplay_odds_loop():
     consecutive_errors = 0
     max_consecutive_errors = 10
     
+    lag = None
     while _worker_running:
         try:
+            iteration_started = time.monotonic()
             # Fetch latest in-play odds
             latest_odds = await sportmonks_service.get_latest_odds_inplay()
             
@@ -150,8 +176,13 @@ async def inplay_odds_loop():
             else:
                 logger.debug("In-play odds: No updates available")
             
-            # Wait 5 seconds before next iteration
-            await asyncio.sleep(5)
+            observe_worker_iteration("inplay", time.monotonic() - iteration_started, lag)
+            
+            # Wait 5 seconds before next iteration (stretched by budget pacing)
+            interval = get_rate_limit_manager().paced_interval(ENTITY_ODDS, 5)
+            sleep_started = time.monotonic()
+            await asyncio.sleep(interval)
+            lag = time.monotonic() - sleep_started - interval
             
         except Exception as e:
             consecutive_errors += 1
@@ -175,8 +206,10 @@ async def prematch_odds_loop():
     consecutive_errors = 0
     max_consecutive_errors = 10
     
+    lag = None
     while _worker_running:
         try:
+            iteration_started = time.monotonic()
             # Fetch latest pre-match odds
             latest_odds = await sportmonks_service.get_latest_odds_prematch()
             
@@ -190,8 +223,13 @@ async def prematch_odds_loop():
             else:
                 logger.debug("Pre-match odds: No updates available")
             
-            # Wait 20 seconds before next iteration (average of 15-30)
-            await asyncio.sleep(20)
+            observe_worker_iteration("prematch", time.monotonic() - iteration_started, lag)
+            
+            # Wait 20 seconds before next iteration (average of 15-30, stretched by budget pacing)
+            interval = get_rate_limit_manager().paced_interval(ENTITY_ODDS, 20)
+            sleep_started = time.monotonic()
+            await asyncio.sleep(interval)
+            lag = time.monotonic() - sleep_started - interval
             
         except Exception as e:
             consecutive_errors += 1
@@ -208,6 +246,21 @@ async def prematch_odds_loop():
     logger.info("Pre-match odds worker loop stopped")
 
 
+async def compaction_loop():
+    """Loop for compacting snapshot history of finished fixtures (low priority, opt-in)."""
+    logger.info(f"Odds snapshot compaction loop started ({ODDS_COMPACTION_INTERVAL:.0f} second interval)")
+    
+    while _worker_running:
+        try:
+            await compact_finished_fixtures()
+        except Exception as e:
+            logger.error(f"Error in odds snapshot compaction loop: {e}")
+        
+        await asyncio.sleep(ODDS_COMPACTION_INTERVAL)
+    
+    logger.info("Odds snapshot compaction loop stopped")
+
+
 async def start_odds_worker():
     """Start the odds worker background tasks."""
     global _worker_running, _worker_tasks
@@ -227,6 +280,11 @@ async def start_odds_worker():
     prematch_task = asyncio.create_task(prematch_odds_loop())
     _worker_tasks.append(prematch_task)
     
+    # Compact history of finished fixtures (ODDS_COMPACTION_ENABLED)
+    if ODDS_COMPACTION_ENABLED:
+        compaction_task = asyncio.create_task(compaction_loop())
+        _worker_tasks.append(compaction_task)
+    
     logger.info("Odds worker started successfully")
 
 
@@ -250,5 +308,11 @@ async def stop_odds_worker():
         await asyncio.gather(*_worker_tasks, return_exceptions=True)
     
     _worker_tasks = []
+    
+    # Write rows still buffered for the odds archive
+    archive_sink = get_odds_archive_sink()
+    if archive_sink:
+        await archive_sink.flush(force=True)
+    
     logger.info("Odds worker stopped")
 
@@ -0,0 +1,228 @@
+"""
+On-demand profiling of the running worker
+A sampling CPU profiler (a background thread reads the stacks of the other threads every
+few milliseconds, nothing is installed in the profiled code) returning collapsed stacks
+or an SVG flamegraph, and a tracemalloc snapshot diff for memory growth. One profile
+runs at a time per process; the request handler only awaits while sampling.
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single profile / memory diff
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+# Fastest allowed sampling interval (stack walks hold the GIL)
+PROFILER_MIN_INTERVAL_MS = float(os.getenv("PROFILER_MIN_INTERVAL_MS", "5"))
+# Frames kept per allocation traceback while tracemalloc runs
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_lock = asyncio.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another profile or memory diff is already running in this process"""
+
+
+def _frame_label(code, labels: Dict[Any, str]) -> str:
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_BACKEND_DIR):
+            filename = os.path.relpath(filename, _BACKEND_DIR)
+        else:
+            # Library frames: keep the package-relative tail (asyncio/base_events.py)
+            filename = "/".join(filename.split(os.sep)[-2:])
+        label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+        labels[code] = label
+    return label
+
+
+class SamplingProfiler:
+    """Samples thread stacks from a daemon thread into collapsed-stack counts"""
+
+    def __init__(self, interval: float, thread_ids: Optional[List[int]] = None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _sample(self, own_id: int, thread_names: Dict[int, str]) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code, self._labels))
+                frame = frame.f_back
+            if thread_id not in thread_names:
+                thread_names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample(own_id, thread_names)
+            except Exception as e:
+                logger.warning(f"Profiler sample failed: {e}")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format (flamegraph.pl, speedscope, inferno)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def render_flamegraph(stacks: Counter, title: str = "CPU profile", width: int = 1200) -> str:
+    """Minimal SVG flamegraph (root at the bottom, hover for frame and sample count)"""
+    tree: Dict[str, Any] = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = tree
+        node["count"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+
+    frame_height = 16
+    rects: List[Tuple[float, int, float, str, int]] = []
+    max_depth = [0]
+    total = tree["count"] or 1
+
+    def walk(node: Dict[str, Any], x: float, depth: int) -> None:
+        max_depth[0] = max(max_depth[0], depth)
+        for name, child in sorted(node["children"].items()):
+            w = child["count"] / total * width
+            if w >= 0.3:
+                rects.append((x, depth, w, name, child["count"]))
+                walk(child, x, depth + 1)
+            x += w
+
+    walk(tree, 0.0, 0)
+    height = (max_depth[0] + 1) * frame_height + 30
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="14">{escape(title)} ({total} samples)</text>',
+    ]
+    for x, depth, w, name, count in rects:
+        y = height - (depth + 1) * frame_height
+        hue = 20 + (hash(name) % 40)
+        label = escape(name)
+        parts.append(
+            f'<g><title>{label} - {count} samples ({count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{frame_height - 1}" fill="hsl({hue},85%,60%)"/>'
+        )
+        if w > 40:
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + 11}">{escape(name[:int(w / 7)])}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+async def run_cpu_profile(
+    seconds: float,
+    interval_ms: float = 10.0,
+    loop_only: bool = True,
+    output: str = "collapsed"
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Sample for `seconds` and return (collapsed stacks or SVG, summary).
+    loop_only samples just the event loop thread (where blocking transforms show up).
+    """
+    if _lock.locked():
+        raise ProfilerBusy("A profile is already running")
+    async with _lock:
+        seconds = min(max(seconds, 0.1), PROFILER_MAX_SECONDS)
+        interval = max(interval_ms, PROFILER_MIN_INTERVAL_MS) / 1000
+        profiler = SamplingProfiler(interval, [threading.get_ident()] if loop_only else None)
+        logger.info(f"CPU profile started ({seconds:.1f}s, every {interval * 1000:.0f}ms, loop only: {loop_only})")
+        started = time.monotonic()
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(profiler.stop)
+        elapsed = time.monotonic() - started
+        if output == "svg":
+            body = await asyncio.to_thread(
+                render_flamegraph, profiler.stacks, f"{'Event loop' if loop_only else 'All threads'}, {elapsed:.1f}s"
+            )
+        else:
+            body = profiler.collapsed()
+        summary = {"seconds": round(elapsed, 3), "samples": profiler.samples, "stacks": len(profiler.stacks)}
+        logger.info(f"CPU profile finished: {summary}")
+        return body, summary
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def _diff(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, key_type: str, top: int) -> List[Dict[str, Any]]:
+    stats = after.compare_to(before, key_type)
+    return [
+        {
+            "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "size_kb": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        }
+        for stat in stats[:top]
+    ]
+
+
+async def run_memory_diff(seconds: float, top: int = 25, group_by: str = "lineno") -> Dict[str, Any]:
+    """
+    Allocation growth over `seconds` (tracemalloc snapshot diff, top entries by size growth).
+    tracemalloc slows allocations while it runs, so it is stopped again afterwards unless
+    it was already tracing.
+    """
+    if _lock.locked():
+        raise ProfilerBusy("A profile is already running")
+    async with _lock:
+        seconds = min(max(seconds, 0.1), PROFILER_MAX_SECONDS)
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            before = await asyncio.to_thread(_snapshot)
+            await asyncio.sleep(seconds)
+            after = await asyncio.to_thread(_snapshot)
+            current, peak = tracemalloc.get_traced_memory()
+            top_stats = await asyncio.to_thread(_diff, before, after, group_by, top)
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        return {
+            "seconds": seconds,
+            "group_by": group_by,
+            "traced_current_mb": round(current / 1024 / 1024, 2),
+            "traced_peak_mb": round(peak / 1024 / 1024, 2),
+            "top": top_stats,
+        }
@@ -17,6 +17,21 @@ from config.rate_limit_config import (
     DEGRADE_THRESHOLD,
     BACKOFF_CONFIG,
     OBSERVABILITY_THRESHOLDS,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NAMES,
+    PRIORITY_RESERVED_HEADROOM,
+    PRIORITY_MAX_WAIT,
+    PRIORITY_QUEUE_POLL_INTERVAL,
+    PACING_ENABLED,
+    PACING_LOOKBACK_SECONDS,
+    PACING_MAX_FACTOR,
+    PACING_RECALC_INTERVAL,
+    ENTITY_CACHE_TTL,
+)
+from services.redis_rate_limit_store import (
+    RedisRateLimitStore,
+    SharedConsumeResult,
+    get_rate_limit_store,
 )
 
 logger = logging.getLogger(__name__)
@@ -57,6 +72,14 @@ class EntityRateLimitState:
     # Recent 429 timestamps (for observability)
     recent_429_timestamps: deque = field(default_factory=deque)
     
+    # Waiters queued per priority class {priority: count}
+    queued: Dict[int, int] = field(default_factory=dict)
+    
+    # Budget pacing (1.0 = no stretching)
+    pacing_factor: float = 1.0
+    projected_requests: Optional[int] = None  # Forecast requests until reset_at
+    pacing_updated_at: float = 0.0
+    
     def __post_init__(self):
         """Initialize with current time"""
         self.last_refill = time.time()
@@ -101,6 +124,59 @@ class EntityRateLimitState:
         self.total_requests += 1
         return True
     
+    def record_shared_request(self) -> None:
+        """Record a request whose token was consumed from the shared (Redis) bucket"""
+        now = time.time()
+        cutoff = now - self.window_seconds
+        while self.request_timestamps and self.request_timestamps[0] < cutoff:
+            self.request_timestamps.popleft()
+        self.request_timestamps.append(now)
+        self.total_requests += 1
+    
+    def available_tokens(self) -> int:
+        """Tokens usable right now (capped by API-reported remaining until the window resets)"""
+        if self.remaining is not None and (self.reset_at is None or time.time() < self.reset_at):
+            return min(self.tokens, self.remaining)
+        return self.tokens
+    
+    def update_pacing(self) -> float:
+        """
+        Forecast consumption until reset_at from the recent request rate and
+        derive how much TTLs/poll intervals must stretch to spread the budget.
+        Only active once the API has reported remaining and reset_at.
+        """
+        now = time.time()
+        if now - self.pacing_updated_at < PACING_RECALC_INTERVAL:
+            return self.pacing_factor
+        self.pacing_updated_at = now
+        
+        if self.remaining is None or not self.reset_at or self.reset_at <= now:
+            self.pacing_factor = 1.0
+            self.projected_requests = None
+            return self.pacing_factor
+        
+        # Request rate over the lookback period (newest timestamps are on the right)
+        cutoff = now - PACING_LOOKBACK_SECONDS
+        recent = 0
+        for ts in reversed(self.request_timestamps):
+            if ts < cutoff:
+                break
+            recent += 1
+        oldest = self.request_timestamps[0] if self.request_timestamps else now
+        lookback = max(1.0, min(PACING_LOOKBACK_SECONDS, now - oldest))
+        rate = recent / lookback
+        
+        projected = rate * (self.reset_at - now)
+        self.projected_requests = int(projected)
+        
+        # Keep the degrade threshold untouched - pace the rest of the budget evenly
+        budget = max(1, self.remaining - DEGRADE_THRESHOLD)
+        if projected <= budget:
+            self.pacing_factor = 1.0
+        else:
+            self.pacing_factor = min(PACING_MAX_FACTOR, projected / budget)
+        return self.pacing_factor
+    
     def update_from_response(self, remaining: Optional[int], limit: Optional[int], reset_at: Optional[float]) -> None:
         """Update state from API response metadata"""
         if remaining is not None:
@@ -194,53 +270,171 @@ class EntityRateLimitState:
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
             "cache_hit_rate": self.get_cache_hit_rate(),
+            "pacing_factor": round(self.pacing_factor, 2),
+            "projected_requests_until_reset": self.projected_requests,
+            "queued": {
+                PRIORITY_NAMES.get(priority, str(priority)): count
+                for priority, count in self.queued.items()
+                if count > 0
+            },
         }
 
 
 class RateLimitManager:
     """Entity-based rate limit manager"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[RedisRateLimitStore] = None):
         self._entities: Dict[str, EntityRateLimitState] = {}
-        self._lock = asyncio.Lock()
-        self._in_flight_requests: Dict[str, asyncio.Task] = {}  # For deduplication
-    
-    async def acquire(self, entity: str) -> Tuple[bool, Optional[float]]:
+        # One lock per entity: requests for different entities never contend
+        self._entity_locks: Dict[str, asyncio.Lock] = {}
+        # Dedup registry is lock-free: plain dict ops never yield to the event loop
+        self._in_flight_requests: Dict[str, asyncio.Task] = {}
+        # Shared state for multi-worker deployments (None = in-memory only)
+        self._store = store
+    
+    async def acquire(self, entity: str, priority: int = PRIORITY_INTERACTIVE) -> Tuple[bool, Optional[float]]:
         """
         Try to acquire permission to make a request.
+        Lower-priority classes may not dip into the headroom reserved for higher ones.
         
         Returns:
             (allowed, wait_time): (True, None) if allowed, (False, wait_seconds) if rate limited
         """
-        async with self._lock:
-            state = self._get_or_create_state(entity)
-            
+        reserve = PRIORITY_RESERVED_HEADROOM.get(priority, 0)
+        state = self._get_or_create_state(entity)
+        
+        # Shared budget across workers (falls back to local state if Redis fails).
+        # The consume script is atomic in Redis, so the round-trip runs in a thread and
+        # outside the entity lock: a slow Redis neither blocks the loop nor queues waiters.
+        if self._store is not None:
+            shared = await asyncio.to_thread(
+                self._store.consume, entity, state.capacity, state.window_seconds, reserve
+            )
+            if shared is not None:
+                return self._apply_shared_consume(state, shared)
+        
+        async with self._get_entity_lock(entity):
             # Check cooldown first
             if state.is_in_cooldown():
                 wait_time = state.cooldown_until - time.time()
                 return False, wait_time
             
+            # Keep reserved headroom for higher-priority classes
+            if reserve > 0:
+                state.refill_tokens()
+                if state.available_tokens() <= reserve:
+                    return False, self._calculate_headroom_wait(state, reserve)
+            
             # Check if we can consume a token
             if state.consume_token():
-                # Check if we should enter degrade mode
-                if state.remaining is not None and state.remaining < DEGRADE_THRESHOLD:
-                    state.enter_degrade_mode()
-                elif state.remaining is not None and state.remaining >= DEGRADE_THRESHOLD * 2:
-                    state.exit_degrade_mode()
-                
+                self._update_degrade_mode(state)
                 return True, None
             
             # Rate limited - calculate wait time
-            if state.request_timestamps:
+            if len(state.request_timestamps) >= state.capacity:
+                # Sliding window full: wait for the oldest request to expire
                 oldest_ts = state.request_timestamps[0]
                 wait_time = self._calculate_wait_time(oldest_ts, state.window_seconds)
-            elif state.reset_at:
+            elif state.remaining is not None and state.remaining <= 0 and state.reset_at:
+                # API budget exhausted: wait for the window reset
                 wait_time = max(0, state.reset_at - time.time())
             else:
+                # Bucket empty: wait for the next token refill
                 wait_time = state.window_seconds / state.capacity
             
             return False, wait_time
     
+    async def acquire_queued(
+        self,
+        entity: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_wait: Optional[float] = None
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Acquire permission, waiting in the entity's priority queue while rate limited.
+        Waiters of a higher class (lower value) are always served before lower classes.
+        
+        Returns:
+            (allowed, wait_time): (True, None) if allowed, (False, wait_seconds) if max_wait elapsed
+        """
+        if max_wait is None:
+            max_wait = PRIORITY_MAX_WAIT.get(priority, 10.0)
+        state = self._get_or_create_state(entity)
+        
+        # Fast path: nobody more important is waiting
+        if not self._has_higher_priority_waiters(state, priority):
+            allowed, wait_time = await self.acquire(entity, priority)
+            if allowed:
+                return True, None
+        else:
+            wait_time = PRIORITY_QUEUE_POLL_INTERVAL
+        
+        logger.info(
+            f"Rate limit wait for {entity} ({PRIORITY_NAMES.get(priority, priority)}): "
+            f"{wait_time:.2f}s, max {max_wait:.1f}s"
+        )
+        deadline = time.time() + max_wait
+        state.queued[priority] = state.queued.get(priority, 0) + 1
+        try:
+            while True:
+                time_left = deadline - time.time()
+                if time_left <= 0:
+                    return False, wait_time
+                await asyncio.sleep(max(0, min(wait_time, time_left)))
+                
+                if self._has_higher_priority_waiters(state, priority):
+                    wait_time = PRIORITY_QUEUE_POLL_INTERVAL
+                    continue
+                
+                allowed, wait_time = await self.acquire(entity, priority)
+                if allowed:
+                    return True, None
+        finally:
+            state.queued[priority] -= 1
+    
+    def _has_higher_priority_waiters(self, state: EntityRateLimitState, priority: int) -> bool:
+        """Check if requests of a more important class are queued for this entity"""
+        return any(count > 0 for p, count in state.queued.items() if p < priority)
+    
+    def _calculate_headroom_wait(self, state: EntityRateLimitState, reserve: int) -> float:
+        """Calculate wait time until available tokens exceed the class reserve"""
+        now = time.time()
+        if state.remaining is not None and state.remaining <= reserve and state.reset_at and state.reset_at > now:
+            # API budget exhausted for this class until the window resets
+            return state.reset_at - now
+        deficit = reserve - state.tokens + 1
+        return max(0.1, deficit * state.window_seconds / state.capacity)
+    
+    def _apply_shared_consume(
+        self,
+        state: EntityRateLimitState,
+        shared: SharedConsumeResult
+    ) -> Tuple[bool, Optional[float]]:
+        """Mirror shared bucket result into local state (for metrics and degrade mode)"""
+        state.tokens = shared.tokens
+        if shared.remaining is not None:
+            state.remaining = shared.remaining
+        
+        if shared.in_cooldown:
+            # Cooldown set by another worker - mirror it locally
+            state.cooldown_until = time.time() + shared.wait_time
+            state.cooldown_reason = state.cooldown_reason or "shared"
+            return False, shared.wait_time
+        
+        if not shared.allowed:
+            return False, shared.wait_time
+        
+        state.record_shared_request()
+        self._update_degrade_mode(state)
+        return True, None
+    
+    def _update_degrade_mode(self, state: EntityRateLimitState) -> None:
+        """Enter/exit degrade mode based on remaining requests reported by the API"""
+        if state.remaining is not None and state.remaining < DEGRADE_THRESHOLD:
+            state.enter_degrade_mode()
+        elif state.remaining is not None and state.remaining >= DEGRADE_THRESHOLD * 2:
+            state.exit_degrade_mode()
+    
     def _calculate_wait_time(self, oldest_ts: float, window: int) -> float:
         """Calculate wait time until oldest request expires"""
         now = time.time()
@@ -248,13 +442,20 @@ class RateLimitManager:
         wait_time = window - elapsed + 0.1  # Small buffer
         return max(0, wait_time)
     
+    def _get_entity_lock(self, entity: str) -> asyncio.Lock:
+        """Get or create the state lock for entity"""
+        lock = self._entity_locks.get(entity)
+        if lock is None:
+            lock = self._entity_locks[entity] = asyncio.Lock()
+        return lock
+    
     def _get_or_create_state(self, entity: str) -> EntityRateLimitState:
         """Get or create rate limit state for entity"""
         if entity not in self._entities:
             self._entities[entity] = EntityRateLimitState(entity=entity)
         return self._entities[entity]
     
-    def update_from_response(
+    async def update_from_response(
         self,
         entity: str,
         remaining: Optional[int] = None,
@@ -312,6 +513,15 @@ class RateLimitManager:
                     pass
         
         state.update_from_response(remaining, limit, reset_at)
+        
+        # Sync to shared state so all workers see the same budget
+        if self._store is not None and (remaining is not None or limit is not None or reset_at is not None):
+            shared_tokens = await asyncio.to_thread(
+                self._store.sync_from_response,
+                entity, remaining, limit, reset_at, state.capacity, state.window_seconds
+            )
+            if shared_tokens is not None:
+                state.tokens = shared_tokens
     
     async def handle_429(
         self,
@@ -343,6 +553,14 @@ class RateLimitManager:
         jitter = random.uniform(0, cooldown_duration * BACKOFF_CONFIG["jitter_max"])
         cooldown_duration += jitter
         
+        # Fleet-wide cooldown (another worker may already have set a longer one)
+        if self._store is not None:
+            shared_cooldown = await asyncio.to_thread(
+                self._store.enter_cooldown, entity, cooldown_duration, "429", state.window_seconds
+            )
+            if shared_cooldown is not None:
+                cooldown_duration = max(cooldown_duration, shared_cooldown)
+        
         state.enter_cooldown(cooldown_duration, "429")
         return cooldown_duration
     
@@ -356,6 +574,24 @@ class RateLimitManager:
         state = self._get_or_create_state(entity)
         state.cache_misses += 1
     
+    def get_pacing_factor(self, entity: str) -> float:
+        """Get budget pacing factor for entity (1.0 = on track, >1.0 = stretch TTLs/intervals)"""
+        if not PACING_ENABLED:
+            return 1.0
+        state = self._get_or_create_state(entity)
+        return state.update_pacing()
+    
+    def paced_ttl(self, entity: str, ttl_seconds: int) -> int:
+        """Stretch a cache TTL by the entity's pacing factor (static entities are left alone)"""
+        config = ENTITY_CACHE_TTL.get(entity)
+        if config and config.is_static:
+            return ttl_seconds
+        return int(round(ttl_seconds * self.get_pacing_factor(entity)))
+    
+    def paced_interval(self, entity: str, interval_seconds: float) -> float:
+        """Stretch a polling interval by the entity's pacing factor"""
+        return interval_seconds * self.get_pacing_factor(entity)
+    
     def is_degraded(self, entity: str) -> bool:
         """Check if entity is in degrade mode"""
         state = self._get_or_create_state(entity)
@@ -363,17 +599,19 @@ class RateLimitManager:
     
     async def get_in_flight_request(self, request_key: str) -> Optional[asyncio.Task]:
         """Get in-flight request for deduplication"""
-        async with self._lock:
-            return self._in_flight_requests.get(request_key)
+        return self._in_flight_requests.get(request_key)
     
     async def set_in_flight_request(self, request_key: str, task: asyncio.Task) -> None:
         """Set in-flight request for deduplication"""
-        async with self._lock:
-            self._in_flight_requests[request_key] = task
+        self._in_flight_requests[request_key] = task
     
-    async def remove_in_flight_request(self, request_key: str) -> None:
-        """Remove in-flight request after completion"""
-        async with self._lock:
+    async def remove_in_flight_request(self, request_key: str, task: Optional[asyncio.Task] = None) -> None:
+        """
+        Remove in-flight request after completion.
+        If task is given, only remove the entry if it still points to that task
+        (a newer request for the same key may have replaced it).
+        """
+        if task is None or self._in_flight_requests.get(request_key) is task:
             self._in_flight_requests.pop(request_key, None)
     
     def get_metrics(self, entity: Optional[str] = None) -> Dict:
@@ -384,6 +622,7 @@ class RateLimitManager:
         
         # Return metrics for all entities
         return {
+            "backend": "redis" if self._store is not None else "memory",
             "entities": {
                 entity: state.get_metrics()
                 for entity, state in self._entities.items()
@@ -442,6 +681,6 @@ def get_rate_limit_manager() -> RateLimitManager:
     """Get global rate limit manager instance"""
     global _rate_limit_manager
     if _rate_limit_manager is None:
-        _rate_limit_manager = RateLimitManager()
+        _rate_limit_manager = RateLimitManager(store=get_rate_limit_store())
     return _rate_limit_manager
 
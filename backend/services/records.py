@@ -0,0 +1,251 @@
+"""
+Compact record types for normalized odds, grouped odds and transformed matches
+Each record keeps its fields in __slots__ instead of a per-object dict, which cuts
+memory several-fold for the tens of thousands of odds/matches held between
+transforming, memoizing and caching. Records are mutable mappings, so existing
+code using .get(), [] and `in` keeps working; dumps() is the JSON fast path.
+"""
+import json
+import operator
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Slot value of fields the record does not contain (every slot is always set)
+_UNSET = object()
+
+
+class Record(MutableMapping):
+    """Mapping over fixed __slots__ fields; keys outside `_fields` go to an overflow dict"""
+    __slots__ = ("_extra",)
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+    _getter: Callable[[Any], Tuple[Any, ...]] = staticmethod(lambda obj: ())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls._fields)
+        if len(cls._fields) > 1:
+            # Reads all slots in one C call (to_dict/iteration are the hot paths)
+            cls._getter = staticmethod(operator.attrgetter(*cls._fields))
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None):
+        data = data or {}
+        get = data.get
+        for key in self._fields:
+            setattr(self, key, get(key, _UNSET))
+        if self._field_set.issuperset(data):
+            self._extra = None
+        else:
+            self._extra = {key: value for key, value in data.items() if key not in self._field_set}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key)
+        elif self._extra is not None:
+            value = self._extra.get(key, _UNSET)
+        else:
+            value = _UNSET
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._field_set:
+            return getattr(self, key) is not _UNSET
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._field_set and getattr(self, key) is not _UNSET:
+            setattr(self, key, _UNSET)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(self._fields, self._getter(self)):
+            if value is not _UNSET:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(1 for value in self._getter(self) if value is not _UNSET)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict copy (field order, then overflow keys)"""
+        result = {key: value for key, value in zip(self._fields, self._getter(self)) if value is not _UNSET}
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def copy(self) -> "Record":
+        return self.__class__(self.to_dict())
+
+    def __reduce__(self):
+        return self.__class__, (self.to_dict(),)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+ODD_FIELDS = (
+    "bookmaker_id",
+    "bookmaker_name",
+    "market_id",
+    "market_name",
+    "market_description",
+    "label",
+    "name",
+    "value",
+    "odd",
+    "price",
+    "stopped",
+    "suspended",
+    "is_unavailable",
+    "latest_bookmaker_update",
+    "player_id",
+    "player_name",
+)
+
+
+class OddRecord(Record):
+    """Normalized odd (output of _extract_and_normalize_odds)"""
+    __slots__ = ODD_FIELDS
+    _fields = ODD_FIELDS
+
+
+ODD_GROUP_FIELDS = ("market_id", "market_name", "line", "handicap", "selections")
+
+
+class OddGroupRecord(Record):
+    """Market/line group (output of _group_odds_by_market_line)"""
+    __slots__ = ODD_GROUP_FIELDS
+    _fields = ODD_GROUP_FIELDS
+
+
+MATCH_FIELDS = (
+    "id",
+    "sportmonks_id",
+    "home_team",
+    "away_team",
+    "home_team_id",
+    "away_team_id",
+    "home_team_logo",
+    "away_team_logo",
+    "home_score",
+    "away_score",
+    "league",
+    "league_id",
+    "league_logo",
+    "country",
+    "status",
+    "minute",
+    "seconds",
+    "time_added",
+    "ticking",
+    "has_timer",
+    "should_tick",
+    "is_live",
+    "is_finished",
+    "is_postponed",
+    "commence_time",
+    "commence_time_utc",
+    "events",
+    "statistics",
+    "lineups",
+    "odds",
+    "odds_grouped",
+    "venue",
+    "sidelined",
+    "currentPeriod",
+    "periods",
+    "participants",
+    "scores",
+    "time",
+    "state_id",
+)
+
+
+class MatchRecord(Record):
+    """Transformed match (output of the fixture/livescore transforms)"""
+    __slots__ = MATCH_FIELDS
+    _fields = MATCH_FIELDS
+
+
+def match_from_json(match: Any) -> Any:
+    """
+    Rebuild a transformed match decoded from JSON (e.g. returned by the transform pool) with
+    the record types the transforms produce: MatchRecord, OddRecord odds, OddGroupRecord groups.
+    """
+    if not isinstance(match, dict):
+        return match
+    odds = match.get("odds")
+    if isinstance(odds, list):
+        match["odds"] = [OddRecord(odd) if isinstance(odd, dict) else odd for odd in odds]
+    groups = match.get("odds_grouped")
+    if isinstance(groups, list):
+        rebuilt = []
+        for group in groups:
+            if isinstance(group, dict):
+                selections = group.get("selections")
+                if isinstance(selections, dict):
+                    group["selections"] = {
+                        side: OddRecord(odd) if isinstance(odd, dict) else odd for side, odd in selections.items()
+                    }
+                group = OddGroupRecord(group)
+            rebuilt.append(group)
+        match["odds_grouped"] = rebuilt
+    return MatchRecord(match)
+
+
+def json_default(obj: Any) -> Any:
+    """JSON fallback: records as dicts, anything else (datetime, ...) as str"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    return str(obj)
+
+
+def dumps(value: Any) -> str:
+    """Serialize to JSON (orjson when installed), handling records"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                value,
+                default=json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bit
+    return json.dumps(value, default=json_default)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON (orjson when installed) from str or bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
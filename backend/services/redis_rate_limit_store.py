@@ -0,0 +1,257 @@
+"""
+Redis-backed shared state for the SportMonks rate limiter.
+Keeps one token bucket + sliding window per entity in Redis so that every
+uvicorn worker and replica draws from the same hourly budget.
+All state transitions (consume/refill, response sync, cooldown) run as atomic Lua scripts.
+"""
+import uuid
+import logging
+from typing import Optional, Any
+from dataclasses import dataclass
+
+import redis
+
+from config.rate_limit_config import RATE_LIMIT_BACKEND, RATE_LIMIT_REDIS_PREFIX
+from services.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis converts Lua numbers in replies to integers, so fractional values are returned as strings.
+# Time is taken from the Redis server (TIME) so all replicas share one clock.
+
+# KEYS[1] = state hash, KEYS[2] = sliding window zset
+# ARGV[1] = default capacity, ARGV[2] = window seconds, ARGV[3] = unique request member
+# ARGV[4] = tokens reserved for higher-priority classes
+CONSUME_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local window = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[4]) or 0
+
+local fields = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill', 'capacity', 'cooldown_until', 'remaining', 'reset_at')
+local capacity = tonumber(fields[3]) or tonumber(ARGV[1])
+local tokens = tonumber(fields[1]) or capacity
+local last_refill = tonumber(fields[2]) or now
+local cooldown_until = tonumber(fields[4])
+local remaining = fields[5] or ''
+local remaining_num = tonumber(fields[5])
+local reset_at = tonumber(fields[6])
+
+if cooldown_until and cooldown_until > now then
+    return {0, tostring(cooldown_until - now), tostring(tokens), remaining, 1}
+end
+
+-- Refill proportionally to elapsed time
+local elapsed = now - last_refill
+if elapsed > 0 then
+    local to_add = math.floor((elapsed / window) * capacity)
+    if to_add > 0 then
+        tokens = math.min(capacity, tokens + to_add)
+        last_refill = now
+    end
+end
+
+-- Sliding window
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - window)
+local in_window = redis.call('ZCARD', KEYS[2])
+
+-- API-reported remaining caps usable tokens until the window resets
+local available = tokens
+if remaining_num and (not reset_at or reset_at > now) then
+    available = math.min(tokens, remaining_num)
+end
+
+local allowed = 0
+local wait = 0
+if in_window >= capacity then
+    local oldest = redis.call('ZRANGE', KEYS[2], 0, 0, 'WITHSCORES')
+    wait = math.max(0, window - (now - tonumber(oldest[2])) + 0.1)
+elseif tokens <= 0 then
+    if remaining_num and remaining_num <= 0 and reset_at and reset_at > now then
+        wait = reset_at - now
+    else
+        wait = window / capacity
+    end
+elseif reserve > 0 and available <= reserve then
+    -- Headroom reserved for higher-priority classes
+    if remaining_num and remaining_num <= reserve and reset_at and reset_at > now then
+        wait = reset_at - now
+    else
+        wait = math.max(0.1, (reserve - tokens + 1) * window / capacity)
+    end
+else
+    tokens = tokens - 1
+    redis.call('ZADD', KEYS[2], now, ARGV[3])
+    redis.call('HINCRBY', KEYS[1], 'total_requests', 1)
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'last_refill', tostring(last_refill))
+redis.call('EXPIRE', KEYS[1], window * 2)
+redis.call('EXPIRE', KEYS[2], window * 2)
+return {allowed, tostring(wait), tostring(tokens), remaining, 0}
+"""
+
+# KEYS[1] = state hash
+# ARGV[1] = remaining, ARGV[2] = limit, ARGV[3] = reset_at ('' when unknown)
+# ARGV[4] = default capacity, ARGV[5] = key TTL
+SYNC_SCRIPT = """
+local remaining = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local reset_at = tonumber(ARGV[3])
+
+local fields = redis.call('HMGET', KEYS[1], 'tokens', 'capacity')
+local capacity = tonumber(fields[2]) or tonumber(ARGV[4])
+local tokens = tonumber(fields[1]) or capacity
+
+if remaining then
+    redis.call('HSET', KEYS[1], 'remaining', remaining)
+    if remaining < tokens then
+        tokens = math.max(0, remaining)
+    end
+end
+if limit then
+    redis.call('HSET', KEYS[1], 'capacity', limit)
+    tokens = math.min(tokens, limit)
+end
+if reset_at then
+    redis.call('HSET', KEYS[1], 'reset_at', tostring(reset_at))
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tostring(tokens)
+"""
+
+# KEYS[1] = state hash
+# ARGV[1] = cooldown duration (seconds), ARGV[2] = reason, ARGV[3] = key TTL
+COOLDOWN_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local cooldown_until = now + tonumber(ARGV[1])
+
+local current = tonumber(redis.call('HGET', KEYS[1], 'cooldown_until'))
+if current and current > cooldown_until then
+    -- Another worker already set a longer cooldown, keep it
+    cooldown_until = current
+else
+    redis.call('HSET', KEYS[1], 'cooldown_until', tostring(cooldown_until), 'cooldown_reason', ARGV[2])
+end
+
+local total_429 = redis.call('HINCRBY', KEYS[1], 'total_429_errors', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {tostring(cooldown_until - now), total_429}
+"""
+
+
+@dataclass
+class SharedConsumeResult:
+    """Result of an atomic consume against the shared bucket"""
+    allowed: bool
+    wait_time: float
+    tokens: int
+    remaining: Optional[int]
+    in_cooldown: bool
+
+
+class RedisRateLimitStore:
+    """Shared (fleet-wide) rate limit state stored in Redis"""
+
+    def __init__(self, client: redis.Redis, prefix: str = RATE_LIMIT_REDIS_PREFIX):
+        self._client = client
+        self._prefix = prefix
+        self._consume_script = client.register_script(CONSUME_SCRIPT)
+        self._sync_script = client.register_script(SYNC_SCRIPT)
+        self._cooldown_script = client.register_script(COOLDOWN_SCRIPT)
+
+    def _state_key(self, entity: str) -> str:
+        return f"{self._prefix}:{entity}:state"
+
+    def _window_key(self, entity: str) -> str:
+        return f"{self._prefix}:{entity}:window"
+
+    @staticmethod
+    def _arg(value: Optional[Any]) -> str:
+        """Encode optional numeric script argument ('' means unknown)"""
+        return "" if value is None else str(value)
+
+    def consume(
+        self,
+        entity: str,
+        capacity: int,
+        window_seconds: int,
+        reserve: int = 0
+    ) -> Optional[SharedConsumeResult]:
+        """
+        Atomically refill and try to consume one token from the shared bucket,
+        leaving `reserve` tokens for higher-priority classes.
+        Returns None if Redis is unavailable (caller falls back to local state).
+        """
+        try:
+            allowed, wait_time, tokens, remaining, in_cooldown = self._consume_script(
+                keys=[self._state_key(entity), self._window_key(entity)],
+                args=[capacity, window_seconds, uuid.uuid4().hex, reserve],
+            )
+            return SharedConsumeResult(
+                allowed=bool(int(allowed)),
+                wait_time=float(wait_time),
+                tokens=int(float(tokens)),
+                remaining=int(float(remaining)) if remaining not in (None, "") else None,
+                in_cooldown=bool(int(in_cooldown)),
+            )
+        except (redis.RedisError, ValueError, TypeError) as e:
+            logger.warning(f"Shared rate limit consume failed for {entity}: {e}. Using local state.")
+            return None
+
+    def sync_from_response(
+        self,
+        entity: str,
+        remaining: Optional[int],
+        limit: Optional[int],
+        reset_at: Optional[float],
+        capacity: int,
+        window_seconds: int
+    ) -> Optional[int]:
+        """
+        Sync API rate limit metadata into the shared bucket.
+        Returns the shared token count, or None if Redis is unavailable.
+        """
+        try:
+            tokens = self._sync_script(
+                keys=[self._state_key(entity)],
+                args=[self._arg(remaining), self._arg(limit), self._arg(reset_at), capacity, window_seconds * 2],
+            )
+            return int(float(tokens))
+        except (redis.RedisError, ValueError, TypeError) as e:
+            logger.warning(f"Shared rate limit sync failed for {entity}: {e}")
+            return None
+
+    def enter_cooldown(self, entity: str, duration_seconds: float, reason: str, window_seconds: int) -> Optional[float]:
+        """
+        Put the entity into a fleet-wide cooldown.
+        Returns the effective cooldown remaining (may be longer if another worker set one),
+        or None if Redis is unavailable.
+        """
+        try:
+            remaining_cooldown, _ = self._cooldown_script(
+                keys=[self._state_key(entity)],
+                args=[duration_seconds, reason, window_seconds * 2],
+            )
+            return max(0.0, float(remaining_cooldown))
+        except (redis.RedisError, ValueError, TypeError) as e:
+            logger.warning(f"Shared rate limit cooldown failed for {entity}: {e}")
+            return None
+
+
+def get_rate_limit_store() -> Optional[RedisRateLimitStore]:
+    """Create shared store if RATE_LIMIT_BACKEND=redis and Redis is reachable"""
+    if RATE_LIMIT_BACKEND != "redis":
+        return None
+
+    client = get_redis_client()
+    if client is None:
+        logger.warning("RATE_LIMIT_BACKEND=redis but Redis is unavailable. Using in-memory rate limiting.")
+        return None
+
+    logger.info("Using Redis-backed shared rate limiting")
+    return RedisRateLimitStore(client)
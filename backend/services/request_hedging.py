@@ -0,0 +1,134 @@
+"""
+Hedged requests for latency-critical SportMonks GETs
+If the first attempt is slower than the entity's p95 latency, a second identical
+request is fired and whichever finishes first wins. Hedges are charged against
+the rate limiter and capped at a fraction of requests per entity.
+"""
+import re
+import time
+import asyncio
+import logging
+from typing import Dict, Optional, Callable, Awaitable
+from collections import deque
+
+import httpx
+
+from config.rate_limit_config import HEDGING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Idempotent, latency-critical paths eligible for hedging
+HEDGEABLE_PATH_RE = re.compile(r"^(livescores(/inplay)?|fixtures/\d+)$")
+
+
+class RequestHedger:
+    """Tracks per-entity latency and sends hedged GETs"""
+
+    def __init__(self):
+        self._latencies: Dict[str, deque] = {}
+        self._eligible_requests: Dict[str, int] = {}
+        self._hedges_sent: Dict[str, int] = {}
+        self._hedges_won: Dict[str, int] = {}
+
+    def is_hedgeable(self, path: str) -> bool:
+        """Check if hedging is enabled and path is eligible"""
+        return HEDGING_CONFIG["enabled"] and bool(HEDGEABLE_PATH_RE.match(path.strip("/")))
+
+    def record_latency(self, entity: str, latency: float) -> None:
+        """Record a request latency sample for entity"""
+        samples = self._latencies.get(entity)
+        if samples is None:
+            samples = self._latencies[entity] = deque(maxlen=HEDGING_CONFIG["latency_samples"])
+        samples.append(latency)
+
+    def get_hedge_delay(self, entity: str) -> float:
+        """Delay before hedging: latency percentile of recent samples"""
+        samples = self._latencies.get(entity)
+        if not samples or len(samples) < HEDGING_CONFIG["min_samples"]:
+            return HEDGING_CONFIG["default_delay"]
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * HEDGING_CONFIG["percentile"]))
+        return max(HEDGING_CONFIG["min_delay"], ordered[index])
+
+    def _has_hedge_budget(self, entity: str) -> bool:
+        """Keep hedges under max_hedge_ratio of eligible requests"""
+        eligible = self._eligible_requests.get(entity, 0)
+        sent = self._hedges_sent.get(entity, 0)
+        return sent < eligible * HEDGING_CONFIG["max_hedge_ratio"]
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        entity: str,
+        url: str,
+        acquire_hedge_token: Callable[[], Awaitable[bool]],
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send GET, hedging with a second request if the first exceeds the hedge delay.
+
+        Args:
+            client: HTTP client
+            entity: Entity (for latency tracking and budget)
+            url: Request URL
+            acquire_hedge_token: Charges the hedge against the rate limiter, returns False if not allowed
+            **kwargs: Passed to client.get (headers, params)
+        """
+        self._eligible_requests[entity] = self._eligible_requests.get(entity, 0) + 1
+        delay = self.get_hedge_delay(entity)
+        started = time.monotonic()
+
+        def record_primary(task: asyncio.Task) -> None:
+            # Only the primary attempt's latency feeds the hedge delay: a winning hedge's
+            # latency would pull the percentile down and make hedging fire ever earlier.
+            # A primary cancelled because the hedge won counts as at least as slow as it ran.
+            if task.cancelled() or task.exception() is None:
+                self.record_latency(entity, time.monotonic() - started)
+
+        primary = asyncio.create_task(client.get(url, **kwargs))
+        primary.add_done_callback(record_primary)
+        hedge: Optional[asyncio.Task] = None
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            if not self._has_hedge_budget(entity) or not await acquire_hedge_token():
+                return await primary
+
+            logger.debug(f"Hedging {entity} request after {delay:.2f}s: {url}")
+            self._hedges_sent[entity] = self._hedges_sent.get(entity, 0) + 1
+            hedge = asyncio.create_task(client.get(url, **kwargs))
+            pending = {primary, hedge}
+
+            # First successful response wins; only fail if both attempts fail
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedges_won[entity] = self._hedges_won.get(entity, 0) + 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    def get_metrics(self) -> Dict:
+        """Get hedging metrics per entity"""
+        return {
+            "enabled": HEDGING_CONFIG["enabled"],
+            "entities": {
+                entity: {
+                    "hedge_delay": round(self.get_hedge_delay(entity), 3),
+                    "eligible_requests": self._eligible_requests.get(entity, 0),
+                    "hedges_sent": self._hedges_sent.get(entity, 0),
+                    "hedges_won": self._hedges_won.get(entity, 0),
+                }
+                for entity in self._eligible_requests
+            },
+        }
@@ -0,0 +1,315 @@
+"""
+Retention/compaction of odds_snapshots history
+The odds worker appends a snapshot document per poll (over a thousand per in-play
+fixture). Once a fixture has finished (SportMonks state) and stopped updating, this job
+downsamples its snapshots to keyframes plus deltas, appends them to the fixture's
+zlib-compressed archive and deletes the raw snapshots in rate-limited batches, so it does
+not compete with live writes. Every snapshot save resets the parent's `compacted` flag,
+so history saved after a compaction is archived by a later run.
+"""
+import os
+import json
+import time
+import zlib
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.firebase_service import get_firestore_db, firestore
+from services.sportmonks_service import sportmonks_service
+from config.rate_limit_config import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# Compaction is destructive for raw snapshots (the archive keeps the history), so opt-in
+ODDS_COMPACTION_ENABLED = os.getenv("ODDS_COMPACTION_ENABLED", "false").lower() == "true"
+# Seconds between compaction runs
+ODDS_COMPACTION_INTERVAL = float(os.getenv("ODDS_COMPACTION_INTERVAL", "1800"))
+# Finished fixtures are compacted once their last snapshot is older than this
+ODDS_COMPACTION_MIN_AGE_HOURS = float(os.getenv("ODDS_COMPACTION_MIN_AGE_HOURS", "6"))
+# Fixtures compacted per run
+ODDS_COMPACTION_MAX_FIXTURES = int(os.getenv("ODDS_COMPACTION_MAX_FIXTURES", "50"))
+# Keep at most one snapshot per this many seconds
+ODDS_COMPACTION_DOWNSAMPLE_SECONDS = float(os.getenv("ODDS_COMPACTION_DOWNSAMPLE_SECONDS", "30"))
+# Full keyframe every N kept snapshots (deltas in between)
+ODDS_COMPACTION_KEYFRAME_EVERY = int(os.getenv("ODDS_COMPACTION_KEYFRAME_EVERY", "60"))
+# Deleted snapshot documents per batch (Firestore allows 500 writes per batch)
+ODDS_COMPACTION_BATCH_SIZE = min(int(os.getenv("ODDS_COMPACTION_BATCH_SIZE", "200")), 500)
+# Document deletes per second across batches
+ODDS_COMPACTION_DELETES_PER_SECOND = float(os.getenv("ODDS_COMPACTION_DELETES_PER_SECOND", "200"))
+
+# SportMonks fixture states after which no more odds history is expected
+# (4, 5 = finished, 9 = abandoned; see SportmonksService._format_time_status)
+FINISHED_STATE_IDS = {4, 5, 9}
+
+ARCHIVE_FORMAT = "keyframes+deltas/zlib-json/v1"
+# Compressed archive bytes per document (Firestore documents are limited to 1 MiB)
+ARCHIVE_PART_BYTES = 900_000
+
+
+def _odd_key(odd: Any) -> str:
+    """Stable identity of a raw odd (SportMonks odd id, else its full content)"""
+    if isinstance(odd, dict) and odd.get("id") is not None:
+        return str(odd["id"])
+    return json.dumps(odd, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _timestamp_seconds(value: Any) -> Optional[float]:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def build_archive(
+    snapshots: List[Dict[str, Any]],
+    downsample_seconds: float = ODDS_COMPACTION_DOWNSAMPLE_SECONDS,
+    keyframe_every: int = ODDS_COMPACTION_KEYFRAME_EVERY
+) -> Dict[str, Any]:
+    """
+    Downsample snapshots (oldest first) into keyframes plus deltas.
+
+    Args:
+        snapshots: Snapshot documents (fixture_id, odds, is_live, timestamp, ...)
+        downsample_seconds: Minimum spacing of kept snapshots (the last one is always kept)
+        keyframe_every: A full keyframe every N kept snapshots
+
+    Returns:
+        {"frames": [...], "source_count": n, "kept_count": k}; each frame has "t" (epoch
+        seconds), "live" and either "odds" (keyframe) or "set"/"del" (delta against
+        the previous frame, unchanged snapshots are dropped)
+    """
+    frames = []
+    previous: Optional[Dict[str, Tuple[str, Any]]] = None
+    last_kept_at: Optional[float] = None
+    kept = 0
+
+    for index, snapshot in enumerate(snapshots):
+        t = _timestamp_seconds(snapshot.get("timestamp"))
+        is_last = index == len(snapshots) - 1
+        if (
+            not is_last and t is not None and last_kept_at is not None
+            and t - last_kept_at < downsample_seconds
+        ):
+            continue
+
+        odds = snapshot.get("odds") or []
+        current = {}
+        for odd in odds:
+            current[_odd_key(odd)] = (json.dumps(odd, sort_keys=True, default=str), odd)
+
+        if previous is None or kept % keyframe_every == 0:
+            frames.append({"t": t, "live": snapshot.get("is_live", False), "odds": list(odds)})
+        else:
+            changed = [odd for key, (content, odd) in current.items()
+                       if key not in previous or previous[key][0] != content]
+            removed = [key for key in previous if key not in current]
+            if not changed and not removed and not is_last:
+                continue
+            frames.append({"t": t, "live": snapshot.get("is_live", False), "set": changed, "del": removed})
+
+        previous = current
+        last_kept_at = t if t is not None else last_kept_at
+        kept += 1
+
+    return {"frames": frames, "source_count": len(snapshots), "kept_count": kept}
+
+
+def expand_archive(archive: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rebuild the kept snapshots ({"t", "is_live", "odds"}) from build_archive output"""
+    snapshots = []
+    state: Dict[str, Any] = {}
+    for frame in archive.get("frames", []):
+        if "odds" in frame:
+            state = {_odd_key(odd): odd for odd in frame["odds"]}
+        else:
+            for key in frame.get("del", []):
+                state.pop(key, None)
+            for odd in frame.get("set", []):
+                state[_odd_key(odd)] = odd
+        snapshots.append({"t": frame["t"], "is_live": frame["live"], "odds": list(state.values())})
+    return snapshots
+
+
+def encode_archive(archive: Dict[str, Any]) -> List[bytes]:
+    """Compress an archive into parts that each fit in a Firestore document"""
+    data = zlib.compress(json.dumps(archive, separators=(",", ":"), default=str).encode(), 9)
+    return [data[i:i + ARCHIVE_PART_BYTES] for i in range(0, len(data), ARCHIVE_PART_BYTES)] or [b""]
+
+
+def decode_archive(parts: List[bytes]) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(b"".join(parts)))
+
+
+def _mark_compacted(transaction, fixture_ref, seen_last_updated: Any, summary: Dict[str, Any]) -> bool:
+    """
+    Record the archive on the parent document. A snapshot saved while the fixture was being
+    compacted has reset `compacted` to False and moved `last_updated`: the flag then stays
+    False (the new history is compacted by a later run) and the embedded payload is kept.
+    """
+    current = fixture_ref.get(field_paths=["last_updated"], transaction=transaction)
+    unchanged = (current.to_dict() or {}).get("last_updated") == seen_last_updated
+    data: Dict[str, Any] = {"compacted_at": datetime.now(timezone.utc)}
+    if summary:
+        data["archive"] = summary
+    if unchanged:
+        data["compacted"] = True
+        # The embedded latest payload is no longer needed once the fixture is archived
+        data["latest_snapshot"] = None
+        data["latest_snapshot_hash"] = None
+    transaction.set(fixture_ref, data, merge=True)
+    return unchanged
+
+
+def _compact_fixture(db, fixture_doc) -> Dict[str, int]:
+    """Blocking compaction of one fixture (run in a worker thread)"""
+    fixture_ref = fixture_doc.reference
+    parent = fixture_doc.to_dict() or {}
+    mark_compacted = firestore.transactional(_mark_compacted)
+    snapshots_ref = fixture_ref.collection("snapshots")
+    docs = list(snapshots_ref.order_by("timestamp").stream())
+    if not docs:
+        mark_compacted(db.transaction(), fixture_ref, parent.get("last_updated"), {})
+        return {"snapshots": 0, "frames": 0, "deleted": 0}
+
+    archive = build_archive([doc.to_dict() for doc in docs])
+    parts = encode_archive(archive)
+
+    # Each run appends a segment after the parts of earlier runs (history saved after a
+    # previous compaction), so nothing already archived is overwritten
+    previous = parent.get("archive") or {}
+    first_part = previous.get("parts", 0)
+    segment = previous.get("segments", 1 if first_part else 0)
+
+    # Write the archive before deleting anything
+    archive_ref = fixture_ref.collection("archive")
+    for i, part in enumerate(parts, start=first_part):
+        archive_ref.document(f"part-{i}").set({"data": part, "index": i, "segment": segment})
+    mark_compacted(db.transaction(), fixture_ref, parent.get("last_updated"), {
+        "format": ARCHIVE_FORMAT,
+        "segments": segment + 1,
+        "parts": first_part + len(parts),
+        "bytes": previous.get("bytes", 0) + sum(len(part) for part in parts),
+        "source_count": previous.get("source_count", 0) + archive["source_count"],
+        "kept_count": previous.get("kept_count", 0) + archive["kept_count"],
+        "frames": previous.get("frames", 0) + len(archive["frames"]),
+    })
+
+    deleted = 0
+    min_batch_seconds = ODDS_COMPACTION_BATCH_SIZE / ODDS_COMPACTION_DELETES_PER_SECOND if ODDS_COMPACTION_DELETES_PER_SECOND > 0 else 0
+    for start in range(0, len(docs), ODDS_COMPACTION_BATCH_SIZE):
+        started = time.monotonic()
+        batch = db.batch()
+        for doc in docs[start:start + ODDS_COMPACTION_BATCH_SIZE]:
+            batch.delete(doc.reference)
+        batch.commit()
+        deleted += min(ODDS_COMPACTION_BATCH_SIZE, len(docs) - start)
+        # Pace deletes so compaction doesn't compete with live snapshot writes
+        remaining = min_batch_seconds - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    return {"snapshots": len(docs), "frames": len(archive["frames"]), "deleted": deleted}
+
+
+def _stale_fixtures(db, limit: int, after: Optional[Any]) -> List[Any]:
+    """
+    Parent documents with uncompacted history and no snapshot for ODDS_COMPACTION_MIN_AGE_HOURS,
+    oldest first, starting after the `after` document (uses the compacted + last_updated index)
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=ODDS_COMPACTION_MIN_AGE_HOURS)
+    query = (
+        db.collection("odds_snapshots")
+        .where("compacted", "==", False)
+        .where("last_updated", "<", cutoff)
+        .order_by("last_updated")
+        .order_by("__name__")  # document ID, breaks ties on last_updated
+    )
+    if after is not None:
+        query = query.start_after(after)
+    return list(query.limit(limit).stream())
+
+
+async def _is_finished(fixture_id: str) -> bool:
+    """Whether SportMonks reports the fixture as finished (quiet pre-match fixtures are not)"""
+    try:
+        fixture = await sportmonks_service.get_fixture(int(fixture_id), include="", priority=PRIORITY_BACKGROUND)
+    except ValueError:
+        return False
+    return isinstance(fixture, dict) and fixture.get("state_id") in FINISHED_STATE_IDS
+
+
+# Last parent document examined; runs page through stale fixtures from here so fixtures
+# that are stale but not finished don't hold up the ones behind them
+_cursor: Optional[Any] = None
+
+
+async def compact_finished_fixtures(max_fixtures: int = ODDS_COMPACTION_MAX_FIXTURES) -> Dict[str, int]:
+    """
+    Compact snapshot history of finished fixtures.
+
+    Returns:
+        Totals for the run (fixtures, snapshots, frames, deleted)
+    """
+    global _cursor
+    totals = {"fixtures": 0, "snapshots": 0, "frames": 0, "deleted": 0}
+    db = get_firestore_db()
+    if not db:
+        return totals
+
+    page_size = max_fixtures * 4
+    candidates = await asyncio.to_thread(_stale_fixtures, db, page_size, _cursor)
+    # A short page is the end of the stale fixtures: start from the oldest again next run
+    _cursor = candidates[-1] if len(candidates) == page_size else None
+    for index, fixture_doc in enumerate(candidates):
+        if totals["fixtures"] >= max_fixtures:
+            # Resume after the last fixture examined
+            _cursor = candidates[index - 1]
+            break
+        if not await _is_finished(fixture_doc.id):
+            continue
+        try:
+            result = await asyncio.to_thread(_compact_fixture, db, fixture_doc)
+        except Exception as e:
+            logger.error(f"Error compacting odds snapshots for fixture {fixture_doc.id}: {e}")
+            continue
+        totals["fixtures"] += 1
+        for key in ("snapshots", "frames", "deleted"):
+            totals[key] += result[key]
+        logger.debug(f"Compacted fixture {fixture_doc.id}: {result}")
+
+    if totals["fixtures"]:
+        logger.info(
+            f"Odds snapshot compaction: {totals['fixtures']} fixtures, "
+            f"{totals['snapshots']} snapshots -> {totals['frames']} frames, {totals['deleted']} deleted"
+        )
+    return totals
+
+
+def load_archive(fixture_id: int) -> Optional[Dict[str, Any]]:
+    """Read and decode a fixture's archive (blocking, all segments in order), None if it has none"""
+    db = get_firestore_db()
+    if not db:
+        return None
+    archive_ref = db.collection("odds_snapshots").document(str(fixture_id)).collection("archive")
+    docs = sorted((doc.to_dict() for doc in archive_ref.stream()), key=lambda part: part.get("index", 0))
+    if not docs:
+        return None
+    segments: Dict[int, List[bytes]] = {}
+    for part in docs:
+        segments.setdefault(part.get("segment", 0), []).append(part["data"])
+    archive = {"frames": [], "source_count": 0, "kept_count": 0}
+    for segment in sorted(segments):
+        decoded = decode_archive(segments[segment])
+        # Each segment starts with a keyframe, so the frames can be expanded as one sequence
+        archive["frames"].extend(decoded["frames"])
+        archive["source_count"] += decoded["source_count"]
+        archive["kept_count"] += decoded["kept_count"]
+    return archive
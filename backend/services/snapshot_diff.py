@@ -0,0 +1,105 @@
+"""
+In-memory odds snapshot diff state
+The odds worker records, per fixture, the selection keys of the latest Bet365 snapshot.
+Request handlers filter odds against this state instead of reading the previous
+snapshot back from Firestore on every request.
+"""
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fixture's state stays usable without a worker update
+SNAPSHOT_DIFF_TTL = float(os.getenv("SNAPSHOT_DIFF_TTL", "600"))
+
+# Max fixtures kept in memory (least recently updated are dropped first)
+SNAPSHOT_DIFF_MAX_FIXTURES = int(os.getenv("SNAPSHOT_DIFF_MAX_FIXTURES", "5000"))
+
+
+@dataclass
+class FixtureDiffState:
+    """Selection keys of a fixture's latest snapshot"""
+    keys: Set[str] = field(default_factory=set)
+    is_live: bool = False
+    updated_at: float = 0.0
+
+
+class SnapshotDiffStore:
+    """Per-fixture snapshot diff state, updated incrementally by the odds worker"""
+
+    def __init__(self, ttl: float = SNAPSHOT_DIFF_TTL, max_fixtures: int = SNAPSHOT_DIFF_MAX_FIXTURES):
+        self.ttl = ttl
+        self.max_fixtures = max_fixtures
+        self._states: "OrderedDict[str, FixtureDiffState]" = OrderedDict()
+        self.updates = 0
+        self.lookups = 0
+        self.misses = 0
+
+    def update(self, fixture_id: Any, keys: Iterable[str], is_live: bool = False) -> FixtureDiffState:
+        """
+        Replace a fixture's snapshot keys.
+
+        Args:
+            fixture_id: Fixture ID
+            keys: Selection keys of the new snapshot (see SportmonksService._build_selection_key)
+            is_live: Whether the snapshot is in-play
+
+        Returns:
+            The fixture's updated state
+        """
+        fixture_key = str(fixture_id)
+        state = self._states.get(fixture_key)
+        if state is None:
+            state = self._states[fixture_key] = FixtureDiffState()
+
+        state.keys = {key for key in keys if key}
+        state.is_live = is_live
+        state.updated_at = time.time()
+        self.updates += 1
+        self._states.move_to_end(fixture_key)
+        while len(self._states) > self.max_fixtures:
+            self._states.popitem(last=False)
+        return state
+
+    def get(self, fixture_id: Any) -> Optional[FixtureDiffState]:
+        """Current state for a fixture, None if unknown or older than the TTL"""
+        self.lookups += 1
+        fixture_key = str(fixture_id)
+        state = self._states.get(fixture_key)
+        if state is None:
+            self.misses += 1
+            return None
+        if time.time() - state.updated_at > self.ttl:
+            del self._states[fixture_key]
+            self.misses += 1
+            return None
+        return state
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get store size and lookup hit rate"""
+        return {
+            "fixtures": len(self._states),
+            "max_fixtures": self.max_fixtures,
+            "ttl_seconds": self.ttl,
+            "updates": self.updates,
+            "lookups": self.lookups,
+            "hit_rate": round((self.lookups - self.misses) / self.lookups, 3) if self.lookups else 0.0,
+        }
+
+
+# Global singleton instance
+_snapshot_diff_store: Optional[SnapshotDiffStore] = None
+
+def get_snapshot_diff_store() -> SnapshotDiffStore:
+    """Get global snapshot diff store"""
+    global _snapshot_diff_store
+    if _snapshot_diff_store is None:
+        _snapshot_diff_store = SnapshotDiffStore()
+    return _snapshot_diff_store
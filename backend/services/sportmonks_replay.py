@@ -0,0 +1,237 @@
+"""
+Record/replay of SportMonks responses for offline benchmarks and load tests
+With SPORTMONKS_RECORD_DIR set, SportmonksService saves every successful response
+to disk (one JSON file per path + query). Recordings are served back either in
+process (SPORTMONKS_REPLAY_DIR: an httpx transport replaces the network) or by a
+local stand-in server (benchmarks/sportmonks_standin.py, point SPORTMONKS_API_BASE_URL
+at it), with configurable latency, injected 429s and synthesized pagination.
+"""
+import os
+import json
+import glob
+import random
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Directory to save live responses to (recording mode, off when unset)
+SPORTMONKS_RECORD_DIR = os.environ.get("SPORTMONKS_RECORD_DIR", "")
+# Directory to serve recorded responses from instead of the network (off when unset)
+SPORTMONKS_REPLAY_DIR = os.environ.get("SPORTMONKS_REPLAY_DIR", "")
+# Replay behaviour (in-process transport and stand-in server defaults)
+SPORTMONKS_REPLAY_LATENCY_MS = float(os.environ.get("SPORTMONKS_REPLAY_LATENCY_MS", "0"))
+SPORTMONKS_REPLAY_JITTER_MS = float(os.environ.get("SPORTMONKS_REPLAY_JITTER_MS", "0"))
+SPORTMONKS_REPLAY_429_RATE = float(os.environ.get("SPORTMONKS_REPLAY_429_RATE", "0"))
+
+# Query parameters that never take part in matching (credentials)
+IGNORED_PARAMS = {"api_token"}
+# Response headers worth keeping (rate limit state is read from them)
+RECORDED_HEADERS = ("content-type", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset", "retry-after")
+
+
+def recording_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable file key for a request (path plus sorted query, credentials excluded)"""
+    query = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in IGNORED_PARAMS)
+    digest = hashlib.sha1(json.dumps([path.strip("/"), query]).encode()).hexdigest()[:16]
+    slug = path.strip("/").replace("/", "_")[:80] or "root"
+    return f"{slug}-{digest}"
+
+
+class ResponseRecorder:
+    """Writes successful SportMonks responses to a directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.recorded = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, path: str, params: Dict[str, Any], status: int, headers: Dict[str, str], body: Any) -> None:
+        recording = {
+            "path": path.strip("/"),
+            "params": {k: v for k, v in params.items() if k not in IGNORED_PARAMS},
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() in RECORDED_HEADERS},
+            "body": body,
+        }
+        target = os.path.join(self.directory, recording_key(path, params) + ".json")
+        tmp_path = target + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(recording, f, ensure_ascii=False)
+        os.replace(tmp_path, target)
+
+    async def record(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        status: int,
+        headers: Dict[str, str],
+        body: Any
+    ) -> None:
+        """Save one response (body as parsed JSON, or raw bytes from a stream)"""
+        if isinstance(body, (bytes, bytearray)):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                logger.debug(f"Not recording non-JSON response for {path}")
+                return
+        try:
+            await asyncio.to_thread(self._write, path, dict(params or {}), status, dict(headers), body)
+            self.recorded += 1
+        except OSError as e:
+            logger.warning(f"Could not record SportMonks response for {path}: {e}")
+
+
+class RecordingStore:
+    """Recorded responses indexed by request key, and by path for pagination"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        for file_path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    recording = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable recording {file_path}: {e}")
+                continue
+            self._by_key[recording_key(recording["path"], recording.get("params"))] = recording
+            # First page (or unpaginated) recording per path, used to synthesize other pages
+            page = str((recording.get("params") or {}).get("page", "1"))
+            if page == "1" and recording["path"] not in self._by_path:
+                self._by_path[recording["path"]] = recording
+        logger.info(f"Loaded {len(self._by_key)} SportMonks recordings from {directory}")
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def lookup(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Exact recording for the request, else the path's first page recording"""
+        recording = self._by_key.get(recording_key(path, params))
+        if recording is None:
+            recording = self._by_path.get(path.strip("/"))
+        return recording
+
+
+@dataclass
+class ReplayConfig:
+    latency_ms: float = SPORTMONKS_REPLAY_LATENCY_MS
+    jitter_ms: float = SPORTMONKS_REPLAY_JITTER_MS
+    rate_429: float = SPORTMONKS_REPLAY_429_RATE  # fraction of requests answered with 429
+    retry_after: int = 1
+    per_page: Optional[int] = None  # re-paginate list bodies (None: use the request's per_page)
+    seed: Optional[int] = None
+
+
+class ReplayResponder:
+    """Builds responses from recordings with simulated latency, 429s and pagination"""
+
+    def __init__(self, store: RecordingStore, config: Optional[ReplayConfig] = None):
+        self.store = store
+        self.config = config or ReplayConfig()
+        self._rng = random.Random(self.config.seed)
+        self.requests = 0
+        self.misses = 0
+        self.rate_limited = 0
+        self.missed_paths: Counter = Counter()
+
+    def _paginate(self, recording: Dict[str, Any], params: Dict[str, Any]) -> Any:
+        body = recording["body"]
+        if not isinstance(body, dict) or not isinstance(body.get("data"), list):
+            return body
+        recorded_params = recording.get("params") or {}
+        requested_page = str(params.get("page", "1"))
+        if "page" in recorded_params and str(recorded_params["page"]) == requested_page:
+            return body  # recorded page served as is
+
+        per_page = self.config.per_page or int(params.get("per_page") or recorded_params.get("per_page") or 25)
+        data = body["data"]
+        page = max(int(requested_page), 1)
+        last_page = max((len(data) + per_page - 1) // per_page, 1)
+        page_body = dict(body)
+        page_body["data"] = data[(page - 1) * per_page:page * per_page]
+        page_body["pagination"] = {
+            "count": len(page_body["data"]),
+            "per_page": per_page,
+            "current_page": page,
+            "last_page": last_page,
+            "has_more": page < last_page,
+        }
+        return page_body
+
+    async def respond(self, path: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+        """(status, headers, body bytes) for a GET of path with query params"""
+        self.requests += 1
+        delay = self.config.latency_ms + self._rng.uniform(0, self.config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.config.rate_429 > 0 and self._rng.random() < self.config.rate_429:
+            self.rate_limited += 1
+            body = {"message": "Too Many Attempts.", "reset_code": "replay"}
+            return 429, {"Retry-After": str(self.config.retry_after)}, json.dumps(body).encode()
+
+        recording = self.store.lookup(path, params)
+        if recording is None:
+            self.misses += 1
+            self.missed_paths[path.strip("/")] += 1
+            return 404, {}, json.dumps({"message": f"No recording for {path}"}).encode()
+
+        headers = dict(recording.get("headers") or {})
+        headers["content-type"] = "application/json"
+        body = self._paginate(recording, params)
+        return recording.get("status", 200), headers, json.dumps(body, ensure_ascii=False).encode()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "recordings": len(self.store),
+            "requests": self.requests,
+            "misses": self.misses,
+            "rate_limited": self.rate_limited,
+            "top_missed_paths": dict(self.missed_paths.most_common(10)),
+        }
+
+
+def _split_path(url: httpx.URL, base_path: str) -> str:
+    path = url.path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    return path.strip("/")
+
+
+def replay_transport(responder: ReplayResponder, base_url: str = "") -> httpx.AsyncBaseTransport:
+    """httpx transport answering SportmonksService requests from recordings (no network)"""
+    base_path = httpx.URL(base_url).path.rstrip("/") if base_url else ""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        status, headers, body = await responder.respond(_split_path(request.url, base_path), params)
+        return httpx.Response(status, headers=headers, content=body)
+
+    return httpx.MockTransport(handler)
+
+
+def create_standin_app(responder: ReplayResponder):
+    """FastAPI app serving recordings at /v3/football/{path} (see benchmarks/sportmonks_standin.py)"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+
+    app = FastAPI(title="SportMonks stand-in")
+
+    @app.get("/_standin/metrics")
+    async def standin_metrics():
+        return responder.get_metrics()
+
+    @app.get("/v3/football/{path:path}")
+    async def replay(path: str, request: Request):
+        status, headers, body = await responder.respond(path, dict(request.query_params))
+        return Response(content=body, status_code=status, headers=headers)
+
+    return app
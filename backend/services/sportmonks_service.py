@@ -4,29 +4,84 @@ Fetches football match data from Sportmonks V3 API (Advanced Worldwide Plan).
 Acts as a Data Proxy - no database storage, direct pass-through to frontend.
 """
 import os
+import time
 import asyncio
 import random
 import hashlib
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, AsyncIterator, Awaitable
+from collections.abc import Mapping
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import httpx
 import logging
 
 from services.rate_limit_manager import get_rate_limit_manager
-from config.rate_limit_config import get_entity_from_path, get_cache_ttl
-from services.cache import get_cached, set_cached, cache_key
+from services.circuit_breaker import get_circuit_breakers, STATE_OPEN, STATE_HALF_OPEN
+from services.request_hedging import RequestHedger
+from services.json_stream import iter_data_items, STREAMING_AVAILABLE
+from services.transform_memo import get_transform_memo
+from services.transform_pool import get_transform_pool
+from services.odds_columns import OddsColumns
+from services.snapshot_diff import FixtureDiffState
+from services.market_classification import get_market_classifier, NO_ENTRIES, OVER, UNDER, HOME, AWAY
+from services.records import OddRecord, OddGroupRecord, MatchRecord, dumps, match_from_json
+from services.sportmonks_replay import (
+    ResponseRecorder,
+    RecordingStore,
+    ReplayResponder,
+    replay_transport,
+    SPORTMONKS_RECORD_DIR,
+    SPORTMONKS_REPLAY_DIR,
+)
+from config.rate_limit_config import (
+    get_entity_from_path,
+    get_cache_ttl,
+    PRIORITY_INTERACTIVE_LIVE,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BACKGROUND,
+    PRIORITY_WARMUP,
+    CIRCUIT_BREAKER_CONFIG,
+)
+from services.cache import get_cached, set_cached_raw, cache_key
+from services.metrics import (
+    observe_upstream, timed_stage, stage_timer, STAGE_TRANSFORM, STAGE_ODDS_NORMALIZE, STAGE_SERIALIZE,
+)
+from services.tracing import span, set_attributes, traced
+from services.hot_log import HotPathLogger
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
+hot_log = HotPathLogger(logger)
 
-SPORTMONKS_API_BASE_URL = "https://api.sportmonks.com/v3/football"
+# Overridable to point at a local stand-in (benchmarks/sportmonks_standin.py)
+SPORTMONKS_API_BASE_URL = os.environ.get("SPORTMONKS_API_BASE_URL", "https://api.sportmonks.com/v3/football").rstrip("/")
 # API Token from environment variable or use provided token
 SPORTMONKS_API_TOKEN = os.environ.get(
     "SPORTMONKS_API_TOKEN",
     "DANuduophWe7ysew7fNLOxySHaeQKvWsEPlpbOGCxI4Jt6sBuQhBnGUFFEem"
 )
 
+# HTTP client tuning (connection pool and timeouts)
+SPORTMONKS_HTTP2 = os.environ.get("SPORTMONKS_HTTP2", "true").lower() == "true"
+SPORTMONKS_MAX_CONNECTIONS = int(os.environ.get("SPORTMONKS_MAX_CONNECTIONS", "50"))
+SPORTMONKS_MAX_KEEPALIVE = int(os.environ.get("SPORTMONKS_MAX_KEEPALIVE", "20"))
+SPORTMONKS_KEEPALIVE_EXPIRY = float(os.environ.get("SPORTMONKS_KEEPALIVE_EXPIRY", "30"))
+SPORTMONKS_CONNECT_TIMEOUT = float(os.environ.get("SPORTMONKS_CONNECT_TIMEOUT", "5"))
+SPORTMONKS_READ_TIMEOUT = float(os.environ.get("SPORTMONKS_READ_TIMEOUT", "30"))
+SPORTMONKS_WRITE_TIMEOUT = float(os.environ.get("SPORTMONKS_WRITE_TIMEOUT", "10"))
+SPORTMONKS_POOL_TIMEOUT = float(os.environ.get("SPORTMONKS_POOL_TIMEOUT", "5"))
+
+# Stream-decode fixture pages (needs ijson) instead of response.json() on the whole page
+SPORTMONKS_STREAMING = os.environ.get("SPORTMONKS_STREAMING", "true").lower() == "true"
+STREAMING_ENABLED = SPORTMONKS_STREAMING and STREAMING_AVAILABLE
+
 # Bet365 (bookmaker ID: 2) supported market IDs for Standard Odds (Total Pre-Match/In-Play)
 BET365_SUPPORTED_MARKET_IDS = {
     1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20,
@@ -91,6 +146,65 @@ POPULAR_LEAGUE_IDS = [
 ]
 
 
+@lru_cache(maxsize=4096)
+def _parse_update_time(timestamp_str: str) -> Optional[datetime]:
+    """Parse a latest_bookmaker_update timestamp (ISO formats), None if unparseable"""
+    try:
+        if 'T' in timestamp_str or ' ' in timestamp_str:
+            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+
+
+async def _tee_chunks(chunks: AsyncIterator[bytes], sink: List[bytes]) -> AsyncIterator[bytes]:
+    """Pass body chunks through while keeping a copy (recording mode)"""
+    async for chunk in chunks:
+        sink.append(chunk)
+        yield chunk
+
+
+class BatchTransform:
+    """
+    Per-item transform that can also transform a whole page at once (e.g. to hand large
+    pages to the transform pool). With a cache_variant, _get applies it while the page is
+    parsed and caches the transformed page under that variant; restore rebuilds an item
+    read back from the cache.
+    """
+    __slots__ = ("item", "batch", "cache_variant", "restore")
+
+    def __init__(
+        self,
+        item: Callable[[Dict[str, Any]], Any],
+        batch: Callable[[List[Dict[str, Any]]], Awaitable[List[Any]]],
+        cache_variant: Optional[str] = None,
+        restore: Optional[Callable[[Any], Any]] = None
+    ):
+        self.item = item
+        self.batch = batch
+        self.cache_variant = cache_variant
+        self.restore = restore
+
+    def __call__(self, raw: Dict[str, Any]) -> Any:
+        return self.item(raw)
+
+    async def transform_batch(self, raws: List[Dict[str, Any]]) -> List[Any]:
+        return await self.batch(raws)
+
+
+def _restore_page(page: Any, transform: Optional[BatchTransform]) -> Any:
+    """Rebuild the items of a transformed page read back from the cache (see BatchTransform.restore)"""
+    if transform is None or transform.restore is None or not isinstance(page, dict):
+        return page
+    return {**page, "data": [transform.restore(item) for item in page.get("data") or []]}
+
+
+async def _retry_sleep(seconds: float, reason: str) -> None:
+    """Backoff/cooldown sleep between attempts (traced, so waits show up in a request's trace)"""
+    with span("retry.sleep", seconds=round(seconds, 3), reason=reason):
+        await asyncio.sleep(seconds)
+
+
 class SportmonksService:
     """Service class for interacting with Sportmonks V3 API."""
 
@@ -99,37 +213,200 @@ class SportmonksService:
             logger.warning("SPORTMONKS_API_TOKEN is not set. Requests will fail.")
         self.api_token = SPORTMONKS_API_TOKEN
         self.base_url = SPORTMONKS_API_BASE_URL
-        self.timeout = 35.0  # Optimized timeout for faster error detection
+        # Split timeouts: fail fast on connect/pool waits, allow large pages to download
+        self.timeout = httpx.Timeout(
+            connect=SPORTMONKS_CONNECT_TIMEOUT,
+            read=SPORTMONKS_READ_TIMEOUT,
+            write=SPORTMONKS_WRITE_TIMEOUT,
+            pool=SPORTMONKS_POOL_TIMEOUT,
+        )
+        self.http2 = SPORTMONKS_HTTP2 and HTTP2_AVAILABLE
+        if SPORTMONKS_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("SPORTMONKS_HTTP2 is enabled but 'h2' is not installed. Falling back to HTTP/1.1.")
+        if SPORTMONKS_STREAMING and not STREAMING_AVAILABLE:
+            logger.warning("SPORTMONKS_STREAMING is enabled but 'ijson' is not installed. Decoding whole pages.")
         # Lazy initialization of HTTP client with connection pooling
         self._client = None
         
+        # Record/replay for offline benchmarks (SPORTMONKS_RECORD_DIR / SPORTMONKS_REPLAY_DIR)
+        self._recorder = ResponseRecorder(SPORTMONKS_RECORD_DIR) if SPORTMONKS_RECORD_DIR else None
+        self._replay = ReplayResponder(RecordingStore(SPORTMONKS_REPLAY_DIR)) if SPORTMONKS_REPLAY_DIR else None
+        if self._recorder:
+            logger.warning(f"Recording SportMonks responses to {SPORTMONKS_RECORD_DIR}")
+        if self._replay:
+            logger.warning(f"Serving SportMonks requests from recordings in {SPORTMONKS_REPLAY_DIR} (no network)")
+        
         # Entity-based rate limit manager
         self._rate_limit_manager = get_rate_limit_manager()
         
+        # Per-entity circuit breakers (fail fast to stale cache when SportMonks is unhealthy)
+        self._circuit_breakers = get_circuit_breakers()
+        
+        # Hedged requests for latency-critical paths (SPORTMONKS_HEDGING=true)
+        self._hedger = RequestHedger()
+        
+        # LRU of transformed matches, re-transformed only when the raw fixture changes
+        self._transform_memo = get_transform_memo()
+        self._market_classifier = get_market_classifier()
+        
         # Entity caching (for rarely-changing entities like States, Types, Countries)
         # Cache TTL: 24 hours (these entities rarely change)
         self._entity_cache = {}  # {entity_type: {data: [...], timestamp: float}}
         self._entity_cache_ttl = 24 * 60 * 60  # 24 hours in seconds
     
     def _get_client(self) -> httpx.AsyncClient:
-        """Get or create reusable HTTP client with connection pooling."""
+        """Get or create reusable HTTP client with connection pooling (HTTP/2 multiplexing if available)."""
         if self._client is None:
             self._client = httpx.AsyncClient(
                 timeout=self.timeout,
-                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=SPORTMONKS_MAX_CONNECTIONS,
+                    max_keepalive_connections=SPORTMONKS_MAX_KEEPALIVE,
+                    keepalive_expiry=SPORTMONKS_KEEPALIVE_EXPIRY
+                ),
+                transport=replay_transport(self._replay, self.base_url) if self._replay else None
             )
         return self._client
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics (in-use, idle, waiters) for sizing pools.
+        Reads httpcore pool internals defensively - returns what's available.
+        """
+        stats = {
+            "http2": self.http2,
+            "max_connections": SPORTMONKS_MAX_CONNECTIONS,
+            "max_keepalive_connections": SPORTMONKS_MAX_KEEPALIVE,
+            "connections": 0,
+            "in_use": 0,
+            "idle": 0,
+            "http2_connections": 0,
+            "active_requests": 0,
+            "waiters": 0,
+        }
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is None:
+            return stats
+        
+        try:
+            connections = list(pool.connections)
+            stats["connections"] = len(connections)
+            stats["idle"] = sum(1 for conn in connections if conn.is_idle())
+            stats["in_use"] = stats["connections"] - stats["idle"]
+            stats["http2_connections"] = sum(1 for conn in connections if "HTTP/2" in conn.info())
+            requests = list(getattr(pool, "_requests", []))
+            stats["waiters"] = sum(1 for request in requests if request.is_queued())
+            stats["active_requests"] = len(requests) - stats["waiters"]
+        except Exception as e:
+            logger.debug(f"Could not read connection pool stats: {e}")
+        return stats
 
-    def _generate_request_key(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    def _generate_request_key(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        variant: Optional[str] = None
+    ) -> str:
         """Generate a unique key for request deduplication"""
         key_parts = [path]
         if params:
             # Sort params for consistent key generation
             sorted_params = sorted(params.items())
             key_parts.append(json.dumps(sorted_params, sort_keys=True))
+        if variant:
+            key_parts.append(variant)
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
+    def _cache_key(self, entity: str, path: str, params: Optional[Dict[str, Any]] = None, variant: Optional[str] = None) -> str:
+        """Cache key of a response (variant: transformed page, see BatchTransform)"""
+        return cache_key(f"sportmonks:{entity}", path, params, transform=variant)
+    
+    def _stale_cache_key(self, entity: str, path: str, params: Optional[Dict[str, Any]] = None, variant: Optional[str] = None) -> str:
+        """Cache key for the long-lived copy used as fail-fast fallback"""
+        return cache_key(f"sportmonks:stale:{entity}", path, params, transform=variant)
+    
+    async def _serve_stale(
+        self,
+        entity: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        use_cache: bool,
+        reason: str,
+        variant: Optional[str] = None
+    ) -> Any:
+        """Fail fast: serve the last good response for this request, or raise"""
+        if use_cache:
+            stale_data = await get_cached(self._stale_cache_key(entity, path, params, variant))
+            if stale_data is not None:
+                self._circuit_breakers.get(entity).total_stale_served += 1
+                logger.info(f"Serving stale cache for {entity}: {path} ({reason})")
+                return stale_data
+        raise Exception(f"Circuit open for {entity} and no cached data available for {path}")
+    
+    async def _cache_response(
+        self,
+        entity: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        data: Any,
+        variant: Optional[str] = None
+    ) -> None:
+        """Cache a successful response (serialized once for both copies)"""
+        # TTL stretched by budget pacing when the entity is on track to run out early
+        cache_ttl = self._rate_limit_manager.paced_ttl(entity, get_cache_ttl(entity))
+        try:
+            with stage_timer(STAGE_SERIALIZE):
+                serialized = dumps(data)
+        except TypeError as e:
+            logger.warning(f"Cache set error for {entity}: {path}: {e}")
+            return
+        await set_cached_raw(self._cache_key(entity, path, params, variant), serialized, cache_ttl)
+        # Long-lived copy served while the circuit is open, where the regular copy expires
+        # sooner and the response is small enough to be worth a second write
+        stale_ttl = CIRCUIT_BREAKER_CONFIG["stale_cache_ttl"]
+        if get_cache_ttl(entity) < stale_ttl and len(serialized) <= CIRCUIT_BREAKER_CONFIG["stale_cache_max_bytes"]:
+            await set_cached_raw(self._stale_cache_key(entity, path, params, variant), serialized, stale_ttl)
+    
+    async def _stream_response(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, Any],
+        transform: Callable[[Dict[str, Any]], Any],
+        keep_body: bool
+    ) -> Tuple[httpx.Response, Optional[Dict[str, Any]], Optional[bytes]]:
+        """
+        GET with the body stream-decoded: each `data[]` item is transformed as soon as it is
+        parsed, so neither the raw body nor the raw page is held while the page downloads.
+        
+        Returns:
+            (response, page, raw_body) - page is {"data": [transformed...], "page_count": raw items,
+            "pagination": ..., "rate_limit": ...} for a 200 (None otherwise, with the error body
+            read so response.text/json() work), raw_body the undecoded bytes when keep_body is set
+            (recording only)
+        """
+        async with client.stream("GET", url, headers=headers, params=params) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return response, None, None
+            chunks = response.aiter_bytes()
+            body_chunks: Optional[List[bytes]] = [] if keep_body else None
+            if body_chunks is not None:
+                chunks = _tee_chunks(chunks, body_chunks)
+            meta: Dict[str, Any] = {}
+            items = []
+            page_count = 0
+            async for item in iter_data_items(chunks, meta=meta):
+                page_count += 1
+                transformed = transform(item)
+                if transformed is not None:
+                    items.append(transformed)
+        raw_body = b"".join(body_chunks) if body_chunks is not None else None
+        return response, {"data": items, "page_count": page_count, **meta}, raw_body
+    
     async def _get(
         self,
         path: str,
@@ -138,7 +415,9 @@ class SportmonksService:
         backoff_factor: float = 0.5,
         entity: Optional[str] = None,
         use_cache: bool = True,
-        use_deduplication: bool = True
+        use_deduplication: bool = True,
+        priority: int = PRIORITY_INTERACTIVE,
+        transform: Optional[BatchTransform] = None
     ) -> Any:
         """
         Generic GET request handler with retry logic and entity-based rate limit management.
@@ -151,6 +430,13 @@ class SportmonksService:
             entity: Entity type (auto-detected from path if not provided)
             use_cache: Whether to use cache
             use_deduplication: Whether to deduplicate in-flight requests
+            priority: Request priority class (PRIORITY_* from rate_limit_config).
+                Higher classes are served first when rate limited; degrade mode
+                only pushes background/warm-up work to cache.
+            transform: List page transform with a cache_variant: items are transformed while
+                the page is stream-decoded (SPORTMONKS_STREAMING, needs ijson) or right after a
+                whole-page decode, and the transformed page is what gets cached. The result
+                carries "page_count", the number of raw items on the page.
             
         Returns:
             JSON response data
@@ -165,8 +451,10 @@ class SportmonksService:
         if not entity:
             entity = get_entity_from_path(path)
         
+        variant = transform.cache_variant if transform is not None else None
+        
         # Generate request key for deduplication
-        request_key = self._generate_request_key(path, params) if use_deduplication else None
+        request_key = self._generate_request_key(path, params, variant) if use_deduplication else None
         
         # Check for in-flight request (deduplication)
         if use_deduplication and request_key:
@@ -180,13 +468,11 @@ class SportmonksService:
         
         # Check cache first
         if use_cache:
-            cache_ttl = get_cache_ttl(entity)
-            cache_key_str = cache_key(f"sportmonks:{entity}", path, params)
-            cached_data = await get_cached(cache_key_str)
+            cached_data = await get_cached(self._cache_key(entity, path, params, variant))
             if cached_data is not None:
                 logger.debug(f"Cache HIT for {entity}: {path}")
                 self._rate_limit_manager.record_cache_hit(entity)
-                return cached_data
+                return _restore_page(cached_data, transform)
             self._rate_limit_manager.record_cache_miss(entity)
         
         url = f"{self.base_url}/{path.lstrip('/')}"
@@ -199,38 +485,92 @@ class SportmonksService:
         if params:
             query_params.update(params)
         
-        # Check if entity is degraded (serve from cache if available)
-        if self._rate_limit_manager.is_degraded(entity) and use_cache:
+        # Check if entity is degraded (low-priority work is served from cache only;
+        # user-facing requests keep using the headroom reserved for them)
+        if self._rate_limit_manager.is_degraded(entity) and use_cache and priority >= PRIORITY_BACKGROUND:
             logger.warning(f"Entity {entity} is degraded, trying cache only")
-            cache_key_str = cache_key(f"sportmonks:{entity}", path, params)
-            cached_data = await get_cached(cache_key_str)
+            cached_data = await get_cached(self._cache_key(entity, path, params, variant))
             if cached_data is not None:
                 logger.info(f"Serving degraded request from cache: {entity}: {path}")
-                return cached_data
+                return _restore_page(cached_data, transform)
             # If no cache, raise exception
             raise Exception(f"Entity {entity} is degraded and no cache available for {path}")
         
+        # Circuit breaker: while open, fail fast to stale cache (half-open lets one probe through)
+        breaker = self._circuit_breakers.get(entity)
+        if not breaker.allow_request():
+            return _restore_page(
+                await self._serve_stale(entity, path, params, use_cache, reason="circuit open", variant=variant),
+                transform
+            )
+        probing = breaker.state == STATE_HALF_OPEN
+        
+        # Hedging for latency-critical idempotent GETs (hedges are charged to the rate limiter)
+        hedgeable = self._hedger.is_hedgeable(path)
+        stream = transform is not None and STREAMING_ENABLED and not hedgeable
+        
+        async def acquire_hedge_token() -> bool:
+            allowed, _ = await self._rate_limit_manager.acquire(entity, priority)
+            return allowed
+        
         # Create request task for deduplication
         async def make_request():
+            try:
+                return await send_with_retries()
+            finally:
+                # A probe that got no verdict (429, rate limiter refused, error before the
+                # response) frees the half-open slot instead of holding it for probe_timeout
+                if probing:
+                    breaker.release_probe()
+        
+        async def send_with_retries():
             last_exception = None
             for attempt in range(retries):
+                # Stop retrying if the circuit opened meanwhile
+                if attempt > 0 and breaker.state == STATE_OPEN:
+                    return _restore_page(
+                        await self._serve_stale(
+                            entity, path, params, use_cache, reason="circuit opened during retries", variant=variant
+                        ),
+                        transform
+                    )
+                
                 try:
-                    # Acquire rate limit permission
-                    allowed, wait_time = await self._rate_limit_manager.acquire(entity)
+                    # Acquire rate limit permission (queued by priority class)
+                    with span("rate_limit.acquire", entity=entity, priority=priority):
+                        allowed, wait_time = await self._rate_limit_manager.acquire_queued(entity, priority=priority)
                     if not allowed:
-                        logger.info(f"Rate limit wait for {entity}: {wait_time:.2f}s")
-                        await asyncio.sleep(wait_time)
-                        # Try again
-                        allowed, wait_time = await self._rate_limit_manager.acquire(entity)
-                        if not allowed:
-                            raise Exception(f"Rate limit exceeded for {entity} after waiting")
+                        raise Exception(f"Rate limit exceeded for {entity} after waiting")
                     
                     # Use reusable client with connection pooling
                     client = self._get_client()
-                    response = await client.get(url, headers=headers, params=query_params)
+                    started = time.monotonic()
+                    streamed = raw_body = None
+                    with span("sportmonks.request", entity=entity, path=path, attempt=attempt, hedged=hedgeable):
+                        if hedgeable:
+                            response = await self._hedger.get(
+                                client, entity, url, acquire_hedge_token,
+                                headers=headers, params=query_params
+                            )
+                        elif stream:
+                            response, streamed, raw_body = await self._stream_response(
+                                client, url, headers, query_params, transform,
+                                keep_body=self._recorder is not None
+                            )
+                        else:
+                            response = await client.get(url, headers=headers, params=query_params)
+                        set_attributes(**{"http.status_code": response.status_code})
+                    latency = time.monotonic() - started
+                    observe_upstream(entity, response.status_code, latency)
+                    
+                    # Feed circuit breaker (5xx = upstream failure; 429 is handled by the rate limiter)
+                    if response.status_code >= 500:
+                        breaker.record_failure(latency)
+                    elif response.status_code != 429:
+                        breaker.record_success(latency)
                     
                     # Update rate limit state from response headers
-                    self._rate_limit_manager.update_from_response(
+                    await self._rate_limit_manager.update_from_response(
                         entity=entity,
                         headers=dict(response.headers)
                     )
@@ -266,7 +606,7 @@ class SportmonksService:
                                 f"Rate limited for {entity}:{path}. Cooldown: {cooldown_duration:.2f}s. "
                                 f"Retry {attempt + 1}/{retries}. Message: {error_message}"
                             )
-                            await asyncio.sleep(cooldown_duration)
+                            await _retry_sleep(cooldown_duration, "rate_limited")
                             continue
                         else:
                             error_msg = f"Rate limit exceeded after {retries} attempts for {entity}:{path}: {error_message}"
@@ -275,37 +615,40 @@ class SportmonksService:
                             logger.error(error_msg)
                             raise Exception(error_msg)
                 
-                # Handle other HTTP errors (400+)
-                if response.status_code >= 400:
-                    error_text = response.text[:200] if response.text else "Unknown error"
-                    if attempt < retries - 1:
-                        wait_time = (backoff_factor ** attempt)
-                        # Add jitter (random delay between 0-30% of wait_time) to prevent synchronized retries
-                        jitter = random.uniform(0, wait_time * 0.3)
-                        wait_time_with_jitter = wait_time + jitter
-                        logger.warning(
-                            f"HTTP {response.status_code} error for {path}: {error_text}. "
-                            f"Retrying in {wait_time_with_jitter:.2f} seconds (base: {wait_time:.2f}, jitter: {jitter:.2f})..."
-                        )
-                        await asyncio.sleep(wait_time_with_jitter)
-                        continue
-                    else:
-                        raise Exception(f"HTTP {response.status_code} error for {path}: {error_text}")
+                    # Handle other HTTP errors (400+)
+                    if response.status_code >= 400:
+                        error_text = response.text[:200] if response.text else "Unknown error"
+                        if attempt < retries - 1:
+                            wait_time = (backoff_factor ** attempt)
+                            # Add jitter (random delay between 0-30% of wait_time) to prevent synchronized retries
+                            jitter = random.uniform(0, wait_time * 0.3)
+                            wait_time_with_jitter = wait_time + jitter
+                            logger.warning(
+                                f"HTTP {response.status_code} error for {path}: {error_text}. "
+                                f"Retrying in {wait_time_with_jitter:.2f} seconds (base: {wait_time:.2f}, jitter: {jitter:.2f})..."
+                            )
+                            await _retry_sleep(wait_time_with_jitter, f"http_{response.status_code}")
+                            continue
+                        else:
+                            raise Exception(f"HTTP {response.status_code} error for {path}: {error_text}")
                 
                     # Success (200) - parse and return JSON
                     if response.status_code == 200:
                         try:
-                            data = response.json()
+                            data = streamed if streamed is not None else response.json()
                             
                             # Extract rate limit metadata from response body
                             rate_limit_info = data.get("rate_limit", {})
                             remaining = rate_limit_info.get("remaining")
                             limit = rate_limit_info.get("limit")
                             reset_at = rate_limit_info.get("reset_at") or rate_limit_info.get("reset")
+                            resets_in_seconds = rate_limit_info.get("resets_in_seconds")
+                            if reset_at is None and resets_in_seconds is not None:
+                                reset_at = time.time() + float(resets_in_seconds)
                             
                             # Update rate limit state from response body
                             if remaining is not None or limit is not None or reset_at is not None:
-                                self._rate_limit_manager.update_from_response(
+                                await self._rate_limit_manager.update_from_response(
                                     entity=entity,
                                     remaining=remaining,
                                     limit=limit,
@@ -316,52 +659,68 @@ class SportmonksService:
                         except (ValueError, KeyError, TypeError) as e:
                             logger.debug(f"Could not parse rate limit info from response: {e}")
                             # Still update from headers if available
-                            self._rate_limit_manager.update_from_response(
+                            await self._rate_limit_manager.update_from_response(
                                 entity=entity,
                                 headers=dict(response.headers)
                             )
                         
+                        if self._recorder:
+                            await self._recorder.record(
+                                path, query_params, response.status_code, response.headers,
+                                raw_body if raw_body is not None else data
+                            )
+                        
+                        if transform is not None and streamed is None:
+                            raws = data.get("data") or []
+                            data = {
+                                **data,
+                                "data": [item for item in await transform.transform_batch(raws) if item is not None],
+                                "page_count": len(raws)
+                            }
+                        
                         # Cache successful response
                         if use_cache:
-                            cache_ttl = get_cache_ttl(entity)
-                            cache_key_str = cache_key(f"sportmonks:{entity}", path, params)
-                            await set_cached(cache_key_str, data, cache_ttl)
+                            await self._cache_response(entity, path, params, data, variant)
                         
                         # Success - return JSON
                         return data
                 
-                # If we get here, status code is not 200, 429, or >= 400 (shouldn't happen)
-                raise Exception(f"Unexpected status code {response.status_code} for {path}")
+                    # If we get here, status code is not 200, 429, or >= 400 (shouldn't happen)
+                    raise Exception(f"Unexpected status code {response.status_code} for {path}")
                     
-            except httpx.TimeoutException as e:
-                last_exception = e
-                if attempt < retries - 1:
-                    wait_time = (backoff_factor ** attempt) * 2
-                    # Add jitter (random delay between 0-30% of wait_time) to prevent synchronized retries
-                    jitter = random.uniform(0, wait_time * 0.3)
-                    wait_time_with_jitter = wait_time + jitter
-                    logger.warning(f"Request timeout. Retrying in {wait_time_with_jitter:.2f} seconds (base: {wait_time:.2f}, jitter: {jitter:.2f})...")
-                    await asyncio.sleep(wait_time_with_jitter)
-                    continue
-                else:
-                    raise Exception(f"Request timeout after {retries} attempts: {str(e)}")
+                except httpx.TimeoutException as e:
+                    last_exception = e
+                    breaker.record_failure(time.monotonic() - started)
+                    observe_upstream(entity, type(e).__name__, time.monotonic() - started)
+                    if attempt < retries - 1:
+                        wait_time = (backoff_factor ** attempt) * 2
+                        # Add jitter (random delay between 0-30% of wait_time) to prevent synchronized retries
+                        jitter = random.uniform(0, wait_time * 0.3)
+                        wait_time_with_jitter = wait_time + jitter
+                        logger.warning(f"Request timeout. Retrying in {wait_time_with_jitter:.2f} seconds (base: {wait_time:.2f}, jitter: {jitter:.2f})...")
+                        await _retry_sleep(wait_time_with_jitter, "timeout")
+                        continue
+                    else:
+                        raise Exception(f"Request timeout after {retries} attempts: {str(e)}")
                     
-            except httpx.RequestError as e:
-                last_exception = e
-                if attempt < retries - 1:
-                    wait_time = (backoff_factor ** attempt)
-                    logger.warning(f"Request error: {str(e)}. Retrying in {wait_time} seconds...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"Request failed after {retries} attempts: {str(e)}")
+                except httpx.RequestError as e:
+                    last_exception = e
+                    breaker.record_failure(time.monotonic() - started)
+                    observe_upstream(entity, type(e).__name__, time.monotonic() - started)
+                    if attempt < retries - 1:
+                        wait_time = (backoff_factor ** attempt)
+                        logger.warning(f"Request error: {str(e)}. Retrying in {wait_time} seconds...")
+                        await _retry_sleep(wait_time, "request_error")
+                        continue
+                    else:
+                        raise Exception(f"Request failed after {retries} attempts: {str(e)}")
                     
                 except Exception as e:
                     last_exception = e
                     if attempt < retries - 1:
                         wait_time = (backoff_factor ** attempt)
                         logger.warning(f"Unexpected error: {str(e)}. Retrying in {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
+                        await _retry_sleep(wait_time, "error")
                         continue
                     else:
                         raise
@@ -383,16 +742,64 @@ class SportmonksService:
                 result = await task
                 return result
             finally:
-                await self._rate_limit_manager.remove_in_flight_request(request_key)
+                await self._rate_limit_manager.remove_in_flight_request(request_key, task)
         else:
             return await make_request()
 
+    async def _fetch_page(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        priority: int = PRIORITY_INTERACTIVE,
+        transform: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Tuple[List[Any], Dict[str, Any], int]:
+        """
+        Fetch one page of a paginated list endpoint.
+        A BatchTransform with a cache_variant is handed to _get, which transforms items as
+        the page is stream-decoded (when enabled) and caches the transformed page; caching,
+        retries, deduplication and stale fallback are _get's. Any other transform is applied
+        after the raw page is fetched (a BatchTransform gets the whole page in one call, a
+        plain transform is applied per item). Items for which transform returns None are dropped.
+
+        Returns:
+            (items, pagination, page_count) - items are raw or transformed,
+            page_count is the number of raw items on the page
+        """
+        if getattr(transform, "cache_variant", None):
+            page = await self._get(path, params=params, priority=priority, transform=transform)
+            return page.get("data") or [], page.get("pagination") or {}, page.get("page_count", 0)
+
+        transform_batch = getattr(transform, "transform_batch", None)
+        response = await self._get(path, params=params, priority=priority)
+
+        pagination: Dict[str, Any] = {}
+        if isinstance(response, dict):
+            items = response.get("data") or []
+            pagination = response.get("pagination") or {}
+        elif isinstance(response, list):
+            items = response
+        else:
+            logger.warning(f"Unexpected response format: {type(response)}")
+            items = []
+
+        page_count = len(items)
+        if transform_batch is not None:
+            items = [transformed for transformed in await transform_batch(items) if transformed is not None]
+        elif transform is not None:
+            items = [transformed for transformed in map(transform, items) if transformed is not None]
+        return items, pagination, page_count
+
+    def get_hedging_metrics(self) -> Dict[str, Any]:
+        """Get hedged request metrics for observability"""
+        return self._hedger.get_metrics()
+
     async def get_livescores(
         self,
         include: str = "participants;scores;events;league;odds;currentPeriod",
         filters: Optional[str] = None,
         use_inplay: bool = False,
-        league_ids: Optional[List[int]] = None
+        league_ids: Optional[List[int]] = None,
+        priority: int = PRIORITY_INTERACTIVE_LIVE
     ) -> List[Dict[str, Any]]:
         """
         Get live football matches.
@@ -402,6 +809,7 @@ class SportmonksService:
             filters: Optional filters parameter (e.g., "markets:1;bookmakers:1")
             use_inplay: If True, use livescores/inplay endpoint for better accuracy
             league_ids: Optional list of league IDs to filter by (formatted as fixtureLeagues filter)
+            priority: Request priority class for the rate limiter
             
         Returns:
             List of live match data
@@ -426,7 +834,7 @@ class SportmonksService:
             
             # Use inplay endpoint for better accuracy if requested
             endpoint = "livescores/inplay" if use_inplay else "livescores"
-            response = await self._get(endpoint, params=params)
+            response = await self._get(endpoint, params=params, priority=priority)
             
             # Sportmonks V3 returns data in response.data array
             if isinstance(response, dict) and "data" in response:
@@ -445,7 +853,9 @@ class SportmonksService:
         self,
         date: str,
         include: str = "participants;scores;events;league;odds",
-        filters: Optional[str] = None
+        filters: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        transform: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Get fixtures for a specific date using Sportmonks V3 /fixtures/date/{date} endpoint.
@@ -455,6 +865,10 @@ class SportmonksService:
             date: Date in YYYY-MM-DD format
             include: Comma-separated list of relations to include
             filters: Optional filters parameter (e.g., "markets:1;bookmakers:1")
+            priority: Request priority class for the rate limiter
+            transform: Optional per-fixture transform applied to each page
+                (pages are stream-decoded when enabled); the result list then holds
+                transformed items
             
         Returns:
             List of fixture data for the specified date (all pages combined)
@@ -476,31 +890,21 @@ class SportmonksService:
                     params["filters"] = filters
                 
                 # Use Sportmonks V3 fixtures/date/{date} endpoint
-                response = await self._get(f"fixtures/date/{date}", params=params)
+                fixtures_list, pagination, page_count = await self._fetch_page(
+                    f"fixtures/date/{date}", params, priority=priority, transform=transform
+                )
                 
-                # Extract fixtures from response
-                fixtures_list = []
-                if isinstance(response, dict):
-                    if "data" in response:
-                        fixtures_list = response["data"]
-                    # Check pagination info
-                    pagination = response.get("pagination", {})
-                    current_page = pagination.get("current_page", page)
-                    last_page = pagination.get("last_page", 1)
-                    has_more = current_page < last_page
-                elif isinstance(response, list):
-                    fixtures_list = response
-                    # If response is a list, assume it's the last page
-                    has_more = len(fixtures_list) >= per_page
-                else:
-                    has_more = False
+                # Check pagination info
+                current_page = pagination.get("current_page", page)
+                last_page = pagination.get("last_page", 1)
+                has_more = current_page < last_page if pagination else page_count >= per_page
                 
                 if fixtures_list:
                     all_fixtures.extend(fixtures_list)
                     logger.debug(f"Fetched {len(fixtures_list)} fixtures from page {page} for date {date}. Total: {len(all_fixtures)}")
                 
                 # If we got fewer results than per_page, we're done
-                if len(fixtures_list) < per_page:
+                if page_count < per_page:
                     has_more = False
                 
                 page += 1
@@ -525,7 +929,9 @@ class SportmonksService:
         date_from: str,
         date_to: str,
         include: str = "participants;scores;events;league;odds",
-        filters: Optional[str] = None
+        filters: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        transform: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Get fixtures for a date range using Sportmonks V3 /fixtures/between/{start}/{end} endpoint.
@@ -538,6 +944,10 @@ class SportmonksService:
             date_to: End date in YYYY-MM-DD format
             include: Comma-separated list of relations to include
             filters: Optional filters parameter (e.g., "markets:1;bookmakers:1")
+            priority: Request priority class for the rate limiter
+            transform: Optional per-fixture transform applied to each page
+                (pages are stream-decoded when enabled); the result list then holds
+                transformed items
             
         Returns:
             List of fixture data for the date range (all pages combined)
@@ -559,32 +969,21 @@ class SportmonksService:
                     params["filters"] = filters
                 
                 # Use Sportmonks V3 fixtures/between/{start}/{end} endpoint
-                response = await self._get(f"fixtures/between/{date_from}/{date_to}", params=params)
+                fixtures_list, pagination, page_count = await self._fetch_page(
+                    f"fixtures/between/{date_from}/{date_to}", params, priority=priority, transform=transform
+                )
                 
-                # Extract fixtures from response
-                fixtures_list = []
-                if isinstance(response, dict):
-                    if "data" in response:
-                        fixtures_list = response["data"]
-                    # Check pagination info
-                    pagination = response.get("pagination", {})
-                    current_page = pagination.get("current_page", page)
-                    last_page = pagination.get("last_page", 1)
-                    has_more = current_page < last_page
-                elif isinstance(response, list):
-                    fixtures_list = response
-                    # If response is a list, assume it's the last page
-                    has_more = len(fixtures_list) >= per_page
-                else:
-                    logger.warning(f"Unexpected response format: {type(response)}")
-                    has_more = False
+                # Check pagination info
+                current_page = pagination.get("current_page", page)
+                last_page = pagination.get("last_page", 1)
+                has_more = current_page < last_page if pagination else page_count >= per_page
                 
                 if fixtures_list:
                     all_fixtures.extend(fixtures_list)
                     logger.debug(f"Fetched {len(fixtures_list)} fixtures from page {page}. Total: {len(all_fixtures)}")
                 
                 # If we got fewer results than per_page, we're done
-                if len(fixtures_list) < per_page:
+                if page_count < per_page:
                     has_more = False
                 
                 page += 1
@@ -611,7 +1010,9 @@ class SportmonksService:
         date_to: Optional[str] = None,
         league_id: Optional[int] = None,
         include: str = "participants;scores;events;league;odds",
-        filters: Optional[str] = None
+        filters: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        transform: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Get fixtures (matches) for a date range or specific league.
@@ -624,6 +1025,10 @@ class SportmonksService:
             league_id: Optional league ID to filter by
             include: Comma-separated list of relations to include
             filters: Optional filters parameter (e.g., "markets:1;bookmakers:1")
+            priority: Request priority class for the rate limiter
+            transform: Optional per-fixture transform applied to each page
+                (pages are stream-decoded when enabled); the result list then holds
+                transformed items, and league_id filtering uses their `league_id` key
             
         Returns:
             List of fixture data
@@ -640,7 +1045,7 @@ class SportmonksService:
                 # Use fixtures/between for ranges <= 100 days (Sportmonks limit)
                 if days_diff <= 100:
                     fixtures_list = await self.get_fixtures_between(
-                        date_from, date_to, include=include, filters=filters
+                        date_from, date_to, include=include, filters=filters, priority=priority, transform=transform
                     )
                     
                     # Fallback: If get_fixtures_between returns empty or suspiciously low count,
@@ -660,7 +1065,9 @@ class SportmonksService:
                             day_fixtures = await self.get_fixtures_by_date(
                                 current_date.strftime("%Y-%m-%d"), 
                                 include=include, 
-                                filters=filters
+                                filters=filters,
+                                priority=priority,
+                                transform=transform
                             )
                             if day_fixtures:
                                 all_fixtures.extend(day_fixtures)
@@ -688,7 +1095,9 @@ class SportmonksService:
                             current_start.strftime("%Y-%m-%d"),
                             current_end.strftime("%Y-%m-%d"),
                             include=include,
-                            filters=filters
+                            filters=filters,
+                            priority=priority,
+                            transform=transform
                         )
                         all_fixtures.extend(chunk_fixtures)
                         current_start = current_end + timedelta(days=1)
@@ -700,21 +1109,18 @@ class SportmonksService:
                     fixtures_list = all_fixtures
             elif date_from:
                 # Single date
-                fixtures_list = await self.get_fixtures_by_date(date_from, include=include, filters=filters)
+                fixtures_list = await self.get_fixtures_by_date(date_from, include=include, filters=filters, priority=priority, transform=transform)
             else:
                 # No date specified, use today + 7 days
                 today = datetime.now().strftime("%Y-%m-%d")
-                fixtures_list = await self.get_fixtures_by_date(today, include=include, filters=filters)
+                fixtures_list = await self.get_fixtures_by_date(today, include=include, filters=filters, priority=priority, transform=transform)
             
-            # Filter by league_id if specified
+            # Filter by league_id if specified (transformed items carry a flat league_id)
             if league_id and fixtures_list:
-                fixtures_list = [
-                    f for f in fixtures_list
-                    if f.get("league_id") == league_id or 
-                    (isinstance(f.get("league"), dict) and f.get("league", {}).get("id") == league_id) or
-                    (isinstance(f.get("league"), dict) and "data" in f.get("league", {}) and 
-                     f.get("league", {}).get("data", {}).get("id") == league_id)
-                ]
+                if transform is not None:
+                    fixtures_list = [m for m in fixtures_list if m.get("league_id") == league_id]
+                else:
+                    fixtures_list = [f for f in fixtures_list if self._fixture_in_league(f, league_id)]
             
             return fixtures_list
                 
@@ -722,7 +1128,17 @@ class SportmonksService:
             logger.error(f"Error fetching fixtures: {e}")
             return []
 
-    async def get_latest_odds_inplay(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _fixture_in_league(f: Dict[str, Any], league_id: int) -> bool:
+        """Check a raw fixture's league (league_id, league.id or league.data.id)"""
+        return (
+            f.get("league_id") == league_id or 
+            (isinstance(f.get("league"), dict) and f.get("league", {}).get("id") == league_id) or
+            (isinstance(f.get("league"), dict) and "data" in f.get("league", {}) and 
+             f.get("league", {}).get("data", {}).get("id") == league_id)
+        )
+
+    async def get_latest_odds_inplay(self, priority: int = PRIORITY_BACKGROUND) -> List[Dict[str, Any]]:
         """
         Get latest in-play odds updates (last 10 seconds).
         Returns odds that have changed in the last 10 seconds for in-play matches.
@@ -732,7 +1148,7 @@ class SportmonksService:
             List of odds data with fixture_id and odds information
         """
         try:
-            response = await self._get("odds/inplay/latest")
+            response = await self._get("odds/inplay/latest", priority=priority)
             
             # Sportmonks V3 returns data in response.data array
             if isinstance(response, dict) and "data" in response:
@@ -746,7 +1162,7 @@ class SportmonksService:
             logger.error(f"Error fetching latest in-play odds: {e}")
             return []
     
-    async def get_last_updated_odds(self) -> List[Dict[str, Any]]:
+    async def get_last_updated_odds(self, priority: int = PRIORITY_BACKGROUND) -> List[Dict[str, Any]]:
         """
         Get last updated in-play odds (delta updates).
         Returns only fixtures with odds changes in the last 10 seconds.
@@ -756,9 +1172,9 @@ class SportmonksService:
             List of odds data with fixture_id and updated odds information
         """
         # Alias for get_latest_odds_inplay - same endpoint
-        return await self.get_latest_odds_inplay()
+        return await self.get_latest_odds_inplay(priority=priority)
     
-    async def get_latest_odds_prematch(self) -> List[Dict[str, Any]]:
+    async def get_latest_odds_prematch(self, priority: int = PRIORITY_BACKGROUND) -> List[Dict[str, Any]]:
         """
         Get latest pre-match odds updates (last 10 seconds).
         Returns odds that have changed in the last 10 seconds for pre-match matches.
@@ -767,7 +1183,7 @@ class SportmonksService:
             List of odds data with fixture_id and odds information
         """
         try:
-            response = await self._get("odds/pre-match/latest")
+            response = await self._get("odds/pre-match/latest", priority=priority)
             
             # Sportmonks V3 returns data in response.data array
             if isinstance(response, dict) and "data" in response:
@@ -784,7 +1200,8 @@ class SportmonksService:
     async def get_inplay_odds_by_fixture(
         self,
         fixture_id: int,
-        bookmaker_id: int = 2
+        bookmaker_id: int = 2,
+        priority: int = PRIORITY_INTERACTIVE_LIVE
     ) -> List[Dict[str, Any]]:
         """
         Get in-play odds for a specific fixture from a specific bookmaker.
@@ -793,13 +1210,14 @@ class SportmonksService:
         Args:
             fixture_id: Sportmonks fixture ID
             bookmaker_id: Bookmaker ID (default: 2 for Bet365)
+            priority: Request priority class for the rate limiter
             
         Returns:
             List of odds data for all markets from the specified bookmaker
         """
         try:
             endpoint = f"odds/inplay/fixtures/{fixture_id}/bookmakers/{bookmaker_id}"
-            response = await self._get(endpoint)
+            response = await self._get(endpoint, priority=priority)
             
             # Sportmonks V3 returns data in response.data array
             if isinstance(response, dict) and "data" in response:
@@ -817,7 +1235,8 @@ class SportmonksService:
         self,
         fixture_id: int,
         include: str = "participants;scores;statistics;lineups;events;odds;venue;season",
-        filters: Optional[str] = None
+        filters: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> Optional[Dict[str, Any]]:
         """
         Get detailed fixture information.
@@ -826,6 +1245,7 @@ class SportmonksService:
             fixture_id: Sportmonks fixture ID
             include: Comma-separated list of relations to include
             filters: Optional filters parameter (e.g., "markets:1;bookmakers:1")
+            priority: Request priority class for the rate limiter
             
         Returns:
             Fixture data dictionary or None if not found
@@ -836,7 +1256,7 @@ class SportmonksService:
                 params["include"] = include
             if filters:
                 params["filters"] = filters
-            response = await self._get(f"fixtures/{fixture_id}", params=params)
+            response = await self._get(f"fixtures/{fixture_id}", params=params, priority=priority)
             
             # Sportmonks V3 returns data in response.data object
             if isinstance(response, dict):
@@ -900,7 +1320,7 @@ class SportmonksService:
         
         # Fetch from API
         try:
-            response = await self._get(endpoint, params=params or {})
+            response = await self._get(endpoint, params=params or {}, priority=PRIORITY_WARMUP)
             
             # Extract data from response
             entities_list = []
@@ -920,7 +1340,8 @@ class SportmonksService:
     
     async def get_leagues(
         self,
-        include: str = "country;currentSeason"
+        include: str = "country;currentSeason",
+        priority: int = PRIORITY_BACKGROUND
     ) -> List[Dict[str, Any]]:
         """
         Get all available leagues from Sportmonks V3.
@@ -928,6 +1349,7 @@ class SportmonksService:
         
         Args:
             include: Comma-separated list of relations to include
+            priority: Request priority class for the rate limiter (pagination is background work)
             
         Returns:
             List of league data (all pages combined)
@@ -946,7 +1368,7 @@ class SportmonksService:
                 if include:
                     params["include"] = include
                 
-                response = await self._get("leagues", params=params)
+                response = await self._get("leagues", params=params, priority=priority)
                 
                 # Extract leagues from response
                 leagues_list = []
@@ -1350,6 +1772,8 @@ class SportmonksService:
             "away_score": away_score
         }
 
+    @traced("odds.normalize")
+    @timed_stage(STAGE_ODDS_NORMALIZE)
     def _extract_and_normalize_odds(self, odds_data: Any, bookmaker_id_filter: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Extract and normalize odds from Sportmonks V3 format.
@@ -1365,26 +1789,31 @@ class SportmonksService:
             Normalized list of odds objects with flattened structure
         """
         if not odds_data:
-            logger.info("_extract_and_normalize_odds: No odds_data provided")
+            hot_log.debug("odds.normalize.empty", "_extract_and_normalize_odds: No odds_data provided")
             return []
         
         # Handle nested format: odds.data
         if isinstance(odds_data, dict):
             if "data" in odds_data:
                 odds_data = odds_data["data"]
-                logger.info(f"_extract_and_normalize_odds: Extracted odds_data from dict, type: {type(odds_data)}, length: {len(odds_data) if isinstance(odds_data, list) else 'not a list'}")
+                hot_log.debug(
+                    "odds.normalize.input", "_extract_and_normalize_odds: Extracted odds_data from dict, type: %s",
+                    type(odds_data).__name__
+                )
             else:
                 # If it's a dict but no "data" key, try to extract odds from it
-                logger.info("_extract_and_normalize_odds: Dict with no 'data' key, returning empty list")
+                hot_log.debug("odds.normalize.empty", "_extract_and_normalize_odds: Dict with no 'data' key, returning empty list")
                 return []
         
         if not isinstance(odds_data, list):
-            logger.info(f"_extract_and_normalize_odds: odds_data is not a list, type: {type(odds_data)}")
+            hot_log.info("odds.normalize.unexpected", "_extract_and_normalize_odds: odds_data is not a list, type: %s", type(odds_data).__name__)
             return []
         
-        logger.info(f"_extract_and_normalize_odds: Processing {len(odds_data)} odds items")
         normalized_odds = []
         
+        # Debug detail (sample odds, Match Winner / Cards dumps) only for sampled calls
+        debug_sampled = hot_log.sampled()
+        
         # Track if we've logged sample odds (to avoid spam)
         logged_sample = False
         
@@ -1451,7 +1880,7 @@ class SportmonksService:
                 
                 # Track Match Winner market specifically for debugging
                 market_name_lower = (market_name or "").lower()
-                if "match winner" in market_name_lower or odd_item.get("market_id") == 1:
+                if debug_sampled and ("match winner" in market_name_lower or odd_item.get("market_id") == 1):
                     match_winner_odds.append({
                         "raw": odd_item,
                         "normalized": {
@@ -1465,18 +1894,9 @@ class SportmonksService:
                     })
                 
                 # Track Cards market specifically for debugging
-                # Check for various card-related keywords and market IDs
-                # Sportmonks card market IDs might be: 83 (Total Cards), 84 (Team Total Cards), etc.
+                # (card-related keywords and market IDs, see services/market_classification.py)
                 market_id_val = odd_item.get("market_id")
-                is_card_market = (
-                    "card" in market_name_lower or 
-                    "kart" in market_name_lower or 
-                    "booking" in market_name_lower or
-                    "yellow" in market_name_lower or
-                    "red" in market_name_lower or
-                    market_id_val in [83, 84, 85, 86, 87, 88]  # Possible card market IDs
-                )
-                if is_card_market:
+                if debug_sampled and self._market_classifier.is_cards_market(market_id_val, market_name):
                     cards_odds.append({
                         "raw": odd_item,
                         "normalized": {
@@ -1490,10 +1910,15 @@ class SportmonksService:
                     })
                 
                 # Log first few odds for debugging (to verify bookmaker info)
-                if not logged_sample and len(normalized_odds) < 5:
+                if debug_sampled and not logged_sample and len(normalized_odds) < 5:
                     # Also log raw bookmaker data for debugging
                     raw_bookmaker = odd_item.get("bookmaker")
-                    logger.info(f"Sample normalized odd (normalized format) #{len(normalized_odds)+1}: Bookmaker ID={bookmaker_id}, Bookmaker Name={bookmaker_name}, Market ID={odd_item.get('market_id')}, Market Name={market_name}, Label={odd_item.get('label') or odd_item.get('name') or ''}, Value={value_odd_float}, Raw Bookmaker={type(raw_bookmaker).__name__}")
+                    logger.debug(
+                        "Sample normalized odd (normalized format) #%d: Bookmaker ID=%s, Bookmaker Name=%s, Market ID=%s, "
+                        "Market Name=%s, Label=%s, Value=%s, Raw Bookmaker=%s",
+                        len(normalized_odds) + 1, bookmaker_id, bookmaker_name, odd_item.get('market_id'), market_name,
+                        odd_item.get('label') or odd_item.get('name') or '', value_odd_float, type(raw_bookmaker).__name__
+                    )
                     if len(normalized_odds) >= 4:
                         logged_sample = True
                 
@@ -1532,7 +1957,7 @@ class SportmonksService:
                     "latest_bookmaker_update": timestamp,  # For timestamp guard
                 }
                 
-                normalized_odds.append(normalized_odd)
+                normalized_odds.append(OddRecord(normalized_odd))
                 continue
             
             # Nested format: extract bookmaker, market, values
@@ -1641,7 +2066,7 @@ class SportmonksService:
                 
                 # Track Match Winner market specifically for debugging
                 market_name_lower = (market_name or "").lower()
-                if "match winner" in market_name_lower or market_id_val == 1:
+                if debug_sampled and ("match winner" in market_name_lower or market_id_val == 1):
                     match_winner_odds.append({
                         "raw": {
                             "odd_item": odd_item,
@@ -1660,16 +2085,8 @@ class SportmonksService:
                     })
                 
                 # Track Cards market specifically for debugging
-                # Check for various card-related keywords and market IDs
-                is_card_market = (
-                    "card" in market_name_lower or 
-                    "kart" in market_name_lower or 
-                    "booking" in market_name_lower or
-                    "yellow" in market_name_lower or
-                    "red" in market_name_lower or
-                    market_id_val in [83, 84, 85, 86, 87, 88]  # Possible card market IDs
-                )
-                if is_card_market:
+                # (card-related keywords and market IDs, see services/market_classification.py)
+                if debug_sampled and self._market_classifier.is_cards_market(market_id_val, market_name):
                     cards_odds.append({
                         "raw": {
                             "odd_item": odd_item,
@@ -1688,8 +2105,13 @@ class SportmonksService:
                     })
                 
                 # Log first few odds for debugging (to verify bookmaker info)
-                if not logged_sample and len(normalized_odds) < 5:
-                    logger.info(f"Sample normalized odd (nested format) #{len(normalized_odds)+1}: Bookmaker ID={bookmaker_id}, Bookmaker Name={bookmaker_name}, Market ID={market.get('id') if isinstance(market, dict) else odd_item.get('market_id')}, Market Name={market_name}, Label={final_label}, Value={value_odd_float}")
+                if debug_sampled and not logged_sample and len(normalized_odds) < 5:
+                    logger.debug(
+                        "Sample normalized odd (nested format) #%d: Bookmaker ID=%s, Bookmaker Name=%s, Market ID=%s, "
+                        "Market Name=%s, Label=%s, Value=%s",
+                        len(normalized_odds) + 1, bookmaker_id, bookmaker_name, market_id_val, market_name,
+                        final_label, value_odd_float
+                    )
                     if len(normalized_odds) >= 4:
                         logged_sample = True
                 
@@ -1732,35 +2154,69 @@ class SportmonksService:
                     "player_name": player_name,
                 }
                 
-                normalized_odds.append(normalized_odd)
+                normalized_odds.append(OddRecord(normalized_odd))
         
-        # Log Match Winner odds specifically for debugging
+        # Log Match Winner odds specifically for debugging (sampled calls only, lists are empty otherwise)
         if match_winner_odds:
-            logger.info(f"=== MATCH WINNER ODDS DEBUG ({len(match_winner_odds)} items) ===")
+            logger.debug("=== MATCH WINNER ODDS DEBUG (%d items) ===", len(match_winner_odds))
             for i, mw_odd in enumerate(match_winner_odds, 1):
                 norm = mw_odd.get("normalized", {})
-                logger.info(f"Match Winner #{i}: Label='{norm.get('label')}', Value={norm.get('value')}, Bookmaker ID={norm.get('bookmaker_id')}, Bookmaker Name='{norm.get('bookmaker_name')}', Market ID={norm.get('market_id')}, Market Name='{norm.get('market_name')}'")
+                logger.debug(
+                    "Match Winner #%d: Label='%s', Value=%s, Bookmaker ID=%s, Bookmaker Name='%s', Market ID=%s, Market Name='%s'",
+                    i, norm.get('label'), norm.get('value'), norm.get('bookmaker_id'), norm.get('bookmaker_name'),
+                    norm.get('market_id'), norm.get('market_name')
+                )
                 # Log raw data for first item to see structure
                 if i == 1:
-                    raw = mw_odd.get("raw", {})
-                    logger.info(f"  Raw data sample (first item): {str(raw)[:500]}")  # Limit to 500 chars
-            logger.info("=== END MATCH WINNER ODDS DEBUG ===")
+                    logger.debug("  Raw data sample (first item): %.500s", mw_odd.get("raw", {}))  # Limit to 500 chars
+            logger.debug("=== END MATCH WINNER ODDS DEBUG ===")
         
         # Log Cards odds specifically for debugging
         if cards_odds:
-            logger.info(f"=== CARDS MARKET DEBUG ({len(cards_odds)} items) ===")
+            logger.debug("=== CARDS MARKET DEBUG (%d items) ===", len(cards_odds))
             for i, card_odd in enumerate(cards_odds, 1):
                 norm = card_odd.get("normalized", {})
-                logger.info(f"Cards Market #{i}: Market Name='{norm.get('market_name')}', Label='{norm.get('label')}', Value={norm.get('value')}, Bookmaker ID={norm.get('bookmaker_id')}, Bookmaker Name='{norm.get('bookmaker_name')}', Market ID={norm.get('market_id')}")
+                logger.debug(
+                    "Cards Market #%d: Market Name='%s', Label='%s', Value=%s, Bookmaker ID=%s, Bookmaker Name='%s', Market ID=%s",
+                    i, norm.get('market_name'), norm.get('label'), norm.get('value'), norm.get('bookmaker_id'),
+                    norm.get('bookmaker_name'), norm.get('market_id')
+                )
                 # Log raw data for first item to see structure
                 if i == 1:
-                    raw = card_odd.get("raw", {})
-                    logger.info(f"  Raw data sample (first item): {str(raw)[:500]}")  # Limit to 500 chars
-            logger.info("=== END CARDS MARKET DEBUG ===")
+                    logger.debug("  Raw data sample (first item): %.500s", card_odd.get("raw", {}))  # Limit to 500 chars
+            logger.debug("=== END CARDS MARKET DEBUG ===")
         
-        logger.info(f"_extract_and_normalize_odds: Returning {len(normalized_odds)} normalized odds")
+        hot_log.info(
+            "odds.normalize", "_extract_and_normalize_odds: %d odds items -> %d normalized",
+            len(odds_data), len(normalized_odds)
+        )
         return normalized_odds
 
+    def _normalize_odds_columnar(
+        self,
+        odds_data: Any = None,
+        bookmaker_id_filter: Optional[int] = None,
+        columns: Optional[OddsColumns] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Columnar equivalent of _extract_and_normalize_odds.
+        Pass `columns` (OddsColumns.from_raw) to normalize the same raw odds for several
+        bookmaker filters while parsing them only once. For a single filtered pass the
+        per-item normalizer is faster (it skips other bookmakers' rows early).
+        
+        Args:
+            odds_data: Raw odds data from Sportmonks V3 (ignored if columns is given)
+            bookmaker_id_filter: Optional bookmaker ID to filter by
+            columns: Pre-parsed odds columns
+            
+        Returns:
+            Normalized list of odds objects (same shape as _extract_and_normalize_odds)
+        """
+        if columns is None:
+            columns = OddsColumns.from_raw(odds_data)
+        supported_market_ids = BET365_SUPPORTED_MARKET_IDS if bookmaker_id_filter == 2 else None
+        return columns.to_records(columns.select(bookmaker_id_filter, supported_market_ids=supported_market_ids))
+
     def _build_selection_key(self, odd: Dict[str, Any]) -> str:
         """
         Build unique key for selection: market_id + label + line + participant_id
@@ -1782,7 +2238,8 @@ class SportmonksService:
         self,
         normalized_odds: List[Dict[str, Any]], 
         previous_snapshot: Optional[Dict[str, Any]] = None,
-        match_status: str = "LIVE"
+        match_status: str = "LIVE",
+        diff_state: Optional[FixtureDiffState] = None
     ) -> List[Dict[str, Any]]:
         """
         Filter odds by snapshot diff - hide odds that disappeared from snapshot.
@@ -1797,15 +2254,15 @@ class SportmonksService:
             normalized_odds: Current normalized odds list
             previous_snapshot: Previous snapshot from Firebase (contains odds list)
             match_status: Match status (LIVE, HT, FT)
+            diff_state: In-memory snapshot keys kept by the odds worker; used instead of
+                previous_snapshot (no key set rebuild)
             
         Returns:
             Filtered odds list
         """
-        if not previous_snapshot:
+        if not previous_snapshot and diff_state is None:
             return normalized_odds
         
-        from datetime import datetime, timezone
-        
         # Determine grace period based on match status
         status_upper = (match_status or "").upper()
         if status_upper == "HT":
@@ -1816,14 +2273,17 @@ class SportmonksService:
             grace_period_seconds = 20
         
         # Build selection key map from previous snapshot
-        previous_keys = set()
-        previous_odds = previous_snapshot.get("odds", [])
-        if isinstance(previous_odds, list):
-            for prev_odd in previous_odds:
-                if isinstance(prev_odd, dict):
-                    key = self._build_selection_key(prev_odd)
-                    if key:
-                        previous_keys.add(key)
+        if diff_state is not None:
+            previous_keys = diff_state.keys
+        else:
+            previous_keys = set()
+            previous_odds = previous_snapshot.get("odds", [])
+            if isinstance(previous_odds, list):
+                for prev_odd in previous_odds:
+                    if isinstance(prev_odd, Mapping):
+                        key = self._build_selection_key(prev_odd)
+                        if key:
+                            previous_keys.add(key)
         
         # Filter current odds - only keep if:
         # 1. Was in previous snapshot, OR
@@ -1832,7 +2292,7 @@ class SportmonksService:
         now = datetime.now(timezone.utc)
         
         for odd in normalized_odds:
-            if not isinstance(odd, dict):
+            if not isinstance(odd, Mapping):
                 continue
             
             key = self._build_selection_key(odd)
@@ -1845,22 +2305,14 @@ class SportmonksService:
             # If not in previous, check if it has recent update
             timestamp_str = odd.get("latest_bookmaker_update")
             if timestamp_str:
-                try:
-                    if isinstance(timestamp_str, str):
-                        # Parse timestamp (could be ISO format or other)
-                        if 'T' in timestamp_str or ' ' in timestamp_str:
-                            # Try ISO format
-                            update_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        else:
-                            # Try other formats
-                            update_time = datetime.fromisoformat(timestamp_str)
-                        time_diff = (now - update_time).total_seconds()
-                        if time_diff <= grace_period_seconds:
-                            filtered_odds.append(odd)
-                except Exception as e:
-                    logger.debug(f"Error parsing timestamp for snapshot diff: {e}")
-                    # If timestamp parsing fails, include the odd (safer)
-                    filtered_odds.append(odd)
+                if isinstance(timestamp_str, str):
+                    # Parsed once per distinct timestamp (many selections share one)
+                    update_time = _parse_update_time(timestamp_str)
+                    if update_time is None or update_time.tzinfo is None:
+                        # Unparseable or naive timestamp - include the odd (safer)
+                        filtered_odds.append(odd)
+                    elif (now - update_time).total_seconds() <= grace_period_seconds:
+                        filtered_odds.append(odd)
             else:
                 # No timestamp - include it (safer)
                 filtered_odds.append(odd)
@@ -1900,9 +2352,12 @@ class SportmonksService:
         
         # Market bazında grupla
         market_groups = {}
+        # Over/under and home/away come from the precompiled classification table
+        table_get = self._market_classifier.table.get
+        classify = self._market_classifier.classify
         
         for odd in odds:
-            if not isinstance(odd, dict):
+            if not isinstance(odd, Mapping):
                 continue
             
             market_id = odd.get("market_id")
@@ -1928,9 +2383,10 @@ class SportmonksService:
                         }
                     
                     # Determine direction (Over/Under)
-                    if "over" in label or "üst" in label or "over" in market_name.lower():
+                    direction = (table_get(label, NO_ENTRIES).get(market_name) or classify(market_name, label))[0]
+                    if direction == OVER:
                         market_groups[key]["selections"]["over"] = odd
-                    elif "under" in label or "alt" in label or "under" in market_name.lower():
+                    elif direction == UNDER:
                         market_groups[key]["selections"]["under"] = odd
                 except (ValueError, TypeError):
                     pass
@@ -1963,10 +2419,11 @@ class SportmonksService:
                         elif away_team_id and participant_id == away_team_id:
                             market_groups[key]["selections"]["away"] = odd
                     else:
-                        # Try to infer from label
-                        if "home" in label or "1" in label:
+                        # Infer from label
+                        side = (table_get(label, NO_ENTRIES).get(market_name) or classify(market_name, label))[1]
+                        if side == HOME:
                             market_groups[key]["selections"]["home"] = odd
-                        elif "away" in label or "2" in label:
+                        elif side == AWAY:
                             market_groups[key]["selections"]["away"] = odd
                 except (ValueError, TypeError):
                     pass
@@ -1980,7 +2437,7 @@ class SportmonksService:
                 for selection in group.get("selections", {}).values()
             )
             if has_selections:
-                grouped_odds.append(group)
+                grouped_odds.append(OddGroupRecord(group))
         
         return grouped_odds
 
@@ -2329,6 +2786,62 @@ class SportmonksService:
             "is_postponed": is_postponed
         }
 
+    def _transform_livescore_to_match_cached(self, livescore: Dict[str, Any]) -> Dict[str, Any]:
+        """Memoized _transform_livescore_to_match: unchanged livescores reuse the previous result (read-only)"""
+        return self._transform_memo.get_or_transform("livescore", livescore, self._transform_livescore_to_match)
+
+    def _transform_fixture_to_match_cached(self, fixture: Dict[str, Any], timezone_offset: int = 0) -> Dict[str, Any]:
+        """Memoized _transform_fixture_to_match: unchanged fixtures reuse the previous result (read-only)"""
+        return self._transform_memo.get_or_transform(
+            "fixture",
+            fixture,
+            lambda raw: self._transform_fixture_to_match(raw, timezone_offset=timezone_offset),
+            variant=(timezone_offset,)
+        )
+
+    async def transform_fixtures(self, fixtures: List[Dict[str, Any]], timezone_offset: int = 0) -> List[Any]:
+        """
+        Memoized _transform_fixture_to_match for a batch. Memo misses are transformed in the
+        transform pool when there are at least TRANSFORM_POOL_MIN_BATCH of them, inline otherwise.
+        """
+        async def transform_misses(raws: List[Dict[str, Any]]) -> List[Any]:
+            pool = get_transform_pool()
+            if pool is not None and pool.should_offload(len(raws)):
+                try:
+                    # Workers run uninstrumented; the pooled batch is the transform stage here
+                    with stage_timer(STAGE_TRANSFORM), span("transform.pool", fixtures=len(raws)):
+                        return await pool.transform_fixtures(raws, timezone_offset=timezone_offset)
+                except Exception as e:
+                    logger.warning(f"Transform pool failed for {len(raws)} fixtures, transforming inline: {e}")
+            return [self._transform_fixture_to_match(raw, timezone_offset=timezone_offset) for raw in raws]
+
+        return await self._transform_memo.get_or_transform_batch(
+            "fixture", fixtures, transform_misses, variant=(timezone_offset,)
+        )
+
+    def fixture_transform(self, timezone_offset: int = 0) -> BatchTransform:
+        """
+        Transform for get_fixtures(transform=...): memoized per item, pages go through
+        transform_fixtures; the transformed pages are cached per timezone offset
+        """
+        return BatchTransform(
+            lambda fixture: self._transform_fixture_to_match_cached(fixture, timezone_offset=timezone_offset),
+            lambda fixtures: self.transform_fixtures(fixtures, timezone_offset=timezone_offset),
+            cache_variant=f"match:tz{timezone_offset}",
+            restore=match_from_json
+        )
+
+    def get_transform_pool_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get transform pool metrics for observability (None when disabled)"""
+        pool = get_transform_pool()
+        return pool.get_metrics() if pool else None
+
+    def get_transform_memo_metrics(self) -> Dict[str, Any]:
+        """Get transform memoization metrics for observability"""
+        return self._transform_memo.get_metrics()
+
+    @traced("transform.livescore")
+    @timed_stage(STAGE_TRANSFORM)
     def _transform_livescore_to_match(self, livescore: Dict[str, Any]) -> Dict[str, Any]:
         """
         Transform Sportmonks V3 livescore to frontend match format.
@@ -2663,8 +3176,10 @@ class SportmonksService:
             "state_id": state_id,  # Store state_id for debugging and filtering
         }
         
-        return transformed
+        return MatchRecord(transformed)
 
+    @traced("transform.fixture")
+    @timed_stage(STAGE_TRANSFORM)
     def _transform_fixture_to_match(self, fixture: Dict[str, Any], timezone_offset: int = 0) -> Dict[str, Any]:
         """
         Transform Sportmonks V3 fixture to frontend match format.
@@ -3303,7 +3818,7 @@ class SportmonksService:
             "state_id": state_id,  # Keep state_id for reference
         }
         
-        return transformed
+        return MatchRecord(transformed)
 
     async def close(self):
         """Close the HTTP client and cleanup resources."""
@@ -0,0 +1,150 @@
+"""
+Request-scoped tracing (OpenTelemetry)
+Spans for SportMonks attempts, rate limit waits and retry sleeps, cache get/set,
+Firestore calls and transforms, nested under one server span per request. The trace
+id is returned in the X-Trace-Id response header, so a slow response can be looked up
+in the exported spans. Exports to stdout, a JSON-lines file or OTLP.
+Optional: requires opentelemetry-sdk and TRACING_ENABLED=true; otherwise every helper
+is a no-op.
+"""
+import os
+import functools
+import logging
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+try:
+    from opentelemetry import trace, propagate
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+from services.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+# console (stdout), file (JSON lines in TRACING_FILE) or otlp (needs opentelemetry-exporter-otlp)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "file").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+# Fraction of requests traced (child spans follow their request's decision)
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACE_ID_HEADER = "x-trace-id"
+
+_NOOP = nullcontext()
+_tracer = None
+
+
+def _build_exporter():
+    if TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    out = open(TRACING_FILE, "a", encoding="utf-8")
+    return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+
+def _init_tracer():
+    """Install the tracer provider once; None if tracing is off or unavailable"""
+    global _tracer
+    if not TRACING_ENABLED:
+        return None
+    if not OTEL_AVAILABLE:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed; tracing disabled")
+        return None
+    try:
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": "kibris-backend"}),
+            sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATE)),
+        )
+        # Batched export runs in a background thread, off the request path
+        provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+        trace.set_tracer_provider(provider)
+        _tracer = trace.get_tracer("kibris")
+        logger.info(f"Tracing enabled ({TRACING_EXPORTER}, sample rate {TRACING_SAMPLE_RATE})")
+    except Exception as e:
+        logger.error(f"Could not initialize tracing: {e}")
+        _tracer = None
+    return _tracer
+
+
+_init_tracer()
+
+
+def span(name: str, **attributes: Any):
+    """Context manager for a child span of the current request (no-op when tracing is off)"""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes={k: v for k, v in attributes.items() if v is not None})
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span"""
+    if _tracer is None:
+        return
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attributes({k: v for k, v in attributes.items() if v is not None})
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a (sync) function in a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    """Hex trace id of the current span, None outside a sampled trace"""
+    if _tracer is None:
+        return None
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+
+class TracingMiddleware:
+    """ASGI middleware: one server span per request (continues an incoming traceparent), X-Trace-Id header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        carrier: Dict[str, str] = {
+            key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])
+        }
+        route = route_template(scope)
+        with _tracer.start_as_current_span(
+            f"{scope['method']} {route}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.route": route, "http.target": scope.get("path", "")},
+        ) as server_span:
+            context = server_span.get_span_context()
+            trace_id = format(context.trace_id, "032x").encode() if context.is_valid else None
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        server_span.set_status(Status(StatusCode.ERROR))
+                    if trace_id and context.trace_flags.sampled:
+                        message["headers"] = list(message.get("headers", [])) + [(TRACE_ID_HEADER.encode(), trace_id)]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
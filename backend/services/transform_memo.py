@@ -0,0 +1,198 @@
+"""
+Memoization for fixture/livescore -> match transforms
+Keeps an LRU of transformed matches keyed by (kind, fixture id, variant). An entry is
+reused only while the raw fixture's content fingerprint is unchanged, so polls that
+return mostly unchanged fixtures only re-transform the fixtures that changed.
+The fingerprint has to be much cheaper than the transform: top-level scalars
+(state_id, last_update, starting_at, ...), a hash of the small sub-objects the
+transforms read, and per-odd price/availability fields instead of serializing
+the whole odds include.
+"""
+import os
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Max transformed fixtures kept in memory (per process)
+TRANSFORM_MEMO_SIZE = int(os.getenv("TRANSFORM_MEMO_SIZE", "5000"))
+
+# Transforms infer live/finished status from the clock around kick-off
+# (started, and kick-off + 105 minutes), so the phase is part of the fingerprint
+MATCH_DURATION = timedelta(minutes=105)
+
+# Sub-objects the fixture/livescore transforms read besides the odds (hashed as compact JSON)
+FINGERPRINT_KEYS = (
+    "participants", "scores", "events", "currentPeriod", "periods", "time",
+    "league", "season", "venue", "lineups", "sidelined", "statistics",
+)
+ODDS_KEYS = ("odds", "inplayOdds")
+
+
+def _kickoff_phase(raw: Dict[str, Any]) -> int:
+    """0 = before kick-off, 1 = within the match window, 2 = after it, -1 = unknown"""
+    starting_at = raw.get("starting_at")
+    try:
+        timestamp = raw.get("starting_at_timestamp")
+        if timestamp is not None:
+            start_dt = datetime.fromtimestamp(float(timestamp), tz=timezone.utc)
+        elif isinstance(starting_at, str):
+            start_dt = datetime.fromisoformat(starting_at.replace("Z", "+00:00"))
+        else:
+            return -1
+        if start_dt.tzinfo is None:
+            start_dt = start_dt.replace(tzinfo=timezone.utc)
+    except (ValueError, TypeError, OverflowError):
+        return -1
+
+    now = datetime.now(timezone.utc)
+    if now < start_dt:
+        return 0
+    if now <= start_dt + MATCH_DURATION:
+        return 1
+    return 2
+
+
+def _json_hash(value: Any) -> int:
+    return hash(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def _odds_hash(odds: Any) -> int:
+    """Hash of the fields that change when a price moves or a selection is suspended (nested-format items hashed whole)"""
+    if isinstance(odds, dict) and "data" in odds:
+        odds = odds["data"]
+    if not isinstance(odds, list):
+        return _json_hash(odds)
+    return hash(tuple([
+        (
+            odd.get("id"), odd.get("value"), odd.get("stopped"), odd.get("suspended"),
+            odd.get("is_unavailable"), odd.get("latest_bookmaker_update"),
+        ) if isinstance(odd, dict) and "values" not in odd else _json_hash(odd)
+        for odd in odds
+    ]))
+
+
+def fingerprint(raw: Dict[str, Any]) -> Tuple:
+    """Content fingerprint of a raw fixture (scalars, sub-object and odds hashes, kick-off phase)"""
+    scalars = tuple(value for value in raw.values() if not isinstance(value, (dict, list)))
+    return (
+        scalars,
+        _json_hash([raw.get(key) for key in FINGERPRINT_KEYS]),
+        tuple(_odds_hash(raw[key]) if key in raw else None for key in ODDS_KEYS),
+        _kickoff_phase(raw),
+    )
+
+
+class TransformMemo:
+    """LRU of transformed fixtures, validated by content fingerprint"""
+
+    def __init__(self, maxsize: int = TRANSFORM_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_transform(
+        self,
+        kind: str,
+        raw: Dict[str, Any],
+        transform: Callable[[Dict[str, Any]], Any],
+        variant: Tuple = ()
+    ) -> Any:
+        """
+        Return the memoized transform of raw, re-running transform only if raw changed.
+        Returned objects are shared between callers and must be treated as read-only.
+
+        Args:
+            kind: Transform name (separates fixture and livescore results)
+            raw: Raw SportMonks fixture/livescore
+            transform: Function producing the match dict from raw
+            variant: Extra transform arguments that change the output (e.g. timezone offset)
+        """
+        fixture_id = raw.get("id") if isinstance(raw, dict) else None
+        if fixture_id is None or self.maxsize <= 0:
+            return transform(raw)
+
+        key = (kind, fixture_id, variant)
+        current = fingerprint(raw)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == current:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        result = transform(raw)
+        self._entries[key] = (current, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    async def get_or_transform_batch(
+        self,
+        kind: str,
+        raws: List[Dict[str, Any]],
+        transform_batch: Callable[[List[Dict[str, Any]]], Awaitable[List[Any]]],
+        variant: Tuple = ()
+    ) -> List[Any]:
+        """
+        get_or_transform for a list: memo hits are reused, all misses go to one
+        transform_batch call (e.g. a process pool). Results keep the input order.
+        """
+        results: List[Any] = [None] * len(raws)
+        missing: List[Tuple[int, Optional[Tuple], Optional[Tuple]]] = []
+        for index, raw in enumerate(raws):
+            fixture_id = raw.get("id") if isinstance(raw, dict) else None
+            if fixture_id is None or self.maxsize <= 0:
+                missing.append((index, None, None))
+                continue
+            key = (kind, fixture_id, variant)
+            current = fingerprint(raw)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == current:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                results[index] = entry[1]
+            else:
+                self.misses += 1
+                missing.append((index, key, current))
+
+        if missing:
+            transformed = await transform_batch([raws[index] for index, _, _ in missing])
+            for (index, key, current), result in zip(missing, transformed):
+                results[index] = result
+                if key is not None:
+                    self._entries[key] = (current, result)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return results
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get memo size and hit rate"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# Global singleton instance
+_transform_memo: Optional[TransformMemo] = None
+
+def get_transform_memo() -> TransformMemo:
+    """Get global transform memo"""
+    global _transform_memo
+    if _transform_memo is None:
+        _transform_memo = TransformMemo()
+    return _transform_memo
@@ -0,0 +1,213 @@
+"""
+Process pool for fixture -> match transforms
+_transform_fixture_to_match is pure-Python CPU work; a 15-day fixtures window run on the
+event loop starves every other request on the worker. Batches of at least
+TRANSFORM_POOL_MIN_BATCH fixtures (memo misses only) are split into chunks and
+transformed in worker processes; smaller batches stay inline, where shipping them
+would cost more than it saves.
+Chunks travel as one JSON blob each way instead of pickled objects: unpickling
+transformed matches (records rebuilt in Python) costs the event loop about as much
+as the transform itself, orjson decoding a fraction of it. Each chunk's result is
+decoded as soon as it arrives, so the loop only ever pauses for one chunk.
+Workers are started with "spawn" (forking a process with running threads is unsafe) and
+import the service once in their initializer, with metrics and tracing turned off: stage
+histograms and spans recorded there would never reach the parent's /metrics or request
+traces, so the caller times each pooled batch instead. This module must not import
+services.metrics / services.tracing for that to hold in the workers.
+The pool is opt-in: each worker holds its own copy of the service (about 50 MB RSS) and
+every uvicorn worker gets its own pool. Workers are only started by the first large batch,
+which is itself transformed inline while they come up.
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from services.records import dumps, loads, match_from_json
+
+logger = logging.getLogger(__name__)
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on: affinity mask, capped by a cgroup CPU quota (containers)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    # cgroup v2 ("<quota> <period>" or "max <period>"), then v1
+    for quota_path, period_path in (
+        ("/sys/fs/cgroup/cpu.max", None),
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us"),
+    ):
+        try:
+            with open(quota_path) as f:
+                values = f.read().split()
+            if period_path:
+                with open(period_path) as f:
+                    values.append(f.read().strip())
+            quota, period = values[0], values[-1]
+            if quota not in ("max", "-1"):
+                return max(1, min(cpus, int(quota) // int(period)))
+            break
+        except (OSError, ValueError, IndexError):
+            continue
+    return cpus
+
+
+_CPU_COUNT = _available_cpus()
+
+TRANSFORM_POOL_ENABLED = os.getenv("TRANSFORM_POOL_ENABLED", "false").lower() == "true"
+# Leave one core to the event loop; several uvicorn workers share the machine's cores
+TRANSFORM_POOL_WORKERS = int(os.getenv("TRANSFORM_POOL_WORKERS", str(min(max(_CPU_COUNT - 1, 1), 4))))
+# Smallest batch (memo misses) shipped to the pool
+TRANSFORM_POOL_MIN_BATCH = int(os.getenv("TRANSFORM_POOL_MIN_BATCH", "32"))
+# Fixtures per pool task
+TRANSFORM_POOL_CHUNK_SIZE = int(os.getenv("TRANSFORM_POOL_CHUNK_SIZE", "16"))
+
+# Set in each worker process by _init_worker
+_worker_service = None
+
+
+def _init_worker() -> None:
+    global _worker_service
+    # Read when services.metrics / services.tracing are first imported (just below)
+    os.environ["METRICS_ENABLED"] = "false"
+    os.environ["TRACING_ENABLED"] = "false"
+    from services.sportmonks_service import sportmonks_service
+    _worker_service = sportmonks_service
+
+
+def _transform_fixture_chunk(payload: bytes, timezone_offset: int) -> bytes:
+    """Worker side: JSON list of raw fixtures in, JSON list of matches out"""
+    matches = [
+        _worker_service._transform_fixture_to_match(fixture, timezone_offset=timezone_offset)
+        for fixture in loads(payload)
+    ]
+    return dumps(matches).encode()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class TransformPool:
+    """Lazily started process pool running fixture transforms off the event loop"""
+
+    def __init__(
+        self,
+        workers: int = TRANSFORM_POOL_WORKERS,
+        min_batch: int = TRANSFORM_POOL_MIN_BATCH,
+        chunk_size: int = TRANSFORM_POOL_CHUNK_SIZE
+    ):
+        self.workers = workers
+        self.min_batch = min_batch
+        self.chunk_size = max(chunk_size, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._ready = False
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.fixtures = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            logger.info(f"Transform pool started ({self.workers} workers, batches of {self.min_batch}+ fixtures)")
+        return self._executor
+
+    def should_offload(self, count: int) -> bool:
+        """
+        Whether a batch of `count` fixtures goes to the pool. The first large batch starts
+        the workers in the background and is transformed inline (spawn + imports take a while).
+        """
+        if self.workers <= 0 or count < self.min_batch:
+            return False
+        if not self._ready and self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self._warm_up_in_background())
+        return self._ready
+
+    async def _warm_up_in_background(self) -> None:
+        try:
+            await self.warm_up()
+        except Exception as e:
+            logger.warning(f"Transform pool warm-up failed (transforms stay inline, retried on the next large batch): {e}")
+            self.shutdown()
+        finally:
+            self._warm_up_task = None
+
+    async def warm_up(self) -> None:
+        """Start every worker process and wait until each has imported the service"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.workers)))
+        self._ready = True
+
+    async def transform_fixtures(self, fixtures: List[Dict[str, Any]], timezone_offset: int = 0) -> List[Any]:
+        """Transform fixtures in the pool, in input order; raises if the pool is broken"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        # Encode a chunk only when a worker is about to be free (encoding all up front is one long pause)
+        in_flight = asyncio.Semaphore(self.workers * 2)
+
+        async def run_chunk(chunk: List[Dict[str, Any]]) -> List[Any]:
+            async with in_flight:
+                payload = dumps(chunk).encode()
+                result = await loop.run_in_executor(executor, _transform_fixture_chunk, payload, timezone_offset)
+            # Rebuilt here: JSON brings nested odds back as plain dicts
+            return [match_from_json(match) for match in loads(result)]
+
+        started = time.perf_counter()
+        try:
+            chunks = await asyncio.gather(*(
+                # Small fixed chunks: each result is decoded on the loop, so chunk size bounds the pause
+                run_chunk(fixtures[i:i + self.chunk_size]) for i in range(0, len(fixtures), self.chunk_size)
+            ))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM kill): start a fresh pool next time
+            self.failures += 1
+            self._executor = None
+            self._ready = False
+            raise
+        self.batches += 1
+        self.fixtures += len(fixtures)
+        self.total_seconds += time.perf_counter() - started
+        return [match for chunk in chunks for match in chunk]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._ready = False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self._ready,
+            "workers": self.workers,
+            "min_batch": self.min_batch,
+            "batches": self.batches,
+            "fixtures": self.fixtures,
+            "failures": self.failures,
+            "avg_batch_ms": round(self.total_seconds / self.batches * 1000, 1) if self.batches else 0.0,
+        }
+
+
+_transform_pool: Optional[TransformPool] = None
+
+
+def get_transform_pool() -> Optional[TransformPool]:
+    """Process-wide pool, None when TRANSFORM_POOL_ENABLED=false or TRANSFORM_POOL_WORKERS=0"""
+    global _transform_pool
+    if not TRANSFORM_POOL_ENABLED or TRANSFORM_POOL_WORKERS <= 0:
+        return None
+    if _transform_pool is None:
+        _transform_pool = TransformPool()
+    return _transform_pool
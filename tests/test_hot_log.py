@@ -0,0 +1,24 @@
+"""
+services.hot_log: emitted records point at the call site, not at hot_log.py.
+"""
+import logging
+
+import pytest
+
+from services.hot_log import HotPathLogger
+
+
+@pytest.mark.parametrize("method", ["info", "warning", "debug", "log"])
+def test_records_report_caller(method, caplog):
+    logger = logging.getLogger(f"tests.hot_log.{method}")
+    hot_log = HotPathLogger(logger, debug_sample_rate=1.0)
+    site = f"tests.caller.{method}"
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        if method == "log":
+            hot_log.log(logging.INFO, site, "line %d", 1)
+        else:
+            getattr(hot_log, method)(site, "line %d", 1)
+    [record] = caplog.records
+    assert record.funcName == "test_records_report_caller"
+    assert record.filename == "test_hot_log.py"
+    assert record.getMessage() == "line 1"
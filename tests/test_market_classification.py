@@ -0,0 +1,133 @@
+"""
+Table-driven odds grouping (services.market_classification) vs the keyword heuristic it
+replaced: SportmonksService._group_odds_by_market_line must produce the same groups as
+a verbatim copy of the previous substring-matching implementation.
+"""
+import logging
+import random
+from collections.abc import Mapping
+
+import pytest
+
+from services.market_classification import MarketClassifier, classify_heuristic
+from services.records import OddRecord, OddGroupRecord
+from services.sportmonks_service import SportmonksService, BET365_SUPPORTED_MARKET_IDS
+
+MARKET_NAMES = [
+    "Goals Over/Under", "Alternative Total Goals", "Asian Handicap", "Handicap Result",
+    "Total Corners", "Cards Over Under", "Match Winner", "Both Teams To Score",
+    "Team Total Under", "Alt Üst", "Home Team Goals", "Player Shots", None, "",
+]
+LABELS = [
+    "1", "x", "2", "home", "draw", "away", "over", "under", "üst", "alt",
+    "yes", "no", "1x", "12", "x2", "odd", "even",
+    "Over 2.5", "Under 2.5", "Home +1", "Away -1", "Üst", "Alt", "Draw No Bet", "3-1", "None", "",
+]
+
+
+def legacy_group(odds, home_team_id=None, away_team_id=None):
+    """_group_odds_by_market_line before the classification table (kept for comparison)"""
+    if not isinstance(odds, list):
+        return []
+    market_groups = {}
+    for odd in odds:
+        if not isinstance(odd, Mapping):
+            continue
+        market_id = odd.get("market_id")
+        market_name = odd.get("market_name", "")
+        label = (odd.get("label") or odd.get("name") or "").lower()
+        line = odd.get("line") or odd.get("total")
+        if line is not None:
+            try:
+                line_float = float(line)
+                key = f"{market_id}_{line_float}"
+                if key not in market_groups:
+                    market_groups[key] = {"market_id": market_id, "market_name": market_name, "line": line_float,
+                                          "selections": {"over": None, "under": None}}
+                if "over" in label or "üst" in label or "over" in market_name.lower():
+                    market_groups[key]["selections"]["over"] = odd
+                elif "under" in label or "alt" in label or "under" in market_name.lower():
+                    market_groups[key]["selections"]["under"] = odd
+            except (ValueError, TypeError):
+                pass
+        handicap = odd.get("handicap")
+        if handicap is not None:
+            try:
+                abs_handicap = abs(float(handicap))
+                key = f"{market_id}_handicap_{abs_handicap}"
+                if key not in market_groups:
+                    market_groups[key] = {"market_id": market_id, "market_name": market_name, "handicap": abs_handicap,
+                                          "selections": {"home": None, "away": None}}
+                participant_id = odd.get("participant_id") or odd.get("player_id")
+                if participant_id:
+                    if home_team_id and participant_id == home_team_id:
+                        market_groups[key]["selections"]["home"] = odd
+                    elif away_team_id and participant_id == away_team_id:
+                        market_groups[key]["selections"]["away"] = odd
+                else:
+                    if "home" in label or "1" in label:
+                        market_groups[key]["selections"]["home"] = odd
+                    elif "away" in label or "2" in label:
+                        market_groups[key]["selections"]["away"] = odd
+            except (ValueError, TypeError):
+                pass
+    return [
+        OddGroupRecord(group) for group in market_groups.values()
+        if any(selection is not None for selection in group["selections"].values())
+    ]
+
+
+def make_odds(count: int, rng: random.Random):
+    odds = []
+    market_ids = sorted(BET365_SUPPORTED_MARKET_IDS)
+    for i in range(count):
+        odd = {
+            "bookmaker_id": 2,
+            "market_id": rng.choice(market_ids),
+            # The legacy code called .lower() on the name, so it is never None in the comparison
+            "market_name": rng.choice([name for name in MARKET_NAMES if name is not None]),
+            "label": rng.choice(LABELS),
+            "name": rng.choice(["Home", "Away", None]),
+            "value": round(rng.uniform(1.01, 10), 2),
+        }
+        kind = i % 3
+        if kind == 0:
+            odd["total"] = rng.choice(["0.5", "1.5", "2.5", "3.5", "bad"])
+        elif kind == 1:
+            odd["handicap"] = rng.choice([-1.5, -0.5, 0.5, 1.5, "x"])
+            if rng.random() < 0.3:
+                odd["participant_id"] = rng.choice([10, 20, 30])
+        odds.append(OddRecord(odd))
+    return odds
+
+
+@pytest.fixture(scope="module")
+def service():
+    logging.disable(logging.CRITICAL)
+    yield SportmonksService()
+    logging.disable(logging.NOTSET)
+
+
+def test_classifier_matches_heuristic():
+    classifier = MarketClassifier()
+    for name in MARKET_NAMES:
+        for label in LABELS:
+            label = label.lower()
+            # First lookup fills the table, the second is served from it
+            assert classifier.classify(name, label) == classify_heuristic(name, label), (name, label)
+            assert classifier.classify(name, label) == classify_heuristic(name, label), (name, label)
+
+
+def test_classifier_table_reset():
+    classifier = MarketClassifier(max_size=5)
+    for label in LABELS:
+        assert classifier.classify("Goals Over/Under", label.lower()) == classify_heuristic("Goals Over/Under", label.lower())
+    assert classifier.get_metrics()["entries"] <= 5
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_grouping_matches_legacy(service, seed):
+    odds = make_odds(3000, random.Random(seed))
+    expected = legacy_group(odds, home_team_id=10, away_team_id=20)
+    assert expected
+    assert service._group_odds_by_market_line(odds, home_team_id=10, away_team_id=20) == expected
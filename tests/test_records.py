@@ -0,0 +1,27 @@
+"""
+services.records.match_from_json: a match that went through JSON (transform pool) comes back
+with the same record types as an inline transform.
+"""
+from services.records import MatchRecord, OddGroupRecord, OddRecord, dumps, loads, match_from_json
+
+
+def test_match_from_json_rebuilds_nested_records():
+    over = OddRecord({"market_id": 80, "label": "Over", "value": "1.90", "line": 2.5})
+    under = OddRecord({"market_id": 80, "label": "Under", "value": "1.95", "line": 2.5})
+    match = MatchRecord({
+        "id": "1",
+        "odds": [over, under],
+        "odds_grouped": [OddGroupRecord({
+            "market_id": 80, "line": 2.5, "selections": {"over": over, "under": under, "home": None},
+        })],
+    })
+
+    rebuilt = match_from_json(loads(dumps(match)))
+
+    assert isinstance(rebuilt, MatchRecord)
+    assert all(isinstance(odd, OddRecord) for odd in rebuilt["odds"])
+    [group] = rebuilt["odds_grouped"]
+    assert isinstance(group, OddGroupRecord)
+    assert isinstance(group["selections"]["over"], OddRecord)
+    assert group["selections"]["home"] is None
+    assert dumps(rebuilt) == dumps(match)